@@ -0,0 +1,294 @@
+"""
+Columnar cold archive for historical mentions.
+
+Whole months older than ARCHIVE_AFTER_DAYS are exported to Parquet, one
+file set per month and brand:
+    
+    <ARCHIVE_DIR>/mentions/month=2024-01/brand_id=7/part-<first id>.parquet
+
+and then removed from the mentions table (monthly partitions are dropped
+outright). A manifest records the cutoff: rows before it live only in the
+archive, rows from it onwards only in the database.
+
+Analytics windows that reach past the cutoff are split in two; the older
+part runs on the archive with DuckDB (the same SQL, over just the Parquet
+files for the months and brands involved) and the results are merged, see
+app.analytics.engine.
+
+Requires the optional duckdb and pyarrow packages.
+
+Usage:
+    python -m app.analytics.archive run      # cron: archive months past the hot range
+    python -m app.analytics.archive status
+"""
+
+import json
+import os
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.analytics.bodies import delete_bodies, join_bodies
+from app.analytics.partitions import add_months, detach_partition, is_partitioned, list_partitions, month_start
+from app.core.config import get_settings
+from app.models.database import Mention, MentionBody
+
+try:
+    import duckdb
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    duckdb = None
+
+
+MANIFEST = '_manifest.json'
+ARCHIVE_AFTER_DAYS = 90
+
+_ARROW_TYPES = {
+    int: 'int64',
+    float: 'float64',
+    str: 'string',
+    datetime: 'timestamp[us]',
+}
+
+
+# Archived rows are whole mentions, body included
+_ARCHIVE_COLUMNS = (*Mention.__table__.columns, MentionBody.text, MentionBody.url)
+
+
+def _arrow_schema():
+    return pa.schema([
+        (column.name, _ARROW_TYPES[column.type.python_type])
+        for column in _ARCHIVE_COLUMNS
+    ])
+
+
+def _month_key(month: date) -> str:
+    return f"{month.year:04d}-{month.month:02d}"
+
+
+class MentionArchive:
+    """Parquet archive of mentions under one directory."""
+    
+    def __init__(self, root: str):
+        """
+        Args:
+            root: Archive directory (ARCHIVE_DIR)
+        """
+        if duckdb is None:
+            raise RuntimeError("The mention archive needs duckdb and pyarrow (pip install duckdb pyarrow)")
+        self.root = os.path.join(root, 'mentions')
+        self._manifest_mtime = None
+        self._cutoff = None
+    
+    @property
+    def cutoff(self) -> Optional[datetime]:
+        """Start of the hot range: mentions before it are archived (None = nothing archived)."""
+        path = os.path.join(self.root, MANIFEST)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if mtime != self._manifest_mtime:
+            with open(path, encoding='utf-8') as f:
+                self._cutoff = datetime.fromisoformat(json.load(f)['archived_before'])
+            self._manifest_mtime = mtime
+        return self._cutoff
+    
+    def set_cutoff(self, cutoff: datetime):
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, MANIFEST)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'archived_before': cutoff.isoformat()}, f)
+        os.replace(path + '.tmp', path)
+    
+    def write(self, month: date, brand_id: int, rows: Sequence[Any]):
+        """
+        Write one brand's mentions for a month.
+        
+        The file is named after the first mention id, so re-running an
+        interrupted archive overwrites instead of duplicating, while rows
+        ingested later for an archived month land in a new file.
+        """
+        directory = os.path.join(self.root, f"month={_month_key(month)}", f"brand_id={brand_id}")
+        os.makedirs(directory, exist_ok=True)
+        schema = _arrow_schema()
+        table = pa.Table.from_pylist([dict(row._mapping) for row in rows], schema=schema)
+        
+        path = os.path.join(directory, f"part-{rows[0].id}.parquet")
+        pq.write_table(table, path + '.tmp')
+        os.replace(path + '.tmp', path)
+    
+    def files(self, brand_ids: Optional[Sequence[int]], start: datetime, end: datetime) -> List[str]:
+        """Parquet files holding mentions of these brands (None = all) between start and end."""
+        wanted = {f"brand_id={brand_id}" for brand_id in brand_ids} if brand_ids is not None else None
+        files = []
+        month, last = month_start(start.date()), month_start(end.date())
+        while month <= last:
+            month_dir = os.path.join(self.root, f"month={_month_key(month)}")
+            if os.path.isdir(month_dir):
+                brand_dirs = os.listdir(month_dir)
+                for brand_dir in sorted(wanted.intersection(brand_dirs) if wanted is not None else brand_dirs):
+                    directory = os.path.join(month_dir, brand_dir)
+                    files += [
+                        os.path.join(directory, name)
+                        for name in sorted(os.listdir(directory)) if name.endswith('.parquet')
+                    ]
+            month = add_months(month, 1)
+        return files
+    
+    def query(
+        self,
+        stmt,
+        brand_ids: Optional[Sequence[int]],
+        start: datetime,
+        end: datetime
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a mentions query over the archive.
+        
+        The statement is compiled for PostgreSQL (whose SQL DuckDB accepts)
+        and reads a `mentions` view over the files for these brands and
+        months, so only relevant files are opened.
+        
+        Args:
+            stmt: Select over Mention (no other tables)
+            brand_ids: Brands the statement filters on (None = all)
+            start: Window start
+            end: Window end
+        
+        Returns:
+            Result rows as dicts
+        """
+        files = self.files(brand_ids, start, end)
+        if not files:
+            return []
+        
+        sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+        con = duckdb.connect()
+        try:
+            # By name: files written before a column was added lack it
+            con.read_parquet(files, union_by_name=True).create_view(Mention.__tablename__)
+            cursor = con.execute(sql)
+            names = [d[0] for d in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+        finally:
+            con.close()
+    
+    def months(self) -> List[str]:
+        """Archived months (YYYY-MM), oldest first."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name[len('month='):] for name in os.listdir(self.root) if name.startswith('month='))
+
+
+_archives: Dict[str, MentionArchive] = {}
+
+
+def get_archive() -> Optional[MentionArchive]:
+    """The configured archive, or None when ARCHIVE_DIR is unset."""
+    root = get_settings().archive_dir
+    if not root:
+        return None
+    if root not in _archives:
+        _archives[root] = MentionArchive(root)
+    return _archives[root]
+
+
+def archive_mentions(
+    db: Session,
+    archive: MentionArchive,
+    after_days: int = ARCHIVE_AFTER_DAYS,
+    today: Optional[date] = None
+) -> List[str]:
+    """
+    Move whole months older than `after_days` from the database to the archive.
+    
+    Files are written first, then the cutoff is advanced, then rows are
+    removed one month per transaction. Queries split at the cutoff, so no
+    mention is counted twice or missed at any point; a failed run can
+    simply be repeated. Dashboard counters keep counting archived mentions
+    (counters rebuild reads them back from the archive).
+    
+    Args:
+        db: Database session
+        archive: Target archive
+        after_days: Days to keep in the database (rounded down to a month start)
+        today: Reference date (defaults to now)
+    
+    Returns:
+        Archived months (YYYY-MM)
+    """
+    before = month_start((today or datetime.utcnow().date()) - timedelta(days=after_days))
+    cutoff = datetime.combine(before, datetime.min.time())
+    oldest = db.execute(select(func.min(Mention.timestamp)).where(Mention.timestamp < cutoff)).scalar()
+    if oldest is None:
+        return []
+    
+    months = []
+    month = month_start(oldest.date())
+    while month < before:
+        in_month = [
+            Mention.timestamp >= datetime.combine(month, datetime.min.time()),
+            Mention.timestamp < datetime.combine(add_months(month, 1), datetime.min.time()),
+        ]
+        brand_ids = db.execute(select(Mention.brand_id).distinct().where(*in_month)).scalars().all()
+        for brand_id in sorted(brand_ids):
+            rows = db.execute(
+                join_bodies(select(*_ARCHIVE_COLUMNS), isouter=True)
+                .where(Mention.brand_id == brand_id, *in_month)
+                .order_by(Mention.timestamp, Mention.id)
+            ).all()
+            archive.write(month, brand_id, rows)
+        if brand_ids:
+            months.append(_month_key(month))
+        month = add_months(month, 1)
+    
+    if archive.cutoff is None or archive.cutoff < cutoff:
+        archive.set_cutoff(cutoff)
+    
+    if is_partitioned(db):
+        for name, partition_month in list_partitions(db):
+            if partition_month < before:
+                detach_partition(db, name)
+                db.commit()
+    # Plain table, and stray rows in the DEFAULT partition
+    month = month_start(oldest.date())
+    while month < before:
+        in_archive = Mention.timestamp < datetime.combine(add_months(month, 1), datetime.min.time())
+        delete_bodies(db, select(Mention.id).where(in_archive))
+        db.execute(delete(Mention).where(in_archive))
+        db.commit()
+        month = add_months(month, 1)
+    
+    return months
+
+
+if __name__ == "__main__":
+    import sys
+    from app.core.config import SessionLocal
+    
+    command = sys.argv[1] if len(sys.argv) > 1 else ''
+    if command not in ('run', 'status'):
+        print("Usage: python -m app.analytics.archive run|status")
+        sys.exit(1)
+    
+    mention_archive = get_archive()
+    if mention_archive is None:
+        print("ARCHIVE_DIR is not set")
+        sys.exit(1)
+    
+    if command == 'run':
+        session = SessionLocal()
+        try:
+            archived = archive_mentions(session, mention_archive, get_settings().archive_after_days)
+            print(f"✓ Archived {archived or 'nothing'}")
+        finally:
+            session.close()
+    else:
+        print(f"Archived before: {mention_archive.cutoff or 'nothing archived'}")
+        for archived_month in mention_archive.months():
+            print(archived_month)
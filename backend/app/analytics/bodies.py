@@ -0,0 +1,107 @@
+"""
+Mention text storage.
+
+Text and URL are most of a mention's bytes, but only listing, export,
+search and the live feed read them. They live in mention_bodies (keyed by
+mention id) so the mentions rows every analytics query scans stay narrow
+and fixed-width, and more of them fit in each page and in the cache.
+
+Bodies are not compressed in the database: PostgreSQL only compresses
+values in rows over ~2 kB and mention text is capped at 1000 characters.
+Old months are compressed in the Parquet archive (app.analytics.archive).
+
+Usage:
+    python -m app.analytics.bodies migrate   # one-off for databases with text on mentions
+"""
+
+from sqlalchemy import delete, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.analytics.search import create_search_index
+from app.models.database import Mention, MentionBody
+
+
+# Full-text index over mentions.text from before the split
+_LEGACY_SQLITE_SEARCH = [
+    "DROP TRIGGER IF EXISTS mentions_fts_ai",
+    "DROP TRIGGER IF EXISTS mentions_fts_ad",
+    "DROP TRIGGER IF EXISTS mentions_fts_au",
+    "DROP TABLE IF EXISTS mentions_fts",
+]
+
+
+def join_bodies(stmt, isouter: bool = False):
+    """Join mention_bodies onto a select over Mention."""
+    return stmt.join(MentionBody, MentionBody.mention_id == Mention.id, isouter=isouter)
+
+
+def delete_bodies(db: Session, mention_ids):
+    """
+    Delete the bodies of mentions about to be removed (caller commits).
+    
+    Args:
+        db: Database session
+        mention_ids: Select of the mention ids
+    """
+    db.execute(delete(MentionBody).where(MentionBody.mention_id.in_(mention_ids)))
+
+
+def has_inline_bodies(bind: Engine) -> bool:
+    """Whether mentions still has its text column (database created before the split)."""
+    columns = {column['name'] for column in inspect(bind).get_columns(Mention.__tablename__)}
+    return 'text' in columns
+
+
+def migrate(bind: Engine):
+    """
+    Move text and url from mentions into mention_bodies.
+    
+    Copies every body in one transaction and drops the columns, so run it
+    during a maintenance window; on error nothing changes. The full-text
+    index is rebuilt over mention_bodies, and the mentions table is
+    rewritten (VACUUM FULL / VACUUM) to actually give the space back.
+    
+    Args:
+        bind: Sync engine
+    """
+    if not has_inline_bodies(bind):
+        print("mention bodies are already split out")
+        return
+    
+    dialect = bind.dialect.name
+    MentionBody.__table__.create(bind, checkfirst=True)
+    
+    with bind.begin() as conn:
+        if dialect == 'sqlite':
+            # Its triggers read mentions.text, which blocks dropping it
+            for ddl in _LEGACY_SQLITE_SEARCH:
+                conn.execute(text(ddl))
+        conn.execute(text(
+            f"INSERT INTO {MentionBody.__tablename__} (mention_id, text, url) "
+            f"SELECT id, text, url FROM {Mention.__tablename__}"
+        ))
+        # On PostgreSQL this also drops the old GIN index on mentions.text
+        conn.execute(text(f"ALTER TABLE {Mention.__tablename__} DROP COLUMN url"))
+        conn.execute(text(f"ALTER TABLE {Mention.__tablename__} DROP COLUMN text"))
+    
+    create_search_index(bind, rebuild=True)
+    
+    with bind.connect() as conn:
+        conn = conn.execution_options(isolation_level='AUTOCOMMIT')
+        if dialect == 'postgresql':
+            conn.execute(text(f"VACUUM FULL ANALYZE {Mention.__tablename__}"))
+        elif dialect == 'sqlite':
+            conn.execute(text("VACUUM"))
+
+
+if __name__ == "__main__":
+    import sys
+    from app.core.config import engine
+    
+    if sys.argv[1:] != ['migrate']:
+        print("Usage: python -m app.analytics.bodies migrate")
+        sys.exit(1)
+    
+    migrate(engine)
+    print("✓ Mention bodies stored in mention_bodies")
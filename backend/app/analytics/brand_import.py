@@ -0,0 +1,362 @@
+"""
+Bulk brand catalog import.
+
+Reads brand lists as JSON, NDJSON or CSV and upserts them by name in one
+transaction:
+- categories are matched by name (case-insensitive) or id; unknown names
+  are created
+- new brands are inserted, brands whose category or keywords differ are
+  updated, the rest are left alone and reported as unchanged
+- keywords are replaced when a record has them and kept when it doesn't
+
+The existing catalog is read once and compared in memory. On PostgreSQL
+rows are written with COPY (new brands straight into brands, changes
+through a temporary table and one UPDATE); other databases use batched
+executemany. Brands that change category take their mentions along (the
+ORM hook in app.models.database does not see bulk updates), and the
+catalog version is bumped so the brand search index and ETags refresh.
+
+Records (other fields are ignored, so generate-10k.js output loads as is):
+    {"name": "boAt", "category": "Tech", "keywords": ["boAt", "boat lifestyle"]}
+    {"name": "Plum", "category_id": 2, "keywords": "plum goodness,plum"}
+JSON is a list of records, {"brands": [...]} or {"brands": {key: record}}.
+CSV needs a header row with name and category (or category_id); keywords
+is optional.
+
+Usage:
+    python -m app.analytics.brand_import src/data/brands.json
+    python -m app.analytics.brand_import brands.txt --format ndjson
+"""
+
+import csv
+import io
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+from sqlalchemy import bindparam, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from app.analytics.versions import CATALOG, GLOBAL, brand_scope, bump_scopes, category_scope
+from app.models.database import Brand, Category, Mention
+
+
+FORMATS = ('json', 'ndjson', 'csv')
+BATCH_SIZE = 5000
+MAX_ERRORS = 20  # Invalid records listed in the result (all are counted)
+
+_CONTENT_TYPES = {
+    'application/json': 'json',
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'text/csv': 'csv',
+}
+
+_INSERT_COLUMNS = ['name', 'category_id', 'keywords', 'created_at', 'updated_at']
+_UPDATE_COLUMNS = ['id', 'category_id', 'keywords', 'updated_at']
+_UPDATES_TABLE = 'brand_import_updates'
+
+_NAME_LENGTH = Brand.__table__.c.name.type.length
+_CATEGORY_LENGTH = Category.__table__.c.name.type.length
+
+
+class ImportResult(NamedTuple):
+    inserted: int
+    updated: int
+    unchanged: int
+    skipped: int  # Invalid records
+    categories_created: int
+    errors: List[str]  # First MAX_ERRORS problems
+
+
+class _Record(NamedTuple):
+    name: str
+    category: Optional[str]
+    category_id: Optional[int]
+    keywords: Optional[str]
+
+
+def detect_format(filename: str = '', content_type: str = '') -> str:
+    """Import format from a file extension or Content-Type (JSON if neither says)."""
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension in FORMATS:
+        return extension
+    if extension == 'jsonl':
+        return 'ndjson'
+    return _CONTENT_TYPES.get(content_type.split(';')[0].strip().lower(), 'json')
+
+
+def parse_brands(data: Union[bytes, str], fmt: str) -> List[Dict[str, Any]]:
+    """
+    Raw brand records from an import file.
+    
+    Args:
+        data: File contents
+        fmt: 'json', 'ndjson' or 'csv'
+    
+    Returns:
+        Records as dicts, not yet validated
+    
+    Raises:
+        ValueError: Unknown format or unreadable file
+    """
+    if isinstance(data, bytes):
+        data = data.decode('utf-8-sig')
+    
+    if fmt == 'json':
+        payload = json.loads(data)
+        if isinstance(payload, dict) and 'brands' in payload:
+            payload = payload['brands']
+        if isinstance(payload, dict):
+            payload = list(payload.values())
+        if not isinstance(payload, list):
+            raise ValueError("JSON must be a list of brands or {\"brands\": ...}")
+        return payload
+    if fmt == 'ndjson':
+        return [json.loads(line) for line in data.splitlines() if line.strip()]
+    if fmt == 'csv':
+        reader = csv.DictReader(io.StringIO(data))
+        if not reader.fieldnames or 'name' not in reader.fieldnames:
+            raise ValueError("CSV needs a header row with a name column")
+        return list(reader)
+    raise ValueError(f"Unknown format {fmt!r} (expected one of {', '.join(FORMATS)})")
+
+
+def _join_keywords(value) -> Optional[str]:
+    if value is None:
+        return None
+    parts = value if isinstance(value, list) else str(value).split(',')
+    keywords = [str(part).strip() for part in parts if str(part).strip()]
+    return ','.join(keywords) or None
+
+
+def _normalize(raw: Any) -> _Record:
+    if not isinstance(raw, dict):
+        raise ValueError("not an object")
+    name = str(raw.get('name') or '').strip()
+    if not name:
+        raise ValueError("missing name")
+    if len(name) > _NAME_LENGTH:
+        raise ValueError(f"name longer than {_NAME_LENGTH} characters")
+    
+    category_id = raw.get('category_id')
+    category = raw.get('category')
+    if category_id not in (None, ''):
+        try:
+            category_id = int(category_id)
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid category_id {category_id!r}")
+        category = None
+    elif isinstance(category, int):
+        category_id, category = category, None
+    else:
+        category_id = None
+        category = str(category or '').strip()
+        if not category:
+            raise ValueError("missing category")
+        if len(category) > _CATEGORY_LENGTH:
+            raise ValueError(f"category longer than {_CATEGORY_LENGTH} characters")
+    
+    return _Record(name, category, category_id, _join_keywords(raw.get('keywords')))
+
+
+def _resolve_categories(db: Session, records: Iterable[_Record], now: datetime) -> Tuple[Dict[str, int], Set[int], int]:
+    """(category id by lowercased name, valid ids, number created), creating missing names."""
+    rows = db.execute(select(Category.id, Category.name)).all()
+    by_name = {name.lower(): category_id for category_id, name in rows}
+    
+    missing: Dict[str, str] = {}
+    for record in records:
+        if record.category is not None and record.category.lower() not in by_name:
+            missing.setdefault(record.category.lower(), record.category)
+    if missing:
+        db.execute(insert(Category.__table__), [
+            {'name': name, 'created_at': now} for name in missing.values()
+        ])
+        by_name = {
+            name.lower(): category_id
+            for category_id, name in db.execute(select(Category.id, Category.name)).all()
+        }
+    
+    return by_name, set(by_name.values()), len(missing)
+
+
+def _use_copy(db: Session) -> bool:
+    """Whether rows can be loaded with COPY (PostgreSQL through psycopg2)."""
+    return db.get_bind().dialect.driver == 'psycopg2'
+
+
+def _copy_rows(db: Session, table_name: str, columns: List[str], rows: List[Dict[str, Any]]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        # None is written as an unquoted empty field, i.e. NULL
+        writer.writerow([row[column] for column in columns])
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    cursor.copy_expert(f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _insert_brands(db: Session, rows: List[Dict[str, Any]], batch_size: int):
+    if not rows:
+        return
+    if _use_copy(db):
+        _copy_rows(db, Brand.__tablename__, _INSERT_COLUMNS, rows)
+        return
+    for start in range(0, len(rows), batch_size):
+        db.execute(insert(Brand.__table__), rows[start:start + batch_size])
+
+
+def _update_brands(db: Session, rows: List[Dict[str, Any]], batch_size: int):
+    if not rows:
+        return
+    if _use_copy(db):
+        db.execute(text(
+            f"CREATE TEMPORARY TABLE {_UPDATES_TABLE} "
+            f"(id integer, category_id integer, keywords text, updated_at timestamp) ON COMMIT DROP"
+        ))
+        _copy_rows(db, _UPDATES_TABLE, _UPDATE_COLUMNS, rows)
+        db.execute(text(
+            f"UPDATE {Brand.__tablename__} b SET category_id = u.category_id, "
+            f"keywords = u.keywords, updated_at = u.updated_at "
+            f"FROM {_UPDATES_TABLE} u WHERE b.id = u.id"
+        ))
+        db.execute(text(f"DROP TABLE {_UPDATES_TABLE}"))
+        return
+    
+    table = Brand.__table__
+    stmt = table.update().where(table.c.id == bindparam('brand_id')).values(
+        category_id=bindparam('category_id'),
+        keywords=bindparam('keywords'),
+        updated_at=bindparam('updated_at')
+    )
+    # Keys named after columns would become SET clauses, so the id goes in as brand_id
+    params = [
+        {'brand_id': row['id'], 'category_id': row['category_id'], 'keywords': row['keywords'], 'updated_at': row['updated_at']}
+        for row in rows
+    ]
+    for start in range(0, len(params), batch_size):
+        db.execute(stmt, params[start:start + batch_size])
+
+
+def import_brands(db: Session, records: Iterable[Dict[str, Any]], batch_size: int = BATCH_SIZE) -> ImportResult:
+    """
+    Upsert brands by name (caller commits).
+    
+    Args:
+        db: Database session
+        records: Raw records, e.g. from parse_brands(); a name repeated
+            later in the list overrides the earlier one
+        batch_size: Rows per executemany batch (non-PostgreSQL)
+    
+    Returns:
+        Counts of inserted, updated, unchanged and skipped brands
+    """
+    errors: List[str] = []
+    skipped = 0
+    
+    def reject(position, reason):
+        nonlocal skipped
+        skipped += 1
+        if len(errors) < MAX_ERRORS:
+            errors.append(f"record {position}: {reason}")
+    
+    wanted: Dict[str, Tuple[int, _Record]] = {}
+    for position, raw in enumerate(records, 1):
+        try:
+            record = _normalize(raw)
+        except ValueError as e:
+            reject(position, e)
+            continue
+        wanted[record.name] = (position, record)
+    
+    if db.get_bind().dialect.name == 'postgresql':
+        # Concurrent catalog writes wait until this transaction ends; reads don't
+        db.execute(text(f"LOCK TABLE {Brand.__tablename__} IN SHARE ROW EXCLUSIVE MODE"))
+    
+    now = datetime.utcnow()
+    by_name, category_ids, categories_created = _resolve_categories(db, (r for _, r in wanted.values()), now)
+    existing = {
+        row.name: row
+        for row in db.execute(select(Brand.id, Brand.name, Brand.category_id, Brand.keywords))
+    }
+    
+    inserts, updates = [], []
+    unchanged = 0
+    moves: Dict[int, List[int]] = defaultdict(list)
+    scopes = set()
+    for position, record in wanted.values():
+        category_id = record.category_id if record.category is None else by_name[record.category.lower()]
+        if category_id not in category_ids:
+            reject(position, f"unknown category_id {category_id}")
+            continue
+        
+        current = existing.get(record.name)
+        if current is None:
+            inserts.append({
+                'name': record.name, 'category_id': category_id, 'keywords': record.keywords,
+                'created_at': now, 'updated_at': now,
+            })
+            continue
+        
+        keywords = record.keywords if record.keywords is not None else current.keywords
+        if (category_id, keywords) == (current.category_id, current.keywords):
+            unchanged += 1
+            continue
+        updates.append({'id': current.id, 'category_id': category_id, 'keywords': keywords, 'updated_at': now})
+        if category_id != current.category_id:
+            moves[category_id].append(current.id)
+            scopes.update((brand_scope(current.id), category_scope(current.category_id), category_scope(category_id)))
+    
+    _insert_brands(db, inserts, batch_size)
+    _update_brands(db, updates, batch_size)
+    
+    # Mentions follow their brand's category (see app.analytics.categories)
+    for category_id, brand_ids in moves.items():
+        for start in range(0, len(brand_ids), batch_size):
+            db.execute(
+                update(Mention)
+                .where(Mention.brand_id.in_(brand_ids[start:start + batch_size]))
+                .values(category_id=category_id)
+                .execution_options(synchronize_session=False)
+            )
+    
+    if moves:
+        scopes.add(GLOBAL)
+    if inserts or updates or categories_created:
+        scopes.add(CATALOG)
+    if scopes:
+        bump_scopes(db, scopes)
+    
+    return ImportResult(len(inserts), len(updates), unchanged, skipped, categories_created, errors)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from app.core.config import SessionLocal
+    
+    parser = argparse.ArgumentParser(description="Bulk-import brands (JSON, NDJSON or CSV)")
+    parser.add_argument('path', help="Brand list, e.g. src/data/brands.json from generate-10k.js")
+    parser.add_argument('--format', choices=FORMATS, help="Default: from the file extension")
+    args = parser.parse_args()
+    
+    with open(args.path, 'rb') as f:
+        brands = parse_brands(f.read(), args.format or detect_format(args.path))
+    
+    started = time.perf_counter()
+    session = SessionLocal()
+    try:
+        result = import_brands(session, brands)
+        session.commit()
+    finally:
+        session.close()
+    
+    for error in result.errors:
+        print(f"  skipped {error}")
+    print(
+        f"✓ {len(brands)} records in {time.perf_counter() - started:.1f}s: {result.inserted} inserted, "
+        f"{result.updated} updated, {result.unchanged} unchanged, {result.skipped} skipped, "
+        f"{result.categories_created} categories created"
+    )
@@ -0,0 +1,184 @@
+"""
+In-memory brand lookup index for search and autocomplete.
+
+The brand catalog (~10k rows) is small enough to index in process memory:
+- Prefix: every name/keyword term and each of its word suffixes, kept in
+  one sorted list. A prefix lookup is two binary searches (a flattened
+  trie), so cost depends on the number of matches, not the catalog size.
+- Fuzzy: a trigram -> terms map for typo-tolerant matching, only consulted
+  when the prefix lookup doesn't fill the page.
+
+The index is built from the catalog snapshot (app.analytics.catalog) and
+rebuilt whenever that snapshot is, so lookups normally don't touch the
+database.
+"""
+
+import asyncio
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.analytics.catalog import BrandEntry, Catalog, catalog_cache
+
+
+MIN_SIMILARITY = 0.3  # Trigram similarity (Dice) for fuzzy matches
+
+# Match kinds, best first
+EXACT, PREFIX, WORD_PREFIX, KEYWORD, FUZZY = range(5)
+MATCH_NAMES = ('exact', 'prefix', 'word_prefix', 'keyword', 'fuzzy')
+
+
+def normalize(value: str) -> str:
+    """Lowercase and collapse punctuation/whitespace to single spaces."""
+    return ' '.join(re.findall(r'\w+', value.lower()))
+
+
+def trigrams(term: str) -> set:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _rank_key(match: Tuple[int, float]) -> Tuple[int, float]:
+    kind, score = match
+    return kind, -score
+
+
+class BrandIndex:
+    """Prefix and trigram index over brand names and keywords."""
+    
+    def __init__(self, brands: List[BrandEntry], keywords: Dict[int, List[str]]):
+        """
+        Args:
+            brands: All brands
+            keywords: Brand id -> configured search keywords
+        """
+        self.brands = {brand.id: brand for brand in brands}
+        
+        # (term, kind, brand_id), sorted by term for prefix range scans
+        entries: List[Tuple[str, int, int]] = []
+        self._trigrams: Dict[str, List[int]] = {}
+        self._terms: List[Tuple[str, int, int]] = []  # (term, brand_id, trigram count)
+        
+        def add(term: str, kind: int, brand_id: int):
+            if not term:
+                return
+            entries.append((term, kind, brand_id))
+            if kind in (PREFIX, KEYWORD):
+                term_id = len(self._terms)
+                grams = trigrams(term)
+                self._terms.append((term, brand_id, len(grams)))
+                for gram in grams:
+                    self._trigrams.setdefault(gram, []).append(term_id)
+        
+        for brand in brands:
+            name = normalize(brand.name)
+            add(name, PREFIX, brand.id)
+            # Later words, so "face" finds "The North Face"
+            words = name.split(' ')
+            for i in range(1, len(words)):
+                add(' '.join(words[i:]), WORD_PREFIX, brand.id)
+            for keyword in keywords.get(brand.id, []):
+                keyword = normalize(keyword)
+                if keyword and keyword != name:
+                    add(keyword, KEYWORD, brand.id)
+        
+        entries.sort()
+        self._entries = entries
+        self._keys = [term for term, _, _ in entries]
+    
+    def __len__(self) -> int:
+        return len(self.brands)
+    
+    def _prefix_matches(self, query: str, best: Dict[int, Tuple[int, float]]):
+        start = bisect_left(self._keys, query)
+        end = bisect_left(self._keys, query + '\U0010ffff', lo=start)
+        for term, kind, brand_id in self._entries[start:end]:
+            if kind == PREFIX and term == query:
+                kind = EXACT
+            # Closer-length terms rank higher within a kind
+            match = (kind, len(query) / len(term))
+            if brand_id not in best or _rank_key(match) < _rank_key(best[brand_id]):
+                best[brand_id] = match
+    
+    def _fuzzy_matches(self, query: str, best: Dict[int, Tuple[int, float]]):
+        query_grams = trigrams(query)
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self._trigrams.get(gram, ()))
+        
+        for term_id, common in shared.items():
+            _, brand_id, gram_count = self._terms[term_id]
+            score = 2 * common / (len(query_grams) + gram_count)
+            if score < MIN_SIMILARITY:
+                continue
+            current = best.get(brand_id)
+            if current is None or (current[0] == FUZZY and score > current[1]):
+                best[brand_id] = (FUZZY, score)
+    
+    def search(self, q: str, limit: int = 10, category_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find brands by name or keyword.
+        
+        Args:
+            q: Search text (prefix of a name/keyword, or a misspelling)
+            limit: Maximum results
+            category_id: Only brands in this category (optional)
+        
+        Returns:
+            Matches ordered best first, each with its match kind and score
+        """
+        query = normalize(q)
+        if not query:
+            return []
+        
+        best: Dict[int, Tuple[int, float]] = {}
+        self._prefix_matches(query, best)
+        if category_id is not None:
+            best = {b: m for b, m in best.items() if self.brands[b].category_id == category_id}
+        
+        if len(best) < limit and len(query) >= 3:
+            self._fuzzy_matches(query, best)
+            if category_id is not None:
+                best = {b: m for b, m in best.items() if self.brands[b].category_id == category_id}
+        
+        ranked = sorted(best.items(), key=lambda item: (_rank_key(item[1]), self.brands[item[0]].name))
+        return [
+            {
+                'id': brand_id,
+                'name': self.brands[brand_id].name,
+                'category_id': self.brands[brand_id].category_id,
+                'match': MATCH_NAMES[kind],
+                'score': round(score, 3),
+            }
+            for brand_id, (kind, score) in ranked[:limit]
+        ]
+
+
+class BrandIndexCache:
+    """Holds the BrandIndex for the current catalog snapshot (app.analytics.catalog)."""
+    
+    def __init__(self):
+        self._index: Optional[BrandIndex] = None
+        self._catalog: Optional[Catalog] = None
+        self._lock = asyncio.Lock()
+    
+    async def get(self, db: AsyncSession) -> BrandIndex:
+        """Current index, rebuilt first if the catalog snapshot changed."""
+        catalog = await catalog_cache.get_async(db)
+        if catalog is self._catalog:
+            return self._index
+        
+        async with self._lock:
+            if catalog is not self._catalog:
+                # Building takes a few hundred ms for 10k brands: keep it off the event loop
+                self._index = await asyncio.to_thread(
+                    BrandIndex, list(catalog.brands.values()), catalog.keywords
+                )
+                self._catalog = catalog
+            return self._index
+
+
+brand_index_cache = BrandIndexCache()
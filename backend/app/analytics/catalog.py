@@ -0,0 +1,198 @@
+"""
+In-memory catalog of brands, categories and platforms.
+
+Ingestion, the analytics engine and the analytics routes need a brand's
+name and category, a category's brands or a platform's id on nearly every
+call. The catalog is small and rarely changes, so these lookups are served
+from a snapshot in process memory instead of the database:
+- brand id -> name and category
+- category id -> brand ids
+- platform name -> id (and active flag), platform id -> name
+- brand id -> search keywords, for the brand search index
+  (app.analytics.brand_index), which is rebuilt from this snapshot
+
+The snapshot is rebuilt when the catalog changes. The check (brand count,
+last brand update, catalog version, platform count and active flags) runs
+at most every REFRESH_SECONDS. A lookup of a brand the snapshot doesn't
+know checks right away, so a brand added by another process is found on
+first use; a category move made elsewhere shows up within REFRESH_SECONDS.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.analytics.versions import CATALOG
+from app.models.database import Brand, DataVersion, Platform
+
+
+REFRESH_SECONDS = 30
+
+
+class BrandEntry(NamedTuple):
+    id: int
+    name: str
+    category_id: int
+
+
+class PlatformEntry(NamedTuple):
+    id: int
+    name: str
+    is_active: bool
+
+
+class Catalog:
+    """Snapshot of the catalog lookups (shared between requests; read only)."""
+    
+    def __init__(
+        self,
+        brands: List[BrandEntry],
+        platforms: List[PlatformEntry],
+        keywords: Dict[int, List[str]]
+    ):
+        self.brands: Dict[int, BrandEntry] = {brand.id: brand for brand in brands}
+        self.keywords = keywords
+        self.category_brands: Dict[int, List[int]] = {}
+        for brand in sorted(brands):
+            self.category_brands.setdefault(brand.category_id, []).append(brand.id)
+        self.platforms: Dict[str, PlatformEntry] = {platform.name: platform for platform in platforms}
+        self.platform_names: Dict[int, str] = {platform.id: platform.name for platform in platforms}
+    
+    def category_of(self, brand_id: int) -> Optional[int]:
+        """A brand's category id, or None for an unknown brand."""
+        brand = self.brands.get(brand_id)
+        return brand.category_id if brand else None
+    
+    def members(self, category_ids: Iterable[int]) -> Dict[int, int]:
+        """Brand id -> category id for every brand in the given categories."""
+        return {
+            brand_id: category_id
+            for category_id in category_ids
+            for brand_id in self.category_brands.get(category_id, ())
+        }
+    
+    def platform_id(self, name: str, active_only: bool = False) -> Optional[int]:
+        """A platform's id by name, or None if unknown (or inactive, with active_only)."""
+        platform = self.platforms.get(name)
+        if platform is None or (active_only and not platform.is_active):
+            return None
+        return platform.id
+    
+    @property
+    def active_platform_count(self) -> int:
+        return sum(1 for platform in self.platforms.values() if platform.is_active)
+
+
+def _catalog_signature_stmt():
+    catalog_version = select(DataVersion.version).where(DataVersion.scope == CATALOG).scalar_subquery()
+    platforms = select(func.count(Platform.id)).scalar_subquery()
+    active_platforms = select(func.sum(Platform.is_active)).scalar_subquery()
+    return select(func.count(Brand.id), func.max(Brand.updated_at), catalog_version, platforms, active_platforms)
+
+
+_BRANDS_STMT = select(Brand.id, Brand.name, Brand.category_id, Brand.keywords)
+_PLATFORMS_STMT = select(Platform.id, Platform.name, Platform.is_active)
+
+
+def _build(brand_rows, platform_rows) -> Catalog:
+    return Catalog(
+        [BrandEntry(row.id, row.name, row.category_id) for row in brand_rows],
+        [PlatformEntry(row.id, row.name, bool(row.is_active)) for row in platform_rows],
+        {row.id: row.keywords.split(',') for row in brand_rows if row.keywords}
+    )
+
+
+class CatalogCache:
+    """Holds the current Catalog and rebuilds it when the catalog changes."""
+    
+    def __init__(self, refresh_seconds: int = REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._catalog: Optional[Catalog] = None
+        self._signature = None
+        self._checked_at = 0.0
+        # Sync callers (ingestion, worker threads) and the event loop check separately
+        self._lock = threading.Lock()
+        self._async_lock = asyncio.Lock()
+    
+    def _current(self, brand_ids: List[int], max_age: Optional[float]) -> Optional[Catalog]:
+        """The snapshot if it needs no check, else None."""
+        catalog = self._catalog
+        if catalog is None:
+            return None
+        max_age = self.refresh_seconds if max_age is None else max_age
+        if time.monotonic() - self._checked_at >= max_age:
+            return None
+        if any(brand_id not in catalog.brands for brand_id in brand_ids):
+            return None
+        return catalog
+    
+    def _checked(self, signature, catalog: Optional[Catalog]) -> Catalog:
+        if catalog is not None:
+            self._catalog = catalog
+            self._signature = signature
+        self._checked_at = time.monotonic()
+        return self._catalog
+    
+    def get(self, db: Session, brand_ids: Iterable[int] = (), max_age: Optional[float] = None) -> Catalog:
+        """
+        Current catalog, rebuilt first if it changed.
+        
+        Args:
+            db: Database session
+            brand_ids: Brands the caller will look up; unknown ones trigger a check
+            max_age: Check if the last one is older than this (default REFRESH_SECONDS)
+        
+        Returns:
+            Catalog snapshot
+        """
+        brand_ids = list(brand_ids)
+        catalog = self._current(brand_ids, max_age)
+        if catalog is not None:
+            return catalog
+        
+        with self._lock:
+            catalog = self._current(brand_ids, max_age)
+            if catalog is not None:
+                return catalog
+            
+            signature = tuple(db.execute(_catalog_signature_stmt()).one())
+            if self._catalog is None or signature != self._signature:
+                catalog = _build(db.execute(_BRANDS_STMT).all(), db.execute(_PLATFORMS_STMT).all())
+            return self._checked(signature, catalog)
+    
+    async def get_async(
+        self,
+        db: AsyncSession,
+        brand_ids: Iterable[int] = (),
+        max_age: Optional[float] = None
+    ) -> Catalog:
+        """Async version of get."""
+        brand_ids = list(brand_ids)
+        catalog = self._current(brand_ids, max_age)
+        if catalog is not None:
+            return catalog
+        
+        async with self._async_lock:
+            catalog = self._current(brand_ids, max_age)
+            if catalog is not None:
+                return catalog
+            
+            signature = tuple((await db.execute(_catalog_signature_stmt())).one())
+            if self._catalog is None or signature != self._signature:
+                catalog = _build(
+                    (await db.execute(_BRANDS_STMT)).all(),
+                    (await db.execute(_PLATFORMS_STMT)).all()
+                )
+            return self._checked(signature, catalog)
+    
+    def invalidate(self):
+        """Force a catalog check on the next lookup."""
+        self._checked_at = 0.0
+
+
+catalog_cache = CatalogCache()
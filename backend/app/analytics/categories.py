@@ -0,0 +1,122 @@
+"""
+Denormalized category on mentions.
+
+Mention.category_id copies the brand's category so category aggregates
+(SOV totals, active brands, /compare) are a single range scan on
+(category_id, timestamp) instead of a brands join or IN list.
+
+It is kept in step by:
+- ingestion, which sets it on every new mention
+- an ORM hook on Brand (app.models.database) that rewrites a brand's
+  mentions when its category_id changes, in the same transaction
+
+Bulk UPDATEs of brands bypass the hook; run the backfill afterwards (it
+only touches mentions whose category is missing or stale).
+
+Usage:
+    python -m app.analytics.categories backfill   # upgrade / repair
+"""
+
+from typing import Iterable
+
+from sqlalchemy import inspect, or_, select, text, update
+from sqlalchemy.orm import Session
+
+from app.analytics.versions import CATALOG, GLOBAL, brand_scope, bump_scopes, category_scope
+from app.models.database import Brand, Mention
+
+
+CATEGORY_INDEX = 'ix_mentions_category_timestamp'
+
+
+def ensure_category_column(db: Session) -> bool:
+    """
+    Add mentions.category_id to a database created before it existed.
+    
+    Returns:
+        Whether the column was added (caller commits)
+    """
+    columns = {column['name'] for column in inspect(db.connection()).get_columns(Mention.__tablename__)}
+    if 'category_id' in columns:
+        return False
+    db.execute(text(
+        f"ALTER TABLE {Mention.__tablename__} ADD COLUMN category_id INTEGER REFERENCES categories (id)"
+    ))
+    return True
+
+
+def backfill_categories(db: Session) -> int:
+    """
+    Copy each brand's category onto its mentions where missing or stale.
+    
+    One brand per transaction (through the brand's mention index), so it
+    can run on a live database and be interrupted and repeated. The
+    category index is created at the end, once the column is filled.
+    
+    Args:
+        db: Database session
+    
+    Returns:
+        Number of mentions updated
+    """
+    if ensure_category_column(db):
+        db.commit()
+    
+    updated = 0
+    for brand_id, category_id in db.execute(select(Brand.id, Brand.category_id).order_by(Brand.id)).all():
+        result = db.execute(
+            update(Mention)
+            .where(
+                Mention.brand_id == brand_id,
+                or_(Mention.category_id.is_(None), Mention.category_id != category_id)
+            )
+            .values(category_id=category_id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            bump_scopes(db, [brand_scope(brand_id), category_scope(category_id)])
+            updated += result.rowcount
+        db.commit()
+    
+    index = next(index for index in Mention.__table__.indexes if index.name == CATEGORY_INDEX)
+    index.create(db.connection(), checkfirst=True)
+    db.commit()
+    return updated
+
+
+def move_brands(db: Session, brands: Iterable[Brand], category_id: int):
+    """
+    Move brands to another category.
+    
+    Their mentions follow at flush (see app.models.database); this also
+    invalidates cached analytics for the brands and both categories, and
+    the in-memory catalog. Caller commits.
+    
+    Args:
+        db: Database session
+        brands: Brands to move
+        category_id: Target category
+    """
+    scopes = {GLOBAL, CATALOG, category_scope(category_id)}
+    for brand in brands:
+        if brand.category_id != category_id:
+            scopes.update((brand_scope(brand.id), category_scope(brand.category_id)))
+            brand.category_id = category_id
+    if len(scopes) > 3:
+        db.flush()
+        bump_scopes(db, sorted(scopes))
+
+
+if __name__ == "__main__":
+    import sys
+    from app.core.config import SessionLocal
+    
+    if sys.argv[1:] != ['backfill']:
+        print("Usage: python -m app.analytics.categories backfill")
+        sys.exit(1)
+    
+    session = SessionLocal()
+    try:
+        print(f"✓ Mention categories backfilled ({backfill_categories(session)} mentions updated)")
+    finally:
+        session.close()
@@ -0,0 +1,207 @@
+"""
+Mention counters maintained at ingestion time.
+
+The dashboard reads totals and 30-day breakdowns from these small tables
+instead of counting and grouping the mentions table on every request.
+
+Usage:
+    record_mentions(db, new_mentions)   # before db.commit() at ingestion
+    python -m app.analytics.counters rebuild   # backfill / repair
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import func, select, text, delete
+from sqlalchemy.orm import Session
+
+from app.core.dialect import day_bucket, insert_for
+from app.models.database import Mention, MentionDailyCount, MentionCounter
+
+
+# Recent mentions on the dashboard and the ingestion freshness check
+COLLECTED_AT_INDEX = 'ix_mentions_collected_at'
+
+TOTAL_MENTIONS = 'mentions_total'
+
+
+def upsert_add(db: Session, table, key: dict, column: str, amount: int):
+    """Add `amount` to a counter row, creating it if missing."""
+    upsert_add_rows(db, table, list(key), column, [{**key, column: amount}])
+
+
+def upsert_add_rows(db: Session, table, key_columns: List[str], column: str, rows: List[dict]):
+    """
+    Add each row's `column` value to its counter row, creating missing ones.
+    
+    One multi-row INSERT ... ON CONFLICT on PostgreSQL and SQLite; keys
+    must be distinct within `rows`.
+    
+    Args:
+        db: Database session
+        table: Counter table
+        key_columns: Columns of its primary key
+        column: Counter column
+        rows: Key values plus the amount to add under `column`
+    """
+    insert = insert_for(db.get_bind().dialect.name)
+    
+    if insert is not None:
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={column: getattr(table.c, column) + stmt.excluded[column]}
+        )
+        db.execute(stmt)
+        return
+    
+    # Portable fallback: update, insert if nothing matched
+    for row in rows:
+        conditions = [getattr(table.c, k) == row[k] for k in key_columns]
+        result = db.execute(
+            table.update().where(*conditions).values({column: getattr(table.c, column) + row[column]})
+        )
+        if result.rowcount == 0:
+            db.execute(table.insert().values(**row))
+
+
+def record_mentions(db: Session, mentions: Iterable[Mention]):
+    """
+    Increment counters for newly added mentions.
+    
+    Call in the same transaction that inserts the mentions so counters and
+    rows commit (or roll back) together.
+    
+    Args:
+        db: Database session
+        mentions: Mentions being inserted
+    """
+    per_day = Counter(
+        (m.timestamp.date(), m.brand_id, m.platform_id) for m in mentions
+    )
+    if not per_day:
+        return
+    
+    # Sorted so concurrent writers lock rows in the same order
+    upsert_add_rows(
+        db, MentionDailyCount.__table__, ['day', 'brand_id', 'platform_id'], 'mention_count',
+        [
+            {'day': day, 'brand_id': brand_id, 'platform_id': platform_id, 'mention_count': count}
+            for (day, brand_id, platform_id), count in sorted(per_day.items())
+        ]
+    )
+    upsert_add(db, MentionCounter.__table__, {'name': TOTAL_MENTIONS}, 'value', sum(per_day.values()))
+
+
+def counter_stmt(name: str):
+    """Statement selecting a named counter's value."""
+    return select(MentionCounter.value).where(MentionCounter.name == name)
+
+
+def get_counter(db: Session, name: str) -> int:
+    """Current value of a named counter (0 if never set)."""
+    return db.execute(counter_stmt(name)).scalar() or 0
+
+
+def approximate_row_count_stmt(dialect_name: str, table_name: str):
+    """
+    Statement returning the planner's row estimate for a table, or None
+    if the dialect has no such statistic.
+    
+    On PostgreSQL this reads pg_class.reltuples (kept current by
+    autovacuum/ANALYZE), which costs nothing regardless of table size.
+    A never-analyzed table reports -1, which comes back as NULL.
+    
+    Autovacuum never analyzes a partitioned parent, so its own reltuples
+    would stay frozen at the last manual ANALYZE; for a partitioned table
+    the estimate is the sum over its partitions (never-analyzed ones count
+    as empty; NULL if none has been analyzed).
+    """
+    if dialect_name != 'postgresql':
+        return None
+    
+    return text(
+        "SELECT CASE WHEN parent.relkind = 'p' THEN ("
+        "    SELECT CASE WHEN max(child.reltuples) < 0 THEN NULL ELSE sum(GREATEST(child.reltuples, 0)) END"
+        "    FROM pg_inherits JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+        "    WHERE pg_inherits.inhparent = parent.oid"
+        ") ELSE NULLIF(GREATEST(parent.reltuples, -1), -1) END::bigint "
+        "FROM pg_class parent WHERE parent.oid = to_regclass(:name)"
+    ).bindparams(name=table_name)
+
+
+def approximate_row_count(db: Session, table_name: str) -> Optional[int]:
+    """Planner row estimate for a table, or None if unavailable."""
+    stmt = approximate_row_count_stmt(db.get_bind().dialect.name, table_name)
+    return db.execute(stmt).scalar() if stmt is not None else None
+
+
+def rebuild_counters(db: Session):
+    """
+    Recompute all counters from the mentions table and the archive.
+    
+    Use to backfill after upgrading or to repair drift after manual
+    deletes. Runs in one transaction. Archived mentions still count, as
+    they do between rebuilds: days before the archive cutoff are counted
+    from the Parquet files (app.analytics.archive), the rest from the
+    mentions table. Only mentions removed by retention drop out.
+    
+    Also creates the collected_at index on databases from before it
+    existed.
+    """
+    # Imported here: archive imports partitions, which imports this module
+    from app.analytics.archive import get_archive
+    
+    archive = get_archive()
+    cutoff = archive.cutoff if archive is not None else None
+    
+    db.execute(delete(MentionDailyCount))
+    db.execute(delete(MentionCounter))
+    
+    day = day_bucket(db.get_bind().dialect.name, Mention.timestamp)
+    stmt = select(day, Mention.brand_id, Mention.platform_id, func.count(Mention.id))
+    if cutoff is not None:
+        stmt = stmt.where(Mention.timestamp >= cutoff)
+    rows = db.execute(stmt.group_by(day, Mention.brand_id, Mention.platform_id)).all()
+    
+    if cutoff is not None and archive.months():
+        archived_day = day_bucket('postgresql', Mention.timestamp).label('day')
+        first = datetime.strptime(archive.months()[0], '%Y-%m')
+        rows += [
+            (row['day'], row['brand_id'], row['platform_id'], row['count'])
+            for row in archive.query(
+                select(archived_day, Mention.brand_id, Mention.platform_id, func.count(Mention.id).label('count'))
+                .where(Mention.timestamp < cutoff)
+                .group_by(archived_day, Mention.brand_id, Mention.platform_id),
+                None, first, cutoff
+            )
+        ]
+    
+    total = 0
+    for row_day, brand_id, platform_id, count in rows:
+        db.add(MentionDailyCount(day=row_day, brand_id=brand_id, platform_id=platform_id, mention_count=count))
+        total += count
+    
+    db.add(MentionCounter(name=TOTAL_MENTIONS, value=total))
+    db.commit()
+    
+    index = next(index for index in Mention.__table__.indexes if index.name == COLLECTED_AT_INDEX)
+    index.create(db.connection(), checkfirst=True)
+    db.commit()
+
+
+if __name__ == "__main__":
+    import sys
+    from app.core.config import SessionLocal
+    
+    if sys.argv[1:] != ['rebuild']:
+        print("Usage: python -m app.analytics.counters rebuild")
+        sys.exit(1)
+    
+    session = SessionLocal()
+    try:
+        rebuild_counters(session)
+        print(f"✓ Counters rebuilt ({get_counter(session, TOTAL_MENTIONS)} mentions)")
+    finally:
+        session.close()
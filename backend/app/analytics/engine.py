@@ -5,14 +5,383 @@ This module contains pure business logic for:
 - Share of Voice (SOV)
 - Market Index Score
 - Engagement normalization
+- Multi-brand, multi-window comparisons
 
 NO database or API logic should be here - only calculations.
+
+Each metric is split into statement builders (the queries it needs) and a
+pure calculation over their results, so AnalyticsEngine (sync Session) and
+AsyncAnalyticsEngine (AsyncSession) share the same queries and formulas.
+Category aggregates filter on the denormalized Mention.category_id (see
+app.analytics.categories), a range scan on (category_id, timestamp).
+Brand categories, category members and platform names come from the
+in-memory catalog (app.analytics.catalog), not from queries.
+
+Windows reaching past the archive cutoff (see app.analytics.archive) run
+one partial-aggregate query on the database and the same query on the
+archive, and merge the two before applying the formulas.
 """
 
-from datetime import datetime
-from typing import List, Dict
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Iterable, List, Dict, Mapping, Optional, Tuple
+from sqlalchemy import select, func, case
 from sqlalchemy.orm import Session
-from app.models.database import Brand, Mention, Category
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.analytics.archive import MentionArchive, get_archive
+from app.analytics.catalog import BrandEntry, Catalog, catalog_cache
+from app.models.database import Mention
+
+
+def _in_window(start_date: datetime, end_date: datetime) -> List:
+    return [Mention.timestamp >= start_date, Mention.timestamp <= end_date]
+
+
+def _brand_mentions_stmt(brand_id: int, start_date: datetime, end_date: datetime):
+    return select(func.count(Mention.id)).where(
+        Mention.brand_id == brand_id,
+        *_in_window(start_date, end_date)
+    )
+
+
+def _category_mentions_stmt(category_id: int, start_date: datetime, end_date: datetime):
+    return select(func.count(Mention.id)).where(
+        Mention.category_id == category_id,
+        *_in_window(start_date, end_date)
+    )
+
+
+def _brand_activity_stmt(brand_id: int, start_date: datetime, end_date: datetime):
+    """Mention count, summed engagement and distinct platforms for a brand."""
+    return select(
+        func.count(Mention.id),
+        func.coalesce(func.sum(Mention.engagement_score), 0.0),
+        func.count(func.distinct(Mention.platform_id))
+    ).where(
+        Mention.brand_id == brand_id,
+        *_in_window(start_date, end_date)
+    )
+
+
+def _category_active_brands_stmt(category_id: int, start_date: datetime, end_date: datetime):
+    """Number of brands in a category with mentions in the window."""
+    return select(func.count(func.distinct(Mention.brand_id))).where(
+        Mention.category_id == category_id,
+        *_in_window(start_date, end_date)
+    )
+
+
+def _platform_distribution_stmt(brand_id: int, start_date: datetime, end_date: datetime):
+    return select(
+        Mention.platform_id,
+        func.count(Mention.id).label('count')
+    ).where(
+        Mention.brand_id == brand_id,
+        *_in_window(start_date, end_date)
+    ).group_by(
+        Mention.platform_id
+    )
+
+
+def _platform_counts(catalog: Catalog, counts: Iterable[Tuple[int, int]]) -> Dict[str, int]:
+    """Platform name -> mention count from (platform id, count) pairs."""
+    return {catalog.platform_names[platform_id]: count for platform_id, count in counts if count}
+
+
+def _window_starts(windows: List[int], end_date: datetime) -> Dict[int, datetime]:
+    return {days: end_date - timedelta(days=days) for days in windows}
+
+
+def _brand_comparison_stmt(brand_ids: List[int], starts: Dict[int, datetime], end_date: datetime):
+    """
+    Per-brand activity for several windows in one scan of the longest one.
+    
+    For each window: mention count, summed engagement, distinct platforms,
+    via conditional aggregates (CASE inside the aggregate).
+    """
+    columns = [Mention.brand_id]
+    for days, start in starts.items():
+        in_window = Mention.timestamp >= start
+        columns += [
+            func.count(case((in_window, Mention.id))).label(f'mentions_{days}'),
+            func.coalesce(func.sum(case((in_window, Mention.engagement_score))), 0.0).label(f'engagement_{days}'),
+            func.count(func.distinct(case((in_window, Mention.platform_id)))).label(f'platforms_{days}'),
+        ]
+    return select(*columns).where(
+        Mention.brand_id.in_(brand_ids),
+        *_in_window(min(starts.values()), end_date)
+    ).group_by(Mention.brand_id)
+
+
+def _category_comparison_stmt(category_ids: List[int], starts: Dict[int, datetime], end_date: datetime):
+    """Per-category mention count and active brands for several windows in one scan."""
+    columns = [Mention.category_id]
+    for days, start in starts.items():
+        in_window = Mention.timestamp >= start
+        columns += [
+            func.count(case((in_window, Mention.id))).label(f'mentions_{days}'),
+            func.count(func.distinct(case((in_window, Mention.brand_id)))).label(f'brands_{days}'),
+        ]
+    return select(*columns).where(
+        Mention.category_id.in_(category_ids),
+        *_in_window(min(starts.values()), end_date)
+    ).group_by(Mention.category_id)
+
+
+def _archive_split(start_date: datetime) -> Optional[Tuple[MentionArchive, datetime]]:
+    """(archive, cutoff) if a window starting at start_date reaches into the archive."""
+    archive = get_archive()
+    cutoff = archive.cutoff if archive else None
+    if cutoff is None or start_date >= cutoff:
+        return None
+    return archive, cutoff
+
+
+def _split_bounds(start_date: datetime, end_date: datetime, cutoff: datetime) -> Tuple[Optional[List], Optional[List]]:
+    """Timestamp conditions for the database and archive parts of a window (None = no part)."""
+    hot = [Mention.timestamp >= max(start_date, cutoff), Mention.timestamp <= end_date] if end_date >= cutoff else None
+    cold = [*_in_window(start_date, end_date), Mention.timestamp < cutoff] if start_date < cutoff else None
+    return hot, cold
+
+
+def _activity_partials_stmt(brand_ids: List[int], starts: Dict[int, datetime], bounds: List):
+    """
+    Per (brand, platform) mention count and summed engagement for several windows.
+    
+    Counts and sums add up across the database and the archive, and
+    distinct platforms/brands can be recovered from the groups, so results
+    of both stores can be merged (see activity_from_partials).
+    """
+    columns = [Mention.brand_id, Mention.platform_id]
+    for days, start in starts.items():
+        in_window = Mention.timestamp >= start
+        columns += [
+            func.count(case((in_window, Mention.id))).label(f'mentions_{days}'),
+            func.coalesce(func.sum(case((in_window, Mention.engagement_score))), 0.0).label(f'engagement_{days}'),
+        ]
+    return select(*columns).where(
+        Mention.brand_id.in_(brand_ids),
+        *bounds
+    ).group_by(Mention.brand_id, Mention.platform_id)
+
+
+def merge_partials(rows: Iterable[Mapping], windows: Iterable[int]) -> Dict[Tuple[int, int], Counter]:
+    """Sum _activity_partials_stmt rows from several stores by (brand, platform)."""
+    merged: Dict[Tuple[int, int], Counter] = {}
+    for row in rows:
+        totals = merged.setdefault((row['brand_id'], row['platform_id']), Counter())
+        for days in windows:
+            totals[f'mentions_{days}'] += row[f'mentions_{days}']
+            totals[f'engagement_{days}'] += float(row[f'engagement_{days}'])
+    return merged
+
+
+def activity_from_partials(
+    partials: Dict[Tuple[int, int], Counter],
+    windows: Iterable[int],
+    brand_categories: Dict[int, Optional[int]]
+) -> Tuple[Dict[int, Counter], Dict[int, Counter]]:
+    """
+    Per-brand and per-category window totals from merged partials.
+    
+    Same keys as the _brand_comparison_stmt / _category_comparison_stmt
+    columns (mentions_N, engagement_N, platforms_N / mentions_N, brands_N).
+    
+    Args:
+        partials: Result of merge_partials
+        windows: Window keys
+        brand_categories: Brand id -> category id, for every brand queried
+    """
+    windows = list(windows)
+    brand_activity: Dict[int, Counter] = {}
+    category_activity: Dict[int, Counter] = {}
+    
+    for (brand_id, _), totals in partials.items():
+        brand = brand_activity.setdefault(brand_id, Counter())
+        for days in windows:
+            mentions = totals[f'mentions_{days}']
+            brand[f'mentions_{days}'] += mentions
+            brand[f'engagement_{days}'] += totals[f'engagement_{days}']
+            brand[f'platforms_{days}'] += bool(mentions)
+    
+    for brand_id, brand in brand_activity.items():
+        category = category_activity.setdefault(brand_categories.get(brand_id), Counter())
+        for days in windows:
+            category[f'mentions_{days}'] += brand[f'mentions_{days}']
+            category[f'brands_{days}'] += bool(brand[f'mentions_{days}'])
+    
+    return brand_activity, category_activity
+
+
+def comparison_matrix(
+    brands: List[BrandEntry],
+    windows: List[int],
+    metrics: List[str],
+    by_brand: Mapping[int, Mapping[str, Any]],
+    by_category: Mapping[int, Mapping[str, Any]]
+) -> List[Dict]:
+    """
+    Assemble per-brand metric vectors (one value per window).
+    
+    Uses the same formulas as the single-brand endpoints; SOV is relative
+    to each brand's own category.
+    
+    Args:
+        brands: Brands to report, in output order
+        windows: Window lengths in days
+        metrics: Metric names to include
+        by_brand: Brand id -> _brand_comparison_stmt row mapping
+        by_category: Category id -> _category_comparison_stmt row mapping
+    """
+    matrix = []
+    for brand in brands:
+        activity = by_brand.get(brand.id, {})
+        category = by_category.get(brand.category_id, {})
+        values = {metric: [] for metric in metrics}
+        
+        for days in windows:
+            mentions = activity.get(f'mentions_{days}', 0)
+            engagement = float(activity.get(f'engagement_{days}', 0.0))
+            platforms = activity.get(f'platforms_{days}', 0)
+            category_mentions = category.get(f'mentions_{days}', 0)
+            
+            computed = {
+                'mentions': mentions,
+                'engagement': round(engagement, 3),
+                'platforms': platforms,
+                'category_mentions': category_mentions,
+            }
+            if 'share_of_voice' in values:
+                computed['share_of_voice'] = share_of_voice(mentions, category_mentions)['share_of_voice']
+            if 'market_index' in values:
+                computed['market_index'] = market_index(
+                    mentions, engagement, platforms, category.get(f'brands_{days}', 0)
+                )['market_index_score']
+            
+            for metric in metrics:
+                values[metric].append(computed[metric])
+        
+        matrix.append({
+            'brand_id': brand.id,
+            'brand_name': brand.name,
+            'category_id': brand.category_id,
+            'values': values,
+        })
+    
+    return matrix
+
+
+def share_of_voice(brand_mentions: int, category_mentions: int) -> Dict:
+    """
+    Formula: SOV = (brand_mentions / total_category_mentions) * 100
+    """
+    sov = (brand_mentions / category_mentions * 100) if category_mentions > 0 else 0.0
+    
+    return {
+        'brand_mentions': brand_mentions,
+        'category_mentions': category_mentions,
+        'share_of_voice': round(sov, 2)
+    }
+
+
+def market_index(
+    mention_count: int,
+    total_engagement: float,
+    platform_count: int,
+    max_mentions: int
+) -> Dict:
+    """
+    Formula:
+    Market Index = (
+        0.5 * normalized_mentions +
+        0.3 * normalized_engagement +
+        0.2 * platform_coverage
+    ) * 100
+    
+    Args:
+        mention_count: Brand mentions in the period
+        total_engagement: Sum of the brand's normalized engagement scores
+        platform_count: Distinct platforms the brand appears on
+        max_mentions: Category normalizer (brands in the category with mentions)
+    """
+    if mention_count == 0:
+        return {
+            'market_index_score': 0.0,
+            'normalized_mentions': 0.0,
+            'normalized_engagement': 0.0,
+            'platform_coverage': 0.0
+        }
+    
+    # Component 1: Normalized mention count (0-1)
+    normalized_mentions = min(mention_count / (max_mentions + 1), 1.0) if max_mentions > 0 else 0.5
+    
+    # Component 2: Normalized engagement (0-1)
+    avg_engagement = total_engagement / mention_count
+    normalized_engagement = min(avg_engagement, 1.0)
+    
+    # Component 3: Platform coverage (0-1)
+    # How many of the 4 platforms does the brand appear on?
+    platform_coverage = platform_count / 4.0  # We have 4 platforms
+    
+    # Calculate final score
+    score = (
+        0.5 * normalized_mentions +
+        0.3 * normalized_engagement +
+        0.2 * platform_coverage
+    ) * 100
+    
+    return {
+        'market_index_score': round(score, 2),
+        'normalized_mentions': round(normalized_mentions, 3),
+        'normalized_engagement': round(normalized_engagement, 3),
+        'platform_coverage': round(platform_coverage, 3)
+    }
+
+
+def _spanning_partials(
+    db: Session,
+    split: Tuple[MentionArchive, datetime],
+    brand_ids: List[int],
+    starts: Dict[int, datetime],
+    end_date: datetime
+) -> Dict[Tuple[int, int], Counter]:
+    """Merged activity partials over the database and the archive."""
+    archive, cutoff = split
+    start_date = min(starts.values())
+    hot, cold = _split_bounds(start_date, end_date, cutoff)
+    
+    rows = []
+    if hot:
+        rows += [row._mapping for row in db.execute(_activity_partials_stmt(brand_ids, starts, hot)).all()]
+    if cold:
+        rows += archive.query(
+            _activity_partials_stmt(brand_ids, starts, cold), brand_ids, start_date, min(end_date, cutoff)
+        )
+    return merge_partials(rows, starts)
+
+
+async def _spanning_partials_async(
+    db: AsyncSession,
+    split: Tuple[MentionArchive, datetime],
+    brand_ids: List[int],
+    starts: Dict[int, datetime],
+    end_date: datetime
+) -> Dict[Tuple[int, int], Counter]:
+    """Async version of _spanning_partials; the archive query runs in a worker thread."""
+    archive, cutoff = split
+    start_date = min(starts.values())
+    hot, cold = _split_bounds(start_date, end_date, cutoff)
+    
+    rows = []
+    if hot:
+        rows += [row._mapping for row in (await db.execute(_activity_partials_stmt(brand_ids, starts, hot))).all()]
+    if cold:
+        rows += await asyncio.to_thread(
+            archive.query,
+            _activity_partials_stmt(brand_ids, starts, cold), brand_ids, start_date, min(end_date, cutoff)
+        )
+    return merge_partials(rows, starts)
 
 
 class AnalyticsEngine:
@@ -42,38 +411,27 @@ class AnalyticsEngine:
             start_date: Period start
             end_date: Period end
             db: Database session
-            
+        
         Returns:
             Dictionary with SOV data
         """
-        # Get brand mentions in period
-        brand_mentions = db.query(Mention).filter(
-            Mention.brand_id == brand_id,
-            Mention.timestamp >= start_date,
-            Mention.timestamp <= end_date
-        ).count()
-        
-        # Get all brands in category
-        category_brand_ids = db.query(Brand.id).filter(
-            Brand.category_id == category_id
-        ).all()
-        category_brand_ids = [b[0] for b in category_brand_ids]
-        
-        # Get total category mentions
-        category_mentions = db.query(Mention).filter(
-            Mention.brand_id.in_(category_brand_ids),
-            Mention.timestamp >= start_date,
-            Mention.timestamp <= end_date
-        ).count()
-        
-        # Calculate SOV
-        sov = (brand_mentions / category_mentions * 100) if category_mentions > 0 else 0.0
+        split = _archive_split(start_date)
+        if split:
+            members = catalog_cache.get(db, [brand_id]).members([category_id])
+            members.setdefault(brand_id, None)
+            by_brand, by_category = activity_from_partials(
+                _spanning_partials(db, split, list(members), {0: start_date}, end_date),
+                {0: start_date}, members
+            )
+            return share_of_voice(
+                by_brand.get(brand_id, {}).get('mentions_0', 0),
+                by_category.get(category_id, {}).get('mentions_0', 0)
+            )
         
-        return {
-            'brand_mentions': brand_mentions,
-            'category_mentions': category_mentions,
-            'share_of_voice': round(sov, 2)
-        }
+        brand_mentions = db.execute(_brand_mentions_stmt(brand_id, start_date, end_date)).scalar()
+        category_mentions = db.execute(_category_mentions_stmt(category_id, start_date, end_date)).scalar()
+        
+        return share_of_voice(brand_mentions, category_mentions)
     
     @staticmethod
     def calculate_market_index_score(
@@ -85,78 +443,42 @@ class AnalyticsEngine:
         """
         Calculate Market Index Score for a brand.
         
-        Formula:
-        Market Index = (
-            0.5 * normalized_mentions +
-            0.3 * normalized_engagement +
-            0.2 * platform_coverage
-        ) * 100
-        
         Args:
             brand_id: Target brand ID
             start_date: Period start
             end_date: Period end
             db: Database session
-            
+        
         Returns:
             Dictionary with market index components and final score
         """
-        # Get brand's mentions
-        mentions = db.query(Mention).filter(
-            Mention.brand_id == brand_id,
-            Mention.timestamp >= start_date,
-            Mention.timestamp <= end_date
-        ).all()
-        
-        if not mentions:
-            return {
-                'market_index_score': 0.0,
-                'normalized_mentions': 0.0,
-                'normalized_engagement': 0.0,
-                'platform_coverage': 0.0
-            }
+        catalog = catalog_cache.get(db, [brand_id])
+        category_id = catalog.category_of(brand_id)
         
-        # Get category for normalization
-        brand = db.query(Brand).filter(Brand.id == brand_id).first()
-        category_brands = db.query(Brand.id).filter(
-            Brand.category_id == brand.category_id
-        ).all()
-        category_brand_ids = [b[0] for b in category_brands]
-        
-        # Get max mentions in category (for normalization)
-        max_mentions = db.query(Mention).filter(
-            Mention.brand_id.in_(category_brand_ids),
-            Mention.timestamp >= start_date,
-            Mention.timestamp <= end_date
-        ).group_by(Mention.brand_id).count()
-        
-        # Component 1: Normalized mention count (0-1)
-        mention_count = len(mentions)
-        normalized_mentions = min(mention_count / (max_mentions + 1), 1.0) if max_mentions > 0 else 0.5
-        
-        # Component 2: Normalized engagement (0-1)
-        total_engagement = sum(m.engagement_score for m in mentions)
-        avg_engagement = total_engagement / mention_count if mention_count > 0 else 0.0
-        normalized_engagement = min(avg_engagement, 1.0)
-        
-        # Component 3: Platform coverage (0-1)
-        # How many of the 4 platforms does the brand appear on?
-        unique_platforms = len(set(m.platform_id for m in mentions))
-        platform_coverage = unique_platforms / 4.0  # We have 4 platforms
-        
-        # Calculate final score
-        market_index = (
-            0.5 * normalized_mentions +
-            0.3 * normalized_engagement +
-            0.2 * platform_coverage
-        ) * 100
+        split = _archive_split(start_date)
+        if split:
+            members = catalog.members([category_id])
+            by_brand, by_category = activity_from_partials(
+                _spanning_partials(db, split, list(members), {0: start_date}, end_date),
+                {0: start_date}, members
+            )
+            activity = by_brand.get(brand_id, {})
+            return market_index(
+                activity.get('mentions_0', 0),
+                activity.get('engagement_0', 0.0),
+                activity.get('platforms_0', 0),
+                by_category.get(category_id, {}).get('brands_0', 0)
+            )
         
-        return {
-            'market_index_score': round(market_index, 2),
-            'normalized_mentions': round(normalized_mentions, 3),
-            'normalized_engagement': round(normalized_engagement, 3),
-            'platform_coverage': round(platform_coverage, 3)
-        }
+        mention_count, total_engagement, platform_count = db.execute(
+            _brand_activity_stmt(brand_id, start_date, end_date)
+        ).one()
+        
+        max_mentions = 0
+        if mention_count:
+            max_mentions = db.execute(_category_active_brands_stmt(category_id, start_date, end_date)).scalar()
+        
+        return market_index(mention_count, total_engagement, platform_count, max_mentions)
     
     @staticmethod
     def aggregate_platform_distribution(
@@ -171,20 +493,184 @@ class AnalyticsEngine:
         Returns:
             Dict mapping platform name to mention count
         """
-        from sqlalchemy import func
-        from app.models.database import Platform
-        
-        results = db.query(
-            Platform.name,
-            func.count(Mention.id).label('count')
-        ).join(
-            Mention, Mention.platform_id == Platform.id
-        ).filter(
-            Mention.brand_id == brand_id,
-            Mention.timestamp >= start_date,
-            Mention.timestamp <= end_date
-        ).group_by(
-            Platform.name
-        ).all()
-        
-        return {name: count for name, count in results}
+        catalog = catalog_cache.get(db)
+        
+        split = _archive_split(start_date)
+        if split:
+            partials = _spanning_partials(db, split, [brand_id], {0: start_date}, end_date)
+            return _platform_counts(
+                catalog, ((platform_id, totals['mentions_0']) for (_, platform_id), totals in partials.items())
+            )
+        
+        results = db.execute(_platform_distribution_stmt(brand_id, start_date, end_date)).all()
+        
+        return _platform_counts(catalog, results)
+    
+    @staticmethod
+    def compare_brands(
+        brands: List[BrandEntry],
+        windows: List[int],
+        metrics: List[str],
+        end_date: datetime,
+        db: Session
+    ) -> List[Dict]:
+        """
+        Compute several metrics for many brands over several windows.
+        
+        Two queries in total (brand activity and category totals), each a
+        single scan of the longest window with per-window conditional
+        aggregates, instead of one query per brand, window and metric.
+        
+        Args:
+            brands: Brands to compare
+            windows: Window lengths in days, all ending at end_date
+            metrics: Metric names (see comparison_matrix)
+            end_date: Common window end
+            db: Database session
+        
+        Returns:
+            One dict per brand with a value list per metric
+        """
+        starts = _window_starts(windows, end_date)
+        category_ids = list({b.category_id for b in brands})
+        
+        split = _archive_split(min(starts.values()))
+        if split:
+            members = catalog_cache.get(db, [b.id for b in brands]).members(category_ids)
+            by_brand, by_category = activity_from_partials(
+                _spanning_partials(db, split, list(members), starts, end_date),
+                starts, members
+            )
+            return comparison_matrix(brands, windows, metrics, by_brand, by_category)
+        
+        brand_rows = db.execute(_brand_comparison_stmt([b.id for b in brands], starts, end_date)).all()
+        category_rows = db.execute(_category_comparison_stmt(category_ids, starts, end_date)).all()
+        
+        return comparison_matrix(
+            brands, windows, metrics,
+            {row.brand_id: row._mapping for row in brand_rows},
+            {row.category_id: row._mapping for row in category_rows}
+        )
+
+
+class AsyncAnalyticsEngine:
+    """
+    AnalyticsEngine for AsyncSession.
+    
+    Same queries and formulas; awaiting each query lets other requests run
+    on the event loop while the database works.
+    """
+    
+    @staticmethod
+    async def calculate_share_of_voice(
+        brand_id: int,
+        category_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        db: AsyncSession
+    ) -> Dict:
+        """Async version of AnalyticsEngine.calculate_share_of_voice."""
+        split = _archive_split(start_date)
+        if split:
+            members = (await catalog_cache.get_async(db, [brand_id])).members([category_id])
+            members.setdefault(brand_id, None)
+            by_brand, by_category = activity_from_partials(
+                await _spanning_partials_async(db, split, list(members), {0: start_date}, end_date),
+                {0: start_date}, members
+            )
+            return share_of_voice(
+                by_brand.get(brand_id, {}).get('mentions_0', 0),
+                by_category.get(category_id, {}).get('mentions_0', 0)
+            )
+        
+        brand_mentions = (await db.execute(_brand_mentions_stmt(brand_id, start_date, end_date))).scalar()
+        category_mentions = (await db.execute(_category_mentions_stmt(category_id, start_date, end_date))).scalar()
+        
+        return share_of_voice(brand_mentions, category_mentions)
+    
+    @staticmethod
+    async def calculate_market_index_score(
+        brand_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        db: AsyncSession
+    ) -> Dict:
+        """Async version of AnalyticsEngine.calculate_market_index_score."""
+        catalog = await catalog_cache.get_async(db, [brand_id])
+        category_id = catalog.category_of(brand_id)
+        
+        split = _archive_split(start_date)
+        if split:
+            members = catalog.members([category_id])
+            by_brand, by_category = activity_from_partials(
+                await _spanning_partials_async(db, split, list(members), {0: start_date}, end_date),
+                {0: start_date}, members
+            )
+            activity = by_brand.get(brand_id, {})
+            return market_index(
+                activity.get('mentions_0', 0),
+                activity.get('engagement_0', 0.0),
+                activity.get('platforms_0', 0),
+                by_category.get(category_id, {}).get('brands_0', 0)
+            )
+        
+        mention_count, total_engagement, platform_count = (await db.execute(
+            _brand_activity_stmt(brand_id, start_date, end_date)
+        )).one()
+        
+        max_mentions = 0
+        if mention_count:
+            max_mentions = (await db.execute(_category_active_brands_stmt(category_id, start_date, end_date))).scalar()
+        
+        return market_index(mention_count, total_engagement, platform_count, max_mentions)
+    
+    @staticmethod
+    async def aggregate_platform_distribution(
+        brand_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        db: AsyncSession
+    ) -> Dict[str, int]:
+        """Async version of AnalyticsEngine.aggregate_platform_distribution."""
+        catalog = await catalog_cache.get_async(db)
+        
+        split = _archive_split(start_date)
+        if split:
+            partials = await _spanning_partials_async(db, split, [brand_id], {0: start_date}, end_date)
+            return _platform_counts(
+                catalog, ((platform_id, totals['mentions_0']) for (_, platform_id), totals in partials.items())
+            )
+        
+        results = (await db.execute(_platform_distribution_stmt(brand_id, start_date, end_date))).all()
+        
+        return _platform_counts(catalog, results)
+    
+    @staticmethod
+    async def compare_brands(
+        brands: List[BrandEntry],
+        windows: List[int],
+        metrics: List[str],
+        end_date: datetime,
+        db: AsyncSession
+    ) -> List[Dict]:
+        """Async version of AnalyticsEngine.compare_brands."""
+        starts = _window_starts(windows, end_date)
+        category_ids = list({b.category_id for b in brands})
+        
+        split = _archive_split(min(starts.values()))
+        if split:
+            members = (await catalog_cache.get_async(db, [b.id for b in brands])).members(category_ids)
+            by_brand, by_category = activity_from_partials(
+                await _spanning_partials_async(db, split, list(members), starts, end_date),
+                starts, members
+            )
+            return comparison_matrix(brands, windows, metrics, by_brand, by_category)
+        
+        brand_rows = (await db.execute(_brand_comparison_stmt([b.id for b in brands], starts, end_date))).all()
+        category_rows = (await db.execute(_category_comparison_stmt(category_ids, starts, end_date))).all()
+        
+        return comparison_matrix(
+            brands, windows, metrics,
+            {row.brand_id: row._mapping for row in brand_rows},
+            {row.category_id: row._mapping for row in category_rows}
+        )
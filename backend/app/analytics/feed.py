@@ -0,0 +1,147 @@
+"""
+Live mention feed.
+
+Ingestion queues an event for each new mention; events are published to
+the feed broadcaster only once the transaction commits.
+
+- PostgreSQL: events go out with pg_notify inside the ingestion
+  transaction, so every API worker listening on the channel receives them
+  on commit (and never for rolled-back work). Works across processes.
+  NOTIFY rejects payloads of 8000 bytes or more, which would roll back
+  the ingestion batch; an event that would reach that (only the URL is
+  unbounded) is sent without its URL, and clients fetch it by mention id.
+- Other databases: events are handed to this process's broadcaster after
+  commit, so only subscribers in the ingesting process see them.
+
+Usage:
+    queue_mentions(db, new_mentions)   # before db.commit() at ingestion
+    task = start_listener(get_broadcaster())   # at API startup
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, text, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+from sqlalchemy.types import Text
+
+from app.core.broadcast import Broadcaster, get_broadcaster
+from app.core.config import listen_engine
+from app.models.database import Mention
+
+
+CHANNEL = 'mention_feed'
+PREVIEW_LENGTH = 280  # Keeps each NOTIFY payload well under the 8000 byte limit
+MAX_PAYLOAD_BYTES = 8000  # pg_notify rejects payloads this long or longer
+RECONNECT_SECONDS = 5
+
+_PENDING = 'feed_pending_events'
+
+_notify_stmt = text(
+    "SELECT pg_notify(:channel, payload) FROM unnest(:payloads) AS payload"
+).bindparams(bindparam('payloads', type_=ARRAY(Text)))
+
+
+def mention_event(mention: Mention) -> Dict[str, Any]:
+    """JSON-ready feed event for a stored mention."""
+    return {
+        'id': mention.id,
+        'brand_id': mention.brand_id,
+        'category_id': mention.category_id,
+        'platform_id': mention.platform_id,
+        'text': mention.body.text[:PREVIEW_LENGTH],
+        'url': mention.body.url,
+        'author': mention.author,
+        'timestamp': mention.timestamp.isoformat(),
+        'engagement_score': mention.engagement_score,
+    }
+
+
+def notify_payload(event: Dict[str, Any]) -> str:
+    """
+    NOTIFY payload for an event.
+    
+    Leaves out the event's URL if the payload would otherwise be too long
+    for pg_notify.
+    """
+    payload = json.dumps(event)
+    if len(payload) >= MAX_PAYLOAD_BYTES:
+        payload = json.dumps(dict(event, url=None))
+    return payload
+
+
+def queue_mentions(db: Session, mentions: List[Mention]):
+    """
+    Queue feed events for new mentions, published when `db` commits.
+    
+    Args:
+        db: Database session the mentions were added to
+        mentions: Newly added mentions
+    """
+    if not mentions:
+        return
+    
+    # Assign ids
+    db.flush()
+    
+    events = [mention_event(m) for m in mentions]
+    
+    if db.get_bind().dialect.name == 'postgresql':
+        db.execute(_notify_stmt, {'channel': CHANNEL, 'payloads': [notify_payload(e) for e in events]})
+        return
+    
+    pending = db.info.get(_PENDING)
+    if pending is None:
+        pending = db.info[_PENDING] = []
+        event.listen(db, 'after_commit', _publish_pending)
+        event.listen(db, 'after_rollback', _discard_pending)
+    pending.extend(events)
+
+
+def _publish_pending(session: Session):
+    events = session.info.get(_PENDING)
+    if events:
+        get_broadcaster().publish_threadsafe(list(events))
+        events.clear()
+
+
+def _discard_pending(session: Session):
+    session.info.get(_PENDING, []).clear()
+
+
+async def _listen(broadcaster: Broadcaster):
+    def on_notify(connection, pid, channel, payload):
+        broadcaster.publish([json.loads(payload)])
+    
+    while True:
+        try:
+            async with listen_engine.connect() as conn:
+                driver = (await conn.get_raw_connection()).driver_connection
+                await driver.add_listener(CHANNEL, on_notify)
+                # Idle until cancelled or the connection drops
+                while not driver.is_closed():
+                    await asyncio.sleep(RECONNECT_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Mention feed listener error: {e}")
+        await asyncio.sleep(RECONNECT_SECONDS)
+
+
+def start_listener(broadcaster: Broadcaster) -> Optional[asyncio.Task]:
+    """
+    Forward pg_notify feed events to the broadcaster (PostgreSQL only).
+    
+    Behind PgBouncer this needs DATABASE_DIRECT_URL.
+    
+    Returns:
+        Listener task to cancel at shutdown, or None if not applicable
+    """
+    if listen_engine is None:
+        print("Mention feed listener disabled: set DATABASE_DIRECT_URL to use it behind PgBouncer")
+        return None
+    if listen_engine.dialect.name != 'postgresql':
+        return None
+    return asyncio.create_task(_listen(broadcaster))
@@ -5,13 +5,20 @@ Orchestrates data collection from all providers and stores in database.
 """
 
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Dict, Any, Optional
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from app.providers.base import BaseProvider
 from app.providers.reddit import RedditProvider
 from app.providers.youtube import YouTubeProvider
 from app.providers.news import NewsProvider
 from app.providers.google_search import GoogleSearchProvider
-from app.models.database import Brand, Platform, Mention
+from app.models.database import Brand, Mention, MentionBody
+from app.analytics.catalog import Catalog, catalog_cache
+from app.analytics.counters import record_mentions
+from app.analytics.feed import queue_mentions
+from app.analytics.partitions import ensure_partitions
+from app.analytics.versions import bump_versions
 from app.core.config import get_settings
 
 
@@ -34,7 +41,7 @@ class IngestionService:
             db: Database session
         """
         self.db = db
-        settings = get_settings()
+        self.settings = settings = get_settings()
         
         # Initialize providers
         self.providers = {
@@ -43,10 +50,46 @@ class IngestionService:
                 client_secret=settings.reddit_client_secret,
                 user_agent=settings.reddit_user_agent
             ),
-            'YouTube': YouTubeProvider(api_key=settings.youtube_api_key),
+            'YouTube': YouTubeProvider(
+                api_key=settings.youtube_api_key,
+                daily_quota=settings.youtube_daily_quota
+            ),
             'News': NewsProvider(api_key=settings.news_api_key),
             'Google': GoogleSearchProvider(api_key=settings.serp_api_key)
         }
+        
+        # New mentions need their month's partition to exist
+        if ensure_partitions(db, settings.partition_months_ahead):
+            db.commit()
+        
+        # Brand categories and platform ids, taken at the start of each run
+        self.catalog: Optional[Catalog] = None
+    
+    @staticmethod
+    def _keywords(brand: Brand) -> List[str]:
+        """Configured search keywords for a brand (primary first), or its name."""
+        keywords = brand.keywords.split(',') if brand.keywords else [brand.name]
+        return [k.strip() for k in keywords if k.strip()] or [brand.name]
+    
+    @classmethod
+    def _primary_keyword(cls, brand: Brand) -> str:
+        """First configured keyword for a brand, or its name."""
+        return cls._keywords(brand)[0]
+    
+    def _load_catalog(self, brand_ids: List[int]):
+        """Catalog for this run; mentions copy their brand's category, so it is checked for changes."""
+        self.catalog = catalog_cache.get(self.db, brand_ids, max_age=0)
+    
+    def _platform_id(self, platform_name: str) -> Optional[int]:
+        """Active platform's id by name, or None."""
+        return self.catalog.platform_id(platform_name, active_only=True)
+    
+    def _watermark(self, brand_id: int, platform_id: int) -> Optional[datetime]:
+        """Newest stored mention timestamp for a brand on a platform."""
+        return self.db.query(func.max(Mention.timestamp)).filter(
+            Mention.brand_id == brand_id,
+            Mention.platform_id == platform_id
+        ).scalar()
     
     def ingest_brand(
         self,
@@ -61,7 +104,7 @@ class IngestionService:
             brand_id: Brand to ingest
             days_back: How many days of data to fetch
             platforms: List of platform names (None = all)
-            
+        
         Returns:
             Number of new mentions collected
         """
@@ -70,10 +113,17 @@ class IngestionService:
         if not brand:
             raise ValueError(f"Brand {brand_id} not found")
         
-        # Determine search keyword
-        keywords = brand.keywords.split(',') if brand.keywords else [brand.name]
-        primary_keyword = keywords[0].strip()
-        
+        self._load_catalog([brand_id])
+        return self._ingest_brand(brand_id, self._primary_keyword(brand), days_back, platforms)
+    
+    def _ingest_brand(
+        self,
+        brand_id: int,
+        primary_keyword: str,
+        days_back: int,
+        platforms: Optional[List[str]]
+    ) -> int:
+        """ingest_brand with the brand's search keyword known (and the catalog loaded)."""
         # Date range
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days_back)
@@ -93,55 +143,214 @@ class IngestionService:
             
             try:
                 # Get platform ID
-                platform = self.db.query(Platform).filter(
-                    Platform.name == platform_name
-                ).first()
-                
-                if not platform or not platform.is_active:
+                platform_id = self._platform_id(platform_name)
+                if not platform_id:
                     continue
                 
+                # Time-ordered providers can stop at what we already have
+                options = {}
+                if provider.supports_watermark:
+                    options['since'] = self._watermark(brand_id, platform_id)
+                
                 # Fetch mentions
                 raw_mentions = provider.fetch_mentions(
                     keyword=primary_keyword,
                     start_date=start_date,
                     end_date=end_date,
-                    limit=100
+                    limit=100,
+                    **options
                 )
                 
-                # Process and store
-                for raw in raw_mentions:
-                    # Normalize engagement
-                    engagement = provider.normalize_engagement(raw)
-                    
-                    # Create mention object
-                    mention = Mention(
-                        brand_id=brand_id,
-                        platform_id=platform.id,
-                        text=raw['text'][:1000],  # Limit length
-                        url=raw.get('url'),
-                        source_id=raw.get('source_id'),
-                        author=raw.get('author'),
-                        timestamp=raw['timestamp'],
-                        engagement_score=engagement,
-                        raw_engagement=raw.get('raw_engagement', 0),
-                        content_hash=provider._deduplicate_content(raw['text'])
-                    )
-                    
-                    # Check for duplicates
-                    existing = self.db.query(Mention).filter(
-                        Mention.platform_id == platform.id,
-                        Mention.source_id == raw.get('source_id')
-                    ).first()
-                    
-                    if not existing:
-                        self.db.add(mention)
-                        total_collected += 1
-                
+                total_collected += self._store_mentions(brand_id, platform_id, provider, raw_mentions)
                 self.db.commit()
-                
+            
             except Exception as e:
                 print(f"Error ingesting from {platform_name}: {e}")
                 self.db.rollback()
                 continue
         
         return total_collected
+    
+    def ingest_brands(
+        self,
+        brand_ids: List[int],
+        days_back: int = 7,
+        platforms: List[str] = None
+    ) -> int:
+        """
+        Ingest mentions for many brands.
+        
+        Providers that support batched fetching (fetch_mentions_batch) are
+        called once for all brands so they can share API calls and quota;
+        the rest are called brand by brand.
+        
+        Args:
+            brand_ids: Brands to ingest
+            days_back: How many days of data to fetch
+            platforms: List of platform names (None = all)
+        
+        Returns:
+            Number of new mentions collected
+        """
+        if platforms is None:
+            platforms = list(self.providers.keys())
+        
+        batched = [
+            name for name in platforms
+            if name in self.providers and hasattr(self.providers[name], 'fetch_mentions_batch')
+        ]
+        per_brand = [name for name in platforms if name not in batched]
+        
+        total_collected = 0
+        
+        # Keywords read once up front: commits expire the Brand objects
+        self._load_catalog(brand_ids)
+        keywords = {
+            brand.id: self._keywords(brand)
+            for brand in self.db.query(Brand).filter(Brand.id.in_(brand_ids)).all()
+        }
+        
+        if batched:
+            end_date = datetime.utcnow()
+            start_date = end_date - timedelta(days=days_back)
+            
+            for platform_name in batched:
+                total_collected += self._ingest_batched(platform_name, keywords, start_date, end_date)
+        
+        if per_brand:
+            for brand_id in brand_ids:
+                if brand_id not in keywords:
+                    raise ValueError(f"Brand {brand_id} not found")
+                total_collected += self._ingest_brand(brand_id, keywords[brand_id][0], days_back, per_brand)
+        
+        return total_collected
+    
+    def _ingest_batched(
+        self,
+        platform_name: str,
+        keywords: Dict[int, List[str]],
+        start_date: datetime,
+        end_date: datetime
+    ) -> int:
+        """Fetch one platform for all brands in one batched provider call."""
+        provider = self.providers[platform_name]
+        
+        try:
+            platform_id = self._platform_id(platform_name)
+            if not platform_id:
+                return 0
+            
+            options = {}
+            if platform_name == 'YouTube':
+                # Videos collected or refreshed recently have fresh enough statistics
+                refreshed_after = datetime.utcnow() - timedelta(hours=self.settings.youtube_stats_refresh_hours)
+                recent = self.db.query(Mention.brand_id, Mention.source_id).filter(
+                    Mention.platform_id == platform_id,
+                    Mention.timestamp >= start_date,
+                    Mention.collected_at >= refreshed_after
+                ).all()
+                skip_video_ids = {}
+                for brand_id, source_id in recent:
+                    skip_video_ids.setdefault(brand_id, set()).add(source_id)
+                options['skip_video_ids'] = skip_video_ids
+            
+            results = provider.fetch_mentions_batch(
+                keywords,
+                start_date=start_date,
+                end_date=end_date,
+                limit=100,
+                **options
+            )
+            
+            total_collected = 0
+            for brand_id, raw_mentions in results.items():
+                total_collected += self._store_mentions(
+                    brand_id, platform_id, provider, raw_mentions,
+                    refresh_existing=platform_name == 'YouTube'
+                )
+            self.db.commit()
+            return total_collected
+        
+        except Exception as e:
+            print(f"Error ingesting from {platform_name}: {e}")
+            self.db.rollback()
+            return 0
+    
+    def _store_mentions(
+        self,
+        brand_id: int,
+        platform_id: int,
+        provider: BaseProvider,
+        raw_mentions: List[Dict[str, Any]],
+        refresh_existing: bool = False
+    ) -> int:
+        """
+        Normalize raw mentions and add the new ones to the session.
+        
+        Args:
+            brand_id: Brand the mentions belong to
+            platform_id: Platform they were fetched from
+            provider: Provider used (for normalization)
+            raw_mentions: Provider output
+            refresh_existing: Update engagement of mentions already stored and
+                stamp their collected_at, so they count as fresh for
+                YOUTUBE_STATS_REFRESH_HOURS
+        
+        Returns:
+            Number of new mentions added (caller commits)
+        """
+        source_ids = [raw.get('source_id') for raw in raw_mentions]
+        existing = {
+            m.source_id: m
+            for m in self.db.query(Mention).filter(
+                Mention.brand_id == brand_id,
+                Mention.platform_id == platform_id,
+                Mention.source_id.in_(source_ids)
+            ).all()
+        } if source_ids else {}
+        category_id = self.catalog.category_of(brand_id)
+        
+        new_mentions = []
+        refreshed = False
+        collected_at = datetime.utcnow()
+        
+        # Process and store
+        for raw in raw_mentions:
+            # Normalize engagement
+            engagement = provider.normalize_engagement(raw)
+            
+            # Check for duplicates
+            duplicate = existing.get(raw.get('source_id'))
+            if duplicate is not None:
+                if refresh_existing:
+                    duplicate.engagement_score = engagement
+                    duplicate.raw_engagement = raw.get('raw_engagement', 0)
+                    duplicate.collected_at = collected_at
+                    refreshed = True
+                continue
+            
+            # Create mention object
+            mention = Mention(
+                brand_id=brand_id,
+                platform_id=platform_id,
+                category_id=category_id,
+                body=MentionBody(text=raw['text'][:1000], url=raw.get('url')),  # Limit length
+                source_id=raw.get('source_id'),
+                author=raw.get('author'),
+                timestamp=raw['timestamp'],
+                engagement_score=engagement,
+                raw_engagement=raw.get('raw_engagement', 0),
+                content_hash=provider._deduplicate_content(raw['text'])
+            )
+            
+            self.db.add(mention)
+            existing[mention.source_id] = mention
+            new_mentions.append(mention)
+        
+        # Dashboard counters commit together with the rows
+        record_mentions(self.db, new_mentions)
+        queue_mentions(self.db, new_mentions)
+        if new_mentions or refreshed:
+            bump_versions(self.db, [brand_id], [category_id])
+        
+        return len(new_mentions)
@@ -0,0 +1,117 @@
+"""
+Mention uniqueness key.
+
+One item (video, article, post) can mention several brands, so mentions
+are unique per (brand_id, platform_id, source_id) (uq_brand_platform_source;
+partitioned tables add timestamp). Databases created before that have
+uq_platform_source on (platform_id, source_id), which rejects the second
+brand's copy of an item and rolls back the whole ingestion batch.
+
+Usage:
+    python -m app.analytics.mention_keys migrate   # one-off for databases with uq_platform_source
+"""
+
+import re
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.models.database import Mention
+
+
+TABLE = Mention.__tablename__
+OLD_KEY = 'uq_platform_source'
+NEW_KEY = 'uq_brand_platform_source'
+
+_OLD_KEY_SQL = re.compile(rf'CONSTRAINT\s+"?{OLD_KEY}"?\s+UNIQUE\s*\([^)]*\)', re.IGNORECASE)
+_CREATE_TABLE_SQL = re.compile(rf'^CREATE TABLE\s+"?{TABLE}"?', re.IGNORECASE)
+
+
+def has_old_key(bind: Engine) -> bool:
+    """Whether mentions still has the (platform_id, source_id) unique key."""
+    names = {constraint['name'] for constraint in inspect(bind).get_unique_constraints(TABLE)}
+    return OLD_KEY in names
+
+
+def _migrate_postgresql(bind: Engine):
+    with bind.begin() as conn:
+        partitioned = conn.execute(text(
+            "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:table)"
+        ), {'table': TABLE}).scalar()
+        # Unique keys on a partitioned table must include the partition key
+        columns = 'brand_id, platform_id, source_id' + (', timestamp' if partitioned else '')
+        conn.execute(text(
+            f"ALTER TABLE {TABLE} DROP CONSTRAINT {OLD_KEY}, "
+            f"ADD CONSTRAINT {NEW_KEY} UNIQUE ({columns})"
+        ))
+
+
+def _migrate_sqlite(bind: Engine):
+    # SQLite can't drop a table constraint: rebuild mentions from its own
+    # CREATE TABLE with the key swapped, keeping columns, indexes and triggers
+    with bind.connect() as conn:
+        conn = conn.execution_options(isolation_level='AUTOCOMMIT')
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            create_sql = conn.execute(text(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :table"
+            ), {'table': TABLE}).scalar()
+            dependents = conn.execute(text(
+                "SELECT sql FROM sqlite_master "
+                "WHERE tbl_name = :table AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+            ), {'table': TABLE}).scalars().all()
+            
+            if not _OLD_KEY_SQL.search(create_sql):
+                raise RuntimeError(f"Can't find {OLD_KEY} in the mentions table definition")
+            create_sql = _OLD_KEY_SQL.sub(
+                f"CONSTRAINT {NEW_KEY} UNIQUE (brand_id, platform_id, source_id)", create_sql
+            )
+            create_sql = _CREATE_TABLE_SQL.sub(f"CREATE TABLE {TABLE}_rebuild", create_sql)
+            
+            conn.exec_driver_sql(create_sql)
+            conn.exec_driver_sql(f"INSERT INTO {TABLE}_rebuild SELECT * FROM {TABLE}")
+            conn.exec_driver_sql(f"DROP TABLE {TABLE}")
+            conn.exec_driver_sql(f"ALTER TABLE {TABLE}_rebuild RENAME TO {TABLE}")
+            for ddl in dependents:
+                conn.exec_driver_sql(ddl)
+            conn.exec_driver_sql("COMMIT")
+        except Exception:
+            conn.exec_driver_sql("ROLLBACK")
+            raise
+
+
+def migrate(bind: Engine):
+    """
+    Replace uq_platform_source with uq_brand_platform_source.
+    
+    On PostgreSQL one ALTER TABLE swaps the constraints (building the new
+    unique index); on SQLite the mentions table is rebuilt. Both run in one
+    transaction and lock mentions meanwhile, so run it in a maintenance
+    window; on error nothing changes.
+    
+    Args:
+        bind: Sync engine
+    """
+    if not has_old_key(bind):
+        print("mentions already has the per-brand unique key")
+        return
+    
+    dialect = bind.dialect.name
+    if dialect == 'postgresql':
+        _migrate_postgresql(bind)
+    elif dialect == 'sqlite':
+        _migrate_sqlite(bind)
+    else:
+        raise RuntimeError(f"Unsupported database: {dialect}")
+
+
+if __name__ == "__main__":
+    import sys
+    from app.core.config import engine
+    
+    if sys.argv[1:] != ['migrate']:
+        print("Usage: python -m app.analytics.mention_keys migrate")
+        sys.exit(1)
+    
+    migrate(engine)
+    print("✓ mentions unique per (brand, platform, source)")
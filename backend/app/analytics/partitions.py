@@ -0,0 +1,266 @@
+"""
+Monthly range partitioning of the mentions table (PostgreSQL).
+
+Once migrated, `mentions` is partitioned by RANGE (timestamp) into one
+table per month (mentions_pYYYY_MM) plus a DEFAULT partition for stray
+rows. Window queries (`timestamp >= now - days_back`) only scan the
+partitions they overlap, and retention detaches/drops whole months
+instead of DELETEing rows.
+
+PostgreSQL requires unique constraints on a partitioned table to include
+the partition key, so the primary key becomes (id, timestamp) and the
+dedupe key (brand_id, platform_id, source_id, timestamp). A source item's
+timestamp never changes, so deduplication behaves the same.
+
+Everything here is a no-op on other databases or before migration.
+
+Usage:
+    python -m app.analytics.partitions migrate    # one-off; rewrites mentions (needs downtime)
+    python -m app.analytics.partitions maintain   # cron: create upcoming months, apply retention
+    python -m app.analytics.partitions status
+"""
+
+import re
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import column, delete, func, select, table, text, update
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+
+from app.analytics.bodies import delete_bodies
+from app.analytics.categories import ensure_category_column
+from app.analytics.counters import TOTAL_MENTIONS
+from app.analytics.versions import GLOBAL, bump_scopes
+from app.models.database import Mention, MentionCounter, MentionDailyCount
+
+
+TABLE = 'mentions'
+DEFAULT_PARTITION = 'mentions_default'
+MONTHS_AHEAD = 3
+
+_PARTITION_NAME = re.compile(r'^mentions_p(\d{4})_(\d{2})$')
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"mentions_p{month.year:04d}_{month.month:02d}"
+
+
+def is_partitioned(db: Session) -> bool:
+    """Whether mentions is a partitioned table (always False off PostgreSQL)."""
+    if db.get_bind().dialect.name != 'postgresql':
+        return False
+    return bool(db.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"
+    ), {'table': TABLE}).scalar())
+
+
+def list_partitions(db: Session) -> List[Tuple[str, date]]:
+    """Monthly partitions as (name, month start), oldest first."""
+    names = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:table)"
+    ), {'table': TABLE}).scalars().all()
+    
+    partitions = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def _create_partition(db: Session, month: date):
+    db.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    ))
+
+
+def ensure_partitions(db: Session, months_ahead: int = MONTHS_AHEAD, today: Optional[date] = None) -> List[str]:
+    """
+    Create partitions for the current month and the next `months_ahead`.
+    
+    Cheap when they exist; call before ingesting so new rows never land in
+    the DEFAULT partition (which would block creating their month later).
+    
+    Returns:
+        Names of partitions that were missing (caller commits)
+    """
+    if not is_partitioned(db):
+        return []
+    
+    existing = {name for name, _ in list_partitions(db)}
+    current = month_start(today or datetime.utcnow().date())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if partition_name(month) not in existing:
+            _create_partition(db, month)
+            created.append(partition_name(month))
+    return created
+
+
+def detach_partition(db: Session, name: str, drop: bool = True):
+    """Detach a partition from mentions and drop it with its bodies (caller commits)."""
+    if drop:
+        delete_bodies(db, select(column('id')).select_from(table(name)))
+    db.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+    if drop:
+        db.execute(text(f"DROP TABLE {name}"))
+
+
+def apply_retention(
+    db: Session,
+    keep_months: int,
+    drop: bool = True,
+    today: Optional[date] = None
+) -> List[str]:
+    """
+    Remove monthly partitions older than `keep_months` full months.
+    
+    Detaching a partition is a catalog change, independent of its size.
+    Dashboard counters for the removed days are subtracted in the same
+    transaction.
+    
+    Args:
+        db: Database session
+        keep_months: Months to keep before the current one (0 = keep everything)
+        drop: Drop detached partitions (False leaves them as standalone tables,
+            e.g. for archiving)
+        today: Reference date (defaults to now)
+    
+    Returns:
+        Names of removed partitions (caller commits)
+    """
+    if keep_months <= 0 or not is_partitioned(db):
+        return []
+    
+    cutoff = add_months(month_start(today or datetime.utcnow().date()), -keep_months)
+    removed = []
+    for name, month in list_partitions(db):
+        if month >= cutoff:
+            continue
+        
+        in_month = [MentionDailyCount.day >= month, MentionDailyCount.day < add_months(month, 1)]
+        count = db.execute(
+            select(func.coalesce(func.sum(MentionDailyCount.mention_count), 0)).where(*in_month)
+        ).scalar()
+        db.execute(delete(MentionDailyCount).where(*in_month))
+        db.execute(
+            update(MentionCounter)
+            .where(MentionCounter.name == TOTAL_MENTIONS)
+            .values(value=MentionCounter.value - count)
+        )
+        
+        detach_partition(db, name, drop)
+        removed.append(name)
+    
+    if removed:
+        bump_scopes(db, [GLOBAL])
+    return removed
+
+
+def migrate(db: Session, months_ahead: int = MONTHS_AHEAD):
+    """
+    Convert an existing plain mentions table into monthly partitions.
+    
+    Copies every row, so run it during a maintenance window. Runs in one
+    transaction: on error nothing changes. Bodies (and their full-text
+    index) stay in mention_bodies, which is not partitioned.
+    """
+    if db.get_bind().dialect.name != 'postgresql':
+        raise RuntimeError("Partitioning is only supported on PostgreSQL")
+    if is_partitioned(db):
+        print("mentions is already partitioned")
+        return
+    
+    ensure_category_column(db)
+    oldest, newest = db.execute(select(func.min(Mention.timestamp), func.max(Mention.timestamp))).one()
+    sequence = db.execute(text("SELECT pg_get_serial_sequence(:table, 'id')"), {'table': TABLE}).scalar()
+    
+    db.execute(text(f"ALTER TABLE {TABLE} RENAME TO mentions_legacy"))
+    if sequence:
+        # Keep the id sequence alive when the old table is dropped
+        db.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY NONE"))
+    db.execute(text(
+        f"CREATE TABLE {TABLE} (LIKE mentions_legacy INCLUDING DEFAULTS) PARTITION BY RANGE (timestamp)"
+    ))
+    
+    current = month_start(datetime.utcnow().date())
+    first = month_start(oldest.date()) if oldest else current
+    last = max(add_months(current, months_ahead), month_start(newest.date()) if newest else current)
+    month = first
+    while month <= last:
+        _create_partition(db, month)
+        month = add_months(month, 1)
+    db.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT"))
+    
+    db.execute(text(f"INSERT INTO {TABLE} SELECT * FROM mentions_legacy"))
+    db.execute(text("DROP TABLE mentions_legacy"))
+    if sequence:
+        db.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE}.id"))
+    
+    # Constraints and indexes once the data is in (one build per partition)
+    db.execute(text(f"ALTER TABLE {TABLE} ADD CONSTRAINT mentions_pkey PRIMARY KEY (id, timestamp)"))
+    db.execute(text(
+        f"ALTER TABLE {TABLE} ADD CONSTRAINT uq_brand_platform_source "
+        "UNIQUE (brand_id, platform_id, source_id, timestamp)"
+    ))
+    db.execute(text(f"ALTER TABLE {TABLE} ADD FOREIGN KEY (brand_id) REFERENCES brands (id)"))
+    db.execute(text(f"ALTER TABLE {TABLE} ADD FOREIGN KEY (platform_id) REFERENCES platforms (id)"))
+    db.execute(text(f"ALTER TABLE {TABLE} ADD FOREIGN KEY (category_id) REFERENCES categories (id)"))
+    for index in Mention.__table__.indexes:
+        db.execute(CreateIndex(index))
+    db.execute(text(f"ANALYZE {TABLE}"))
+    
+    db.commit()
+
+
+def status(db: Session) -> List[Tuple[str, int]]:
+    """(partition, estimated rows) for each partition, oldest first."""
+    names = [name for name, _ in list_partitions(db)] + [DEFAULT_PARTITION]
+    return [
+        (name, db.execute(text(
+            "SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = to_regclass(:name)"
+        ), {'name': name}).scalar() or 0)
+        for name in names
+    ]
+
+
+if __name__ == "__main__":
+    import sys
+    from app.core.config import SessionLocal, get_settings
+    
+    command = sys.argv[1] if len(sys.argv) > 1 else ''
+    if command not in ('migrate', 'maintain', 'status'):
+        print("Usage: python -m app.analytics.partitions migrate|maintain|status")
+        sys.exit(1)
+    
+    settings = get_settings()
+    session = SessionLocal()
+    try:
+        if command == 'migrate':
+            migrate(session, settings.partition_months_ahead)
+            print("✓ mentions partitioned by month")
+        elif not is_partitioned(session):
+            print("mentions is not partitioned (run 'migrate' first, PostgreSQL only)")
+        elif command == 'maintain':
+            created = ensure_partitions(session, settings.partition_months_ahead)
+            removed = apply_retention(session, settings.mention_retention_months)
+            session.commit()
+            print(f"✓ Created {created or 'nothing'}; removed {removed or 'nothing'}")
+        else:
+            for name, rows in status(session):
+                print(f"{name:24} ~{rows} rows")
+    finally:
+        session.close()
@@ -6,12 +6,19 @@ Updated ingestion service using web scrapers instead of APIs.
 
 from datetime import datetime, timedelta
 from typing import List
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.providers.reddit_scraper import RedditScraperProvider
 from app.providers.youtube_scraper import YouTubeScraperProvider
 from app.providers.news_scraper import NewsScraperProvider
 from app.providers.google_scraper import GoogleScraperProvider
-from app.models.database import Brand, Platform, Mention
+from app.models.database import Brand, Mention, MentionBody
+from app.analytics.catalog import catalog_cache
+from app.analytics.counters import record_mentions
+from app.analytics.feed import queue_mentions
+from app.analytics.partitions import ensure_partitions
+from app.core.config import get_settings
+from app.analytics.versions import bump_versions
 
 
 class ScraperIngestionService:
@@ -39,6 +46,10 @@ class ScraperIngestionService:
             'Google': GoogleScraperProvider()
         }
         
+        # New mentions need their month's partition to exist
+        if ensure_partitions(db, get_settings().partition_months_ahead):
+            db.commit()
+        
         print("⚠️ WARNING: Using web scraping. Read LEGAL_DISCLAIMER.txt")
     
     def ingest_brand(
@@ -63,6 +74,8 @@ class ScraperIngestionService:
         if not brand:
             raise ValueError(f"Brand {brand_id} not found")
         
+        catalog = catalog_cache.get(self.db, [brand_id])
+        
         keywords = brand.keywords.split(',') if brand.keywords else [brand.name]
         primary_keyword = keywords[0].strip()
         
@@ -91,23 +104,31 @@ class ScraperIngestionService:
                 print(f"\n📡 Scraping {platform_name}...")
                 
                 # Get platform ID
-                platform = self.db.query(Platform).filter(
-                    Platform.name == platform_name
-                ).first()
-                
-                if not platform or not platform.is_active:
+                platform_id = catalog.platform_id(platform_name, active_only=True)
+                if not platform_id:
                     continue
                 
+                # Time-ordered scrapers can stop at what we already have
+                options = {}
+                if scraper.supports_watermark:
+                    options['since'] = self.db.query(func.max(Mention.timestamp)).filter(
+                        Mention.brand_id == brand_id,
+                        Mention.platform_id == platform_id
+                    ).scalar()
+                
                 # Scrape mentions
                 raw_mentions = scraper.fetch_mentions(
                     keyword=primary_keyword,
                     start_date=start_date,
                     end_date=end_date,
-                    limit=50  # Lower limit to avoid detection
+                    limit=50,  # Lower limit to avoid detection
+                    **options
                 )
                 
                 print(f"  ✓ Found {len(raw_mentions)} results")
                 
+                new_mentions = []
+                
                 # Process and store
                 for raw in raw_mentions:
                     # Normalize engagement
@@ -116,9 +137,9 @@ class ScraperIngestionService:
                     # Create mention object
                     mention = Mention(
                         brand_id=brand_id,
-                        platform_id=platform.id,
-                        text=raw['text'][:1000],
-                        url=raw.get('url'),
+                        platform_id=platform_id,
+                        category_id=brand.category_id,
+                        body=MentionBody(text=raw['text'][:1000], url=raw.get('url')),
                         source_id=raw.get('source_id'),
                         author=raw.get('author'),
                         timestamp=raw['timestamp'],
@@ -129,16 +150,22 @@ class ScraperIngestionService:
                     
                     # Check for duplicates
                     existing = self.db.query(Mention).filter(
-                        Mention.platform_id == platform.id,
+                        Mention.brand_id == brand_id,
+                        Mention.platform_id == platform_id,
                         Mention.source_id == raw.get('source_id')
                     ).first()
                     
                     if not existing:
                         self.db.add(mention)
-                        total_collected += 1
+                        new_mentions.append(mention)
                 
+                record_mentions(self.db, new_mentions)
+                queue_mentions(self.db, new_mentions)
+                if new_mentions:
+                    bump_versions(self.db, [brand_id], [brand.category_id])
                 self.db.commit()
-                print(f"  ✓ Stored {len(raw_mentions)} new mentions")
+                total_collected += len(new_mentions)
+                print(f"  ✓ Stored {len(new_mentions)} new mentions")
                 
             except Exception as e:
                 print(f"  ❌ Error scraping {platform_name}: {e}")
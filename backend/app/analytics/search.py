@@ -0,0 +1,166 @@
+"""
+Full-text search over mention text (mention_bodies.text).
+
+- PostgreSQL: GIN expression index on to_tsvector('english', text), queried
+  with websearch_to_tsquery and ranked with ts_rank_cd.
+- SQLite: FTS5 external-content table kept in sync by triggers, ranked
+  with bm25.
+
+Both indexes are maintained by the database on every insert/update, so
+ingestion needs no extra work. Results are ordered by (rank, id)
+descending so they can be paged with a keyset cursor.
+
+Usage:
+    create_search_index(engine)   # once (init_db does this)
+    python -m app.analytics.search setup   # existing databases
+"""
+
+import html
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, literal_column, select, table, column, text, tuple_
+from sqlalchemy.engine import Engine
+
+from app.models.database import Mention, MentionBody
+
+
+CONFIG = literal_column("'english'::regconfig")
+FTS_TABLE = 'mentions_fts'
+SNIPPET_WORDS = 16
+
+# Highlight markers; swapped for <mark> after the snippet is HTML-escaped
+_START, _STOP = '\x02', '\x03'
+
+_POSTGRES_DDL = [
+    "CREATE INDEX IF NOT EXISTS ix_mention_bodies_text_fts ON mention_bodies "
+    "USING gin (to_tsvector('english'::regconfig, text))",
+]
+
+_SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "text, content='mention_bodies', content_rowid='mention_id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS mention_bodies_fts_ai AFTER INSERT ON mention_bodies BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.mention_id, new.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS mention_bodies_fts_ad AFTER DELETE ON mention_bodies BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) VALUES ('delete', old.mention_id, old.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS mention_bodies_fts_au AFTER UPDATE OF text ON mention_bodies BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) VALUES ('delete', old.mention_id, old.text); "
+    f"INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.mention_id, new.text); END",
+]
+
+
+def create_search_index(bind: Engine, rebuild: bool = False):
+    """
+    Create the full-text index for the database's dialect.
+    
+    Args:
+        bind: Sync engine
+        rebuild: Re-index existing rows (SQLite; PostgreSQL indexes them on creation)
+    """
+    dialect = bind.dialect.name
+    with bind.begin() as conn:
+        if dialect == 'postgresql':
+            for ddl in _POSTGRES_DDL:
+                conn.execute(text(ddl))
+        elif dialect == 'sqlite':
+            for ddl in _SQLITE_DDL:
+                conn.execute(text(ddl))
+            if rebuild:
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def supports_search(dialect_name: str) -> bool:
+    return dialect_name in ('postgresql', 'sqlite')
+
+
+def fts5_query(q: str) -> str:
+    """Turn free text into an FTS5 query: every word required, no operators."""
+    return ' '.join(f'"{word}"' for word in re.findall(r'\w+', q))
+
+
+def highlight(snippet: Optional[str]) -> str:
+    """HTML-escape a snippet and turn the match markers into <mark> tags."""
+    escaped = html.escape(snippet or '')
+    return escaped.replace(_START, '<mark>').replace(_STOP, '</mark>')
+
+
+def _postgres_search_stmt(columns: Sequence, q: str, filters: List, limit: int, after: Optional[Tuple[float, int]]):
+    document = func.to_tsvector(CONFIG, MentionBody.text)
+    query = func.websearch_to_tsquery(CONFIG, q)
+    rank = func.ts_rank_cd(document, query).label('rank')
+    
+    matches = select(Mention.id, rank).join(
+        MentionBody, MentionBody.mention_id == Mention.id
+    ).where(document.op('@@')(query), *filters).subquery()
+    page = select(matches.c.id, matches.c.rank)
+    if after:
+        page = page.where(tuple_(matches.c.rank, matches.c.id) < after)
+    page = page.order_by(matches.c.rank.desc(), matches.c.id.desc()).limit(limit).subquery()
+    
+    # Headlines are expensive, so only build them for the page
+    headline = func.ts_headline(
+        CONFIG, MentionBody.text, query,
+        f'StartSel="{_START}", StopSel="{_STOP}", MaxWords={SNIPPET_WORDS}, MinWords=5, MaxFragments=2'
+    )
+    return select(*columns, page.c.rank, headline.label('snippet')).select_from(Mention).join(
+        page, Mention.id == page.c.id
+    ).join(
+        MentionBody, MentionBody.mention_id == Mention.id
+    ).order_by(page.c.rank.desc(), Mention.id.desc())
+
+
+def _sqlite_search_stmt(columns: Sequence, q: str, filters: List, limit: int, after: Optional[Tuple[float, int]]):
+    fts = table(FTS_TABLE, column('rowid'))
+    fts_ref = literal_column(FTS_TABLE)
+    # bm25 is lower-is-better; negate so both dialects sort by rank descending
+    rank = -func.bm25(fts_ref)
+    snippet = func.snippet(fts_ref, 0, _START, _STOP, '…', SNIPPET_WORDS)
+    
+    stmt = select(*columns, rank.label('rank'), snippet.label('snippet')).select_from(
+        fts.join(MentionBody, MentionBody.mention_id == fts.c.rowid).join(Mention, Mention.id == fts.c.rowid)
+    ).where(fts_ref.op('MATCH')(fts5_query(q)), *filters)
+    if after:
+        stmt = stmt.where(tuple_(rank, Mention.id) < after)
+    return stmt.order_by(rank.desc(), Mention.id.desc()).limit(limit)
+
+
+def search_stmt(
+    dialect_name: str,
+    columns: Sequence,
+    q: str,
+    filters: List,
+    limit: int,
+    after: Optional[Tuple[float, int]] = None
+):
+    """
+    Ranked full-text search statement.
+    
+    Args:
+        dialect_name: Database dialect ('postgresql' or 'sqlite')
+        columns: Mention / MentionBody columns to return (rank and snippet are appended)
+        q: Search text (all words must match; stemmed)
+        filters: Extra WHERE clauses on Mention
+        limit: Maximum rows
+        after: (rank, id) of the last row of the previous page
+    
+    Returns:
+        Select ordered by rank, then id, descending
+    """
+    if dialect_name == 'postgresql':
+        return _postgres_search_stmt(columns, q, filters, limit, after)
+    if dialect_name == 'sqlite':
+        return _sqlite_search_stmt(columns, q, filters, limit, after)
+    raise ValueError(f"Full-text search is not supported on {dialect_name}")
+
+
+if __name__ == "__main__":
+    import sys
+    from app.core.config import engine
+    
+    if sys.argv[1:] != ['setup']:
+        print("Usage: python -m app.analytics.search setup")
+        sys.exit(1)
+    
+    create_search_index(engine, rebuild=True)
+    print(f"✓ Full-text index ready ({engine.dialect.name})")
@@ -0,0 +1,85 @@
+"""
+Data versions for analytics caching.
+
+Every transaction that changes mentions bumps a version counter for each
+affected brand, their categories, and the global scope. Analytics routes
+hash the versions their result depends on into an ETag, so a poll that
+finds nothing new is answered with 304 after a single primary-key lookup.
+
+Usage:
+    bump_versions(db, brand_ids)   # before db.commit() at ingestion
+    versions = dict(db.execute(versions_stmt(scopes)).all())
+"""
+
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.analytics.counters import upsert_add
+from app.models.database import Brand, DataVersion
+
+
+GLOBAL = 'global'
+CATALOG = 'catalog'
+
+
+def brand_scope(brand_id: int) -> str:
+    return f"brand:{brand_id}"
+
+
+def category_scope(category_id: int) -> str:
+    return f"category:{category_id}"
+
+
+def bump_scopes(db: Session, scopes: Iterable[str]):
+    """Increment the given scopes' versions (caller commits)."""
+    # Sorted so concurrent writers lock rows in the same order
+    for scope in sorted(set(scopes)):
+        upsert_add(db, DataVersion.__table__, {'scope': scope}, 'version', 1)
+
+
+def bump_versions(db: Session, brand_ids: Iterable[int], category_ids: Optional[Iterable[int]] = None):
+    """
+    Mark brands' mention data as changed.
+    
+    Call in the same transaction that writes the mentions so the new
+    version becomes visible exactly when the data does.
+    
+    Args:
+        db: Database session
+        brand_ids: Brands whose mentions were inserted or updated
+        category_ids: Their categories, if the caller knows them (else looked up)
+    """
+    brand_ids = set(brand_ids)
+    if not brand_ids:
+        return
+    
+    if category_ids is None:
+        category_ids = db.execute(
+            select(Brand.category_id).where(Brand.id.in_(brand_ids)).distinct()
+        ).scalars().all()
+    
+    bump_scopes(db, [
+        GLOBAL,
+        *(brand_scope(brand_id) for brand_id in brand_ids),
+        *(category_scope(category_id) for category_id in category_ids if category_id is not None),
+    ])
+
+
+def versions_stmt(scopes: List[str]):
+    """Statement selecting (scope, version) for the given scopes."""
+    return select(DataVersion.scope, DataVersion.version).where(DataVersion.scope.in_(scopes))
+
+
+def make_etag(versions: Dict[str, int], scopes: List[str], *parts) -> str:
+    """
+    Weak ETag over the versions of `scopes` plus any extra key parts.
+    
+    Scopes never written count as version 0.
+    """
+    key = '|'.join(
+        [f"{scope}={versions.get(scope, 0)}" for scope in sorted(scopes)] + [str(p) for p in parts]
+    )
+    return 'W/"' + hashlib.sha1(key.encode('utf-8')).hexdigest() + '"'
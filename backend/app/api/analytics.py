@@ -2,92 +2,294 @@
 API routes for analytics endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+import re
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from typing import List, Optional
 
-from app.core.config import get_db
+from app.core.config import get_read_db, use_read_replica
 from app.schemas.schemas import (
+    BrandSearchResult,
     ShareOfVoiceResponse,
     MarketIndexResponse,
     MentionResponse,
-    DashboardOverview
+    MentionSearchResult,
+    DashboardOverview,
+    ComparisonRequest,
+    ComparisonResponse
 )
-from app.analytics.engine import AnalyticsEngine
-from app.models.database import Brand, Mention, Platform, Category
+from app.analytics.engine import AsyncAnalyticsEngine
+from app.analytics.counters import counter_stmt, approximate_row_count_stmt, TOTAL_MENTIONS
+from app.api.export import stream_mentions, encode_ndjson, encode_csv
+from app.analytics.versions import GLOBAL, CATALOG, brand_scope, category_scope
+from app.api.caching import data_etag, not_modified, set_etag
+from app.api.responses import MENTION_COLUMNS, MENTION_FIELDS, FastJSONResponse, rows_to_dicts
+from app.analytics.brand_index import brand_index_cache
+from app.analytics.catalog import BrandEntry, catalog_cache
+from app.analytics.search import search_stmt, supports_search, highlight
+from app.analytics.bodies import join_bodies
+from app.api.pagination import encode_cursor, decode_cursor, encode_rank_cursor, decode_rank_cursor
+from app.models.database import Mention, MentionDailyCount
 
 router = APIRouter(tags=["Analytics"])
 
 
+async def _get_brand_or_404(db: AsyncSession, brand_id: int) -> BrandEntry:
+    brand = (await catalog_cache.get_async(db, [brand_id])).brands.get(brand_id)
+    if not brand:
+        raise HTTPException(status_code=404, detail="Brand not found")
+    return brand
+
+
+async def _platform_id(db: AsyncSession, name: str) -> Optional[int]:
+    return (await catalog_cache.get_async(db)).platform_id(name)
+
+
+@router.get("/brands/search", response_model=List[BrandSearchResult])
+async def search_brands(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(default=10, ge=1, le=50),
+    category_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Find brands by name or keyword, for lookup and autocomplete.
+    
+    Matches name prefixes (including later words of the name), keyword
+    prefixes and, when those don't fill the page, misspellings via trigram
+    similarity. Served from an in-memory index that is rebuilt when the
+    brand catalog changes.
+    
+    Args:
+        q: Search text
+        limit: Maximum results
+        category_id: Only brands in this category (optional)
+        db: Database session
+    
+    Returns:
+        Matching brands, best first
+    """
+    index = await brand_index_cache.get(db)
+    return FastJSONResponse(index.search(q, limit, category_id))
+
+
 @router.get("/brands/{brand_id}/mentions", response_model=List[MentionResponse])
 async def get_brand_mentions(
     brand_id: int,
+    request: Request,
     days_back: int = Query(default=30, ge=1, le=365),
     platform: Optional[str] = None,
-    db: Session = Depends(get_db)
+    limit: int = Query(default=1000, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Get all mentions for a specific brand.
+    Get mentions for a specific brand, newest first.
+    
+    Pages with a keyset cursor on (timestamp, id): when more rows exist the
+    response carries an `X-Next-Cursor` header (and a `Link: rel="next"`
+    header); pass it back as `cursor` to get the next page.
+    
+    Rows are read as plain tuples and encoded directly with orjson; the
+    response_model documents the shape but isn't re-validated per item.
     
     Args:
         brand_id: Brand ID
         days_back: Number of days to look back
         platform: Filter by platform name (optional)
+        limit: Page size
+        cursor: Cursor from the previous page's X-Next-Cursor header
         db: Database session
-        
+    
     Returns:
         List of mentions
     """
-    brand = db.query(Brand).filter(Brand.id == brand_id).first()
-    if not brand:
-        raise HTTPException(status_code=404, detail="Brand not found")
+    await _get_brand_or_404(db, brand_id)
     
     # Build query
-    query = db.query(Mention).filter(
+    query = join_bodies(select(*MENTION_COLUMNS)).where(
         Mention.brand_id == brand_id,
         Mention.timestamp >= datetime.utcnow() - timedelta(days=days_back)
     )
     
     # Filter by platform if specified
     if platform:
-        platform_obj = db.query(Platform).filter(Platform.name == platform).first()
-        if platform_obj:
-            query = query.filter(Mention.platform_id == platform_obj.id)
+        platform_id = await _platform_id(db, platform)
+        if platform_id:
+            query = query.where(Mention.platform_id == platform_id)
+    
+    # Continue after the last row of the previous page
+    if cursor:
+        query = query.where(tuple_(Mention.timestamp, Mention.id) < decode_cursor(cursor))
+    
+    # Fetch one extra row to know whether another page exists
+    rows = (await db.execute(query.order_by(
+        Mention.timestamp.desc(), Mention.id.desc()
+    ).limit(limit + 1))).all()
+    
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+        headers['X-Next-Cursor'] = next_cursor
+        headers['Link'] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+    
+    return FastJSONResponse(rows_to_dicts(rows), headers=headers)
+
+
+@router.get("/brands/{brand_id}/mentions/export")
+async def export_brand_mentions(
+    brand_id: int,
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+    days_back: Optional[int] = Query(default=None, ge=1),
+    platform: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Stream all mentions for a brand as NDJSON or CSV.
+    
+    Rows are read in chunks from a server-side cursor and written as they
+    arrive, so memory use stays constant regardless of history size.
+    
+    Args:
+        brand_id: Brand ID
+        format: 'ndjson' or 'csv'
+        days_back: Number of days to look back (None = full history)
+        platform: Filter by platform name (optional)
+        db: Database session
+    
+    Returns:
+        Streaming response
+    """
+    await _get_brand_or_404(db, brand_id)
+    
+    filters = [Mention.brand_id == brand_id]
+    if days_back:
+        filters.append(Mention.timestamp >= datetime.utcnow() - timedelta(days=days_back))
+    if platform:
+        platform_id = await _platform_id(db, platform)
+        if platform_id:
+            filters.append(Mention.platform_id == platform_id)
+    
+    rows = stream_mentions(*filters, replica=await use_read_replica())
+    if format == "csv":
+        body, media_type = encode_csv(rows), "text/csv"
+    else:
+        body, media_type = encode_ndjson(rows), "application/x-ndjson"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="brand-{brand_id}-mentions.{format}"'}
+    )
+
+
+@router.get("/mentions/search", response_model=List[MentionSearchResult])
+async def search_mentions(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    brand_id: Optional[int] = None,
+    platform: Optional[str] = None,
+    days_back: Optional[int] = Query(default=None, ge=1),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Full-text search over mention text, most relevant first.
+    
+    All words in `q` must match (stemmed, English). Each result carries a
+    relevance `rank` and a `snippet` with matches wrapped in <mark>. Pages
+    like /brands/{id}/mentions: pass X-Next-Cursor back as `cursor`.
+    
+    Args:
+        q: Search text
+        brand_id: Filter by brand (optional)
+        platform: Filter by platform name (optional)
+        days_back: Number of days to look back (None = full history)
+        limit: Page size
+        cursor: Cursor from the previous page's X-Next-Cursor header
+        db: Database session
+    
+    Returns:
+        Ranked mentions with snippets
+    """
+    dialect_name = db.bind.dialect.name
+    if not supports_search(dialect_name):
+        raise HTTPException(status_code=501, detail=f"Full-text search is not available on {dialect_name}")
+    if not re.search(r'\w', q):
+        raise HTTPException(status_code=400, detail="Query has no searchable words")
+    
+    filters = []
+    if brand_id:
+        filters.append(Mention.brand_id == brand_id)
+    if platform:
+        platform_id = await _platform_id(db, platform)
+        if platform_id:
+            filters.append(Mention.platform_id == platform_id)
+    if days_back:
+        filters.append(Mention.timestamp >= datetime.utcnow() - timedelta(days=days_back))
     
-    mentions = query.order_by(Mention.timestamp.desc()).limit(1000).all()
+    after = decode_rank_cursor(cursor) if cursor else None
+    stmt = search_stmt(dialect_name, MENTION_COLUMNS, q, filters, limit + 1, after)
+    rows = (await db.execute(stmt)).all()
     
-    return mentions
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].id)
+        headers['X-Next-Cursor'] = next_cursor
+        headers['Link'] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+    
+    results = rows_to_dicts(rows, MENTION_FIELDS + ['rank', 'snippet'])
+    for result in results:
+        result['snippet'] = highlight(result['snippet'])
+    
+    return FastJSONResponse(results, headers=headers)
 
 
 @router.get("/category/{category_id}/sov", response_model=ShareOfVoiceResponse)
 async def get_share_of_voice(
     category_id: int,
     brand_id: int,
-    days_back: int = Query(default=30, ge=1, le=365),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    days_back: int = Query(default=30, ge=1, le=1825),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Calculate Share of Voice for a brand in its category.
     
+    Supports conditional GET: the ETag changes when ingestion commits
+    mentions for the brand or category, and a matching If-None-Match
+    returns 304 without computing anything.
+    
     Args:
         category_id: Category ID
         brand_id: Brand ID
         days_back: Analysis period
         db: Database session
-        
+    
     Returns:
         Share of Voice metrics
     """
-    brand = db.query(Brand).filter(Brand.id == brand_id).first()
-    if not brand:
-        raise HTTPException(status_code=404, detail="Brand not found")
+    brand = await _get_brand_or_404(db, brand_id)
+    
+    etag = await data_etag(db, request, [brand_scope(brand_id), category_scope(category_id)])
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    set_etag(response, etag)
     
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days_back)
     
     # Calculate SOV
-    sov_data = AnalyticsEngine.calculate_share_of_voice(
+    sov_data = await AsyncAnalyticsEngine.calculate_share_of_voice(
         brand_id=brand_id,
         category_id=category_id,
         start_date=start_date,
@@ -109,33 +311,50 @@ async def get_share_of_voice(
 
 @router.get("/metrics/market-index", response_model=List[MarketIndexResponse])
 async def get_market_index(
+    request: Request,
+    response: Response,
     brand_ids: Optional[List[int]] = Query(default=None),
-    days_back: int = Query(default=30, ge=1, le=365),
-    db: Session = Depends(get_db)
+    days_back: int = Query(default=30, ge=1, le=1825),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Calculate Market Index Score for brands.
     
+    Supports conditional GET (ETag / If-None-Match), keyed on the brands'
+    and their categories' data versions.
+    
     Args:
         brand_ids: List of brand IDs (None = all brands)
         days_back: Analysis period
         db: Database session
-        
+    
     Returns:
         Market Index scores for brands
     """
     # Get brands
+    catalog = await catalog_cache.get_async(db, brand_ids or ())
+    if brand_ids:
+        brands = [catalog.brands[b] for b in dict.fromkeys(brand_ids) if b in catalog.brands]
+    else:
+        brands = list(catalog.brands.values())
+    
+    # Scores are normalized within each brand's category
     if brand_ids:
-        brands = db.query(Brand).filter(Brand.id.in_(brand_ids)).all()
+        scopes = [brand_scope(b.id) for b in brands] + list({category_scope(b.category_id) for b in brands})
     else:
-        brands = db.query(Brand).all()
+        scopes = [GLOBAL, CATALOG]
+    etag = await data_etag(db, request, scopes)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    set_etag(response, etag)
     
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days_back)
     
     results = []
     for brand in brands:
-        index_data = AnalyticsEngine.calculate_market_index_score(
+        index_data = await AsyncAnalyticsEngine.calculate_market_index_score(
             brand_id=brand.id,
             start_date=start_date,
             end_date=end_date,
@@ -159,66 +378,135 @@ async def get_market_index(
     return results
 
 
+@router.post("/compare", response_model=ComparisonResponse)
+async def compare_brands(
+    request: ComparisonRequest,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Compare brands across several windows and metrics in one call.
+    
+    All windows end now. Everything is computed from two queries over the
+    longest window, replacing one /category/{id}/sov or
+    /metrics/market-index call per brand, window and metric. SOV is
+    relative to each brand's own category.
+    
+    Args:
+        request: Brands, windows (days) and metrics to compute
+        db: Database session
+    
+    Returns:
+        Per-brand value lists, aligned with the returned `windows`
+    """
+    brand_ids = list(dict.fromkeys(request.brand_ids))
+    catalog = await catalog_cache.get_async(db, brand_ids)
+    missing = set(brand_ids) - set(catalog.brands)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Brands not found: {sorted(missing)}")
+    
+    # Keep the caller's brand order
+    brands = [catalog.brands[brand_id] for brand_id in brand_ids]
+    windows = sorted(set(request.windows))
+    metrics = list(dict.fromkeys(request.metrics))
+    end_date = datetime.utcnow()
+    
+    matrix = await AsyncAnalyticsEngine.compare_brands(brands, windows, metrics, end_date, db)
+    
+    return ComparisonResponse(
+        windows=windows,
+        metrics=metrics,
+        period_end=end_date,
+        brands=matrix
+    )
+
+
 @router.get("/dashboard/overview", response_model=DashboardOverview)
-async def get_dashboard_overview(db: Session = Depends(get_db)):
+async def get_dashboard_overview(
+    request: Request,
+    approximate: bool = Query(default=False),
+    db: AsyncSession = Depends(get_read_db)
+):
     """
     Get dashboard overview with key metrics.
     
+    Totals and 30-day breakdowns come from the counter tables maintained at
+    ingestion, so cost doesn't grow with the mentions table. The 30-day
+    window is day-aligned (whole days of mention timestamps).
+    
+    Supports conditional GET (ETag / If-None-Match) on the global data
+    version. Like the mention list, the body is built from plain dicts and
+    row tuples and encoded with orjson; response_model documents the shape.
+    
+    Args:
+        approximate: Use the planner's row estimate for total_mentions
+            (PostgreSQL only; falls back to the exact counter elsewhere)
+        db: Database session
+    
     Returns:
         Dashboard summary data
     """
-    from sqlalchemy import func
+    etag = await data_etag(db, request, [GLOBAL, CATALOG])
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    catalog = await catalog_cache.get_async(db)
     
     # Total counts
-    total_brands = db.query(Brand).count()
-    total_mentions = db.query(Mention).count()
-    total_platforms = db.query(Platform).filter(Platform.is_active == 1).count()
-    
-    # Top 5 brands by mentions (last 30 days)
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    top_brands_query = db.query(
-        Brand.id,
-        Brand.name,
-        func.count(Mention.id).label('mention_count')
-    ).join(
-        Mention, Mention.brand_id == Brand.id
-    ).filter(
-        Mention.timestamp >= thirty_days_ago
+    total_brands = len(catalog.brands)
+    total_mentions = None
+    if approximate:
+        estimate_stmt = approximate_row_count_stmt(db.bind.dialect.name, 'mentions')
+        if estimate_stmt is not None:
+            total_mentions = (await db.execute(estimate_stmt)).scalar()
+    if total_mentions is None:
+        total_mentions = (await db.execute(counter_stmt(TOTAL_MENTIONS))).scalar() or 0
+    total_platforms = catalog.active_platform_count
+    
+    # Top 5 brands by mentions (last 30 days); names from the catalog
+    thirty_days_ago = (datetime.utcnow() - timedelta(days=30)).date()
+    mention_count = func.sum(MentionDailyCount.mention_count)
+    top_brands_query = (await db.execute(select(
+        MentionDailyCount.brand_id,
+        mention_count.label('mention_count')
+    ).where(
+        MentionDailyCount.day >= thirty_days_ago
     ).group_by(
-        Brand.id, Brand.name
+        MentionDailyCount.brand_id
     ).order_by(
-        func.count(Mention.id).desc()
-    ).limit(5).all()
+        mention_count.desc()
+    ).limit(5))).all()
     
+    catalog = await catalog_cache.get_async(db, [b.brand_id for b in top_brands_query])
     top_brands = [
-        {'brand_id': b.id, 'brand_name': b.name, 'mentions': b.mention_count}
+        {'brand_id': b.brand_id, 'brand_name': catalog.brands[b.brand_id].name, 'mentions': int(b.mention_count)}
         for b in top_brands_query
     ]
     
     # Platform distribution
-    platform_dist_query = db.query(
-        Platform.name,
-        func.count(Mention.id).label('count')
-    ).join(
-        Mention, Mention.platform_id == Platform.id
-    ).filter(
-        Mention.timestamp >= thirty_days_ago
+    platform_dist_query = (await db.execute(select(
+        MentionDailyCount.platform_id,
+        mention_count.label('count')
+    ).where(
+        MentionDailyCount.day >= thirty_days_ago
     ).group_by(
-        Platform.name
-    ).all()
+        MentionDailyCount.platform_id
+    ))).all()
     
-    platform_distribution = {p.name: p.count for p in platform_dist_query}
+    platform_distribution = {catalog.platform_names[p.platform_id]: int(p.count) for p in platform_dist_query}
     
     # Recent mentions
-    recent = db.query(Mention).order_by(
+    recent = rows_to_dicts((await db.execute(join_bodies(select(*MENTION_COLUMNS)).order_by(
         Mention.collected_at.desc()
-    ).limit(10).all()
-    
-    return DashboardOverview(
-        total_brands=total_brands,
-        total_mentions=total_mentions,
-        total_platforms=total_platforms,
-        top_brands=top_brands,
-        platform_distribution=platform_distribution,
-        recent_mentions=recent
-    )
+    ).limit(10))).all())
+    
+    response = FastJSONResponse({
+        'total_brands': total_brands,
+        'total_mentions': total_mentions,
+        'total_platforms': total_platforms,
+        'top_brands': top_brands,
+        'platform_distribution': platform_distribution,
+        'recent_mentions': recent,
+    })
+    set_etag(response, etag)
+    return response
@@ -0,0 +1,62 @@
+"""
+Conditional GET support for analytics routes.
+
+ETags are derived from data versions (see app.analytics.versions) rather
+than from the response body, so a matching If-None-Match is answered with
+304 before any analytics query runs.
+"""
+
+import time
+from typing import List, Optional
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.analytics.versions import versions_stmt, make_etag
+
+
+# Windows end at "now", so results also drift as old mentions age out.
+# ETags roll over every ETAG_WINDOW_SECONDS to bound that staleness.
+ETAG_WINDOW_SECONDS = 300
+
+
+async def data_etag(db: AsyncSession, request: Request, scopes: List[str]) -> str:
+    """
+    ETag for a request whose result depends on the given data scopes.
+    
+    Args:
+        db: Database session
+        request: Incoming request (path and query are part of the key)
+        scopes: Data version scopes the result depends on
+    
+    Returns:
+        Weak ETag string
+    """
+    versions = dict((await db.execute(versions_stmt(scopes))).all())
+    query = sorted(request.query_params.multi_items())
+    return make_etag(versions, scopes, request.url.path, query, int(time.time() // ETAG_WINDOW_SECONDS))
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    # Weak comparison: ignore W/ prefixes
+    opaque = etag.removeprefix('W/')
+    return any(tag.strip().removeprefix('W/') == opaque for tag in if_none_match.split(','))
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """304 response if the client's If-None-Match matches `etag`, else None."""
+    if not _matches(request.headers.get('if-none-match'), etag):
+        return None
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
+
+
+def set_etag(response: Response, etag: str):
+    """Attach the ETag and ask clients to revalidate before reuse."""
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = 'no-cache'
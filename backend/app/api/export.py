@@ -0,0 +1,74 @@
+"""
+Streaming encoders for bulk mention exports.
+
+Rows are pulled from the database in chunks (a server-side cursor on
+PostgreSQL) and written out as they arrive, so exporting a brand's full
+history uses constant memory.
+"""
+
+import csv
+import io
+from datetime import datetime
+from typing import Iterator, Iterable, Sequence
+
+from sqlalchemy import select
+
+from app.analytics.bodies import join_bodies
+from app.api.responses import MENTION_COLUMNS, MENTION_FIELDS, dumps
+from app.core.config import ReadSessionLocal, SessionLocal
+from app.models.database import Mention
+
+
+EXPORT_COLUMNS = MENTION_COLUMNS
+EXPORT_FIELDS = MENTION_FIELDS
+
+# Rows fetched from the cursor per round trip
+CHUNK_SIZE = 1000
+
+
+def encode_ndjson(rows: Iterable[Sequence]) -> Iterator[bytes]:
+    """One JSON object per line."""
+    for row in rows:
+        yield dumps(dict(zip(EXPORT_FIELDS, row))) + b'\n'
+
+
+def encode_csv(rows: Iterable[Sequence]) -> Iterator[str]:
+    """CSV with a header row, flushed in chunks."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    
+    for i, row in enumerate(rows, 1):
+        writer.writerow([v.isoformat() if isinstance(v, datetime) else v for v in row])
+        if i % CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    yield buffer.getvalue()
+
+
+def stream_mentions(*filters, replica: bool = False) -> Iterator[Sequence]:
+    """
+    Stream mention rows newest first with a dedicated session.
+    
+    The request's session is closed before a streaming response body is
+    sent, so the generator owns its own session for its whole lifetime.
+    
+    Args:
+        *filters: SQLAlchemy filter expressions on Mention
+        replica: Read from the read replica (see app.core.config.use_read_replica)
+    
+    Yields:
+        Row tuples in EXPORT_COLUMNS order
+    """
+    db = (ReadSessionLocal if replica else SessionLocal)()
+    try:
+        stmt = join_bodies(select(*EXPORT_COLUMNS)).where(*filters).order_by(
+            Mention.timestamp.desc(), Mention.id.desc()
+        ).execution_options(yield_per=CHUNK_SIZE)
+        
+        for row in db.execute(stmt):
+            yield tuple(row)
+    finally:
+        db.close()
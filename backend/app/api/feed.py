@@ -0,0 +1,76 @@
+"""
+API routes for the live mention feed (Server-Sent Events).
+"""
+
+import asyncio
+import json
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.core.broadcast import get_broadcaster
+from app.core.config import AsyncSessionLocal
+from app.models.database import Platform
+
+router = APIRouter(tags=["Feed"])
+
+HEARTBEAT_SECONDS = 15
+
+
+async def _event_stream(request: Request, filters: dict):
+    broadcaster = get_broadcaster()
+    subscription = broadcaster.subscribe(**filters)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                # Comment line keeps proxies from closing the idle connection
+                yield ": keepalive\n\n"
+                continue
+            yield f"id: {event['id']}\nevent: mention\ndata: {json.dumps(event)}\n\n"
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+@router.get("/mentions/feed")
+async def mention_feed(
+    request: Request,
+    brand_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    platform: Optional[str] = None
+):
+    """
+    Stream newly ingested mentions as Server-Sent Events.
+    
+    Each event (`event: mention`) carries the mention as JSON, with text
+    cut to a preview. Replaces polling /dashboard/overview for
+    recent_mentions; subscribers are woken only by matching mentions.
+    
+    Args:
+        brand_id: Only mentions of this brand (optional)
+        category_id: Only mentions of brands in this category (optional)
+        platform: Only mentions from this platform name (optional)
+    
+    Returns:
+        text/event-stream response
+    """
+    platform_id = None
+    if platform:
+        # Short-lived session: the stream itself must not hold a connection
+        async with AsyncSessionLocal() as db:
+            platform_id = (await db.execute(select(Platform.id).where(Platform.name == platform))).scalar()
+        if platform_id is None:
+            raise HTTPException(status_code=404, detail="Platform not found")
+    
+    filters = {'brand_id': brand_id, 'category_id': category_id, 'platform_id': platform_id}
+    return StreamingResponse(
+        _event_stream(request, filters),
+        media_type="text/event-stream",
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
@@ -2,13 +2,19 @@
 API routes for ingestion endpoints.
 """
 
-from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException
+import asyncio
+
+from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException, Query, Request
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
-from app.core.config import get_db
-from app.schemas.schemas import IngestionRequest, IngestionResponse
+from app.core.config import get_db, replica_router
+from app.core.replica import record_write
+from app.schemas.schemas import IngestionRequest, IngestionResponse, BrandImportResponse
+from app.analytics.brand_import import FORMATS, detect_format, import_brands, parse_brands
+from app.analytics.catalog import catalog_cache
 from app.analytics.ingestion import IngestionService
 from app.models.database import Brand
 
@@ -52,15 +58,14 @@ async def run_ingestion(
     # Run ingestion in background
     def ingest_task():
         service = IngestionService(db)
-        total = 0
-        for brand in brands:
-            collected = service.ingest_brand(
-                brand_id=brand.id,
-                days_back=request.days_back,
-                platforms=platforms
-            )
-            total += collected
-        return total
+        collected = service.ingest_brands(
+            brand_ids=[brand.id for brand in brands],
+            days_back=request.days_back,
+            platforms=platforms
+        )
+        # Analytics reads stay on the primary until the replica has these mentions
+        record_write(db, replica_router)
+        return collected
     
     background_tasks.add_task(ingest_task)
     
@@ -73,3 +78,45 @@ async def run_ingestion(
         started_at=started_at,
         completed_at=None
     )
+
+
+@router.post("/brands", response_model=BrandImportResponse)
+async def import_brand_catalog(
+    request: Request,
+    format: Optional[str] = Query(default=None, pattern=f"^({'|'.join(FORMATS)})$"),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk-import brands, upserting by name.
+    
+    The body is a JSON, NDJSON or CSV brand list (see
+    app.analytics.brand_import), picked by `format` or the Content-Type.
+    
+    Args:
+        request: Request with the brand list as its body
+        format: json, ndjson or csv (default: from Content-Type)
+        db: Database session
+        
+    Returns:
+        Inserted, updated, unchanged and skipped counts
+    """
+    try:
+        records = parse_brands(
+            await request.body(),
+            format or detect_format(content_type=request.headers.get('content-type', ''))
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Unreadable brand list: {e}")
+    
+    def run_import():
+        result = import_brands(db, records)
+        db.commit()
+        # Check right away here; other processes see the new catalog version on their next check
+        catalog_cache.invalidate()
+        return result
+    
+    try:
+        result = await asyncio.to_thread(run_import)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Brands changed during the import; retry")
+    return BrandImportResponse(**result._asdict())
@@ -0,0 +1,103 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors encode the sort key of the last row on a page, so the next page
+is an index range scan from that point instead of an OFFSET that re-reads
+every earlier row.
+
+- encode_cursor / decode_cursor: (timestamp, id), for time-ordered lists
+- encode_rank_cursor / decode_rank_cursor: (rank, id), for search results
+
+A brand's mention pages and its export read ix_mentions_brand_timestamp_id
+(brand_id, timestamp, id). New databases get it from create_all; existing
+ones need it created once.
+
+Usage:
+    python -m app.api.pagination setup   # existing databases
+"""
+
+import base64
+from datetime import datetime
+from typing import Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.engine import Engine
+
+from app.models.database import Mention
+
+
+PAGING_INDEX = 'ix_mentions_brand_timestamp_id'
+
+
+def _encode(*parts) -> str:
+    raw = '|'.join(str(part) for part in parts)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def _decode(cursor: str) -> list:
+    padded = cursor + '=' * (-len(cursor) % 4)
+    return base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    return _encode(timestamp.isoformat(), row_id)
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        timestamp, row_id = _decode(cursor)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_rank_cursor(rank: float, row_id: int) -> str:
+    """Encode a (rank, id) sort key; repr keeps the float exact."""
+    return _encode(repr(float(rank)), row_id)
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Decode a cursor produced by encode_rank_cursor.
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        rank, row_id = _decode(cursor)
+        return float(rank), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def create_paging_index(bind: Engine):
+    """
+    Create the (brand_id, timestamp, id) index if it is missing.
+    
+    Building it blocks writes to mentions on a large table, so run it in a
+    maintenance window.
+    
+    Args:
+        bind: Sync engine
+    """
+    index = next(index for index in Mention.__table__.indexes if index.name == PAGING_INDEX)
+    index.create(bind, checkfirst=True)
+
+
+if __name__ == "__main__":
+    import sys
+    from app.core.config import engine
+    
+    if sys.argv[1:] != ['setup']:
+        print("Usage: python -m app.api.pagination setup")
+        sys.exit(1)
+    
+    create_paging_index(engine)
+    print(f"✓ {PAGING_INDEX} ready")
@@ -0,0 +1,63 @@
+"""
+Fast response path for large list endpoints.
+
+Large responses are built from plain row tuples and encoded in one pass
+with orjson, skipping ORM instance construction and per-item Pydantic
+validation. Only used for trusted data read from our own database; the
+route's response_model still documents the shape.
+"""
+
+import json
+from datetime import datetime, date
+from typing import Any, Dict, Iterable, List, Sequence
+
+from fastapi.responses import JSONResponse
+
+from app.models.database import Mention, MentionBody
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+# Columns of MentionResponse, in response field order (select with join_bodies)
+MENTION_COLUMNS = (
+    Mention.id,
+    Mention.brand_id,
+    Mention.platform_id,
+    MentionBody.text,
+    MentionBody.url,
+    Mention.author,
+    Mention.timestamp,
+    Mention.engagement_score,
+    Mention.raw_engagement,
+    Mention.collected_at,
+)
+
+MENTION_FIELDS = [column.key for column in MENTION_COLUMNS]
+
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode to JSON bytes (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson when available."""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def rows_to_dicts(rows: Iterable[Sequence], fields: List[str] = MENTION_FIELDS) -> List[Dict[str, Any]]:
+    """Turn result row tuples into dicts keyed by field name."""
+    return [dict(zip(fields, row)) for row in rows]
@@ -0,0 +1,124 @@
+"""
+In-process fan-out of events to async subscribers.
+
+Subscribers register a filter and get a bounded queue. Publishing only
+touches subscribers whose filter can match the event (they are indexed by
+their most selective filter key), so thousands of idle subscribers cost
+nothing until something relevant arrives.
+
+Publishers running in worker threads (ingestion background tasks) use
+publish_threadsafe(); delivery always happens on the event loop.
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+# Filter keys, most selective first; a subscriber is indexed by the first one it sets
+FILTER_KEYS = ('brand_id', 'category_id', 'platform_id')
+QUEUE_SIZE = 1000
+
+_ANY = ('*', None)
+
+
+class Subscription:
+    """One subscriber's filter and event queue."""
+    
+    def __init__(self, filters: Dict[str, Optional[int]], queue_size: int = QUEUE_SIZE):
+        self.filters = {k: v for k, v in filters.items() if v is not None}
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+    
+    @property
+    def index_key(self) -> Tuple[str, Any]:
+        for key in FILTER_KEYS:
+            if key in self.filters:
+                return key, self.filters[key]
+        return _ANY
+    
+    def matches(self, event: Dict[str, Any]) -> bool:
+        return all(event.get(k) == v for k, v in self.filters.items())
+    
+    def offer(self, event: Dict[str, Any]):
+        """Queue an event; a subscriber that falls behind loses its oldest event."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class Broadcaster:
+    """
+    Usage:
+        subscription = broadcaster.subscribe(brand_id=1)
+        try:
+            event = await subscription.queue.get()
+        finally:
+            broadcaster.unsubscribe(subscription)
+        
+        broadcaster.publish_threadsafe(events)   # from any thread
+    """
+    
+    def __init__(self):
+        self._index: Dict[Tuple[str, Any], Set[Subscription]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subs) for subs in self._index.values())
+    
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Event loop that owns the subscriber queues."""
+        self._loop = loop
+    
+    def subscribe(self, **filters: Optional[int]) -> Subscription:
+        """Register a subscriber (call on the event loop)."""
+        if self._loop is None:
+            self.bind(asyncio.get_running_loop())
+        subscription = Subscription(filters)
+        self._index.setdefault(subscription.index_key, set()).add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription):
+        subs = self._index.get(subscription.index_key)
+        if subs is not None:
+            subs.discard(subscription)
+            if not subs:
+                del self._index[subscription.index_key]
+    
+    def publish(self, events: Iterable[Dict[str, Any]]):
+        """Deliver events to matching subscribers (call on the event loop)."""
+        for event in events:
+            for key in [_ANY] + [(k, event.get(k)) for k in FILTER_KEYS]:
+                for subscription in self._index.get(key, ()):
+                    if subscription.matches(event):
+                        subscription.offer(event)
+    
+    def publish_threadsafe(self, events: List[Dict[str, Any]]):
+        """Deliver events from any thread; no-op if nobody has subscribed yet."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self.publish(events)
+        else:
+            loop.call_soon_threadsafe(self.publish, events)
+
+
+_broadcaster: Optional[Broadcaster] = None
+_broadcaster_lock = threading.Lock()
+
+
+def get_broadcaster() -> Broadcaster:
+    """Get the process-wide broadcaster."""
+    global _broadcaster
+    if _broadcaster is None:
+        with _broadcaster_lock:
+            if _broadcaster is None:
+                _broadcaster = Broadcaster()
+    return _broadcaster
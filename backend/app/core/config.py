@@ -6,15 +6,46 @@ from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url, URL
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import NullPool
+from typing import Generator, AsyncGenerator
+
+from app.core.dialect import DEFAULT_DATABASE_URL, configure_sqlite, engine_options, resolve_database_url
+from app.core.pools import instrument_pool, pool_options
+from app.core.replica import ReplicaRouter
 
 
 class Settings(BaseSettings):
     """Application configuration from environment variables."""
     
-    # Database
-    database_url: str = Field(..., env="DATABASE_URL")
+    # Database (default: local SQLite file, see app.core.dialect)
+    database_url: str = Field(default=DEFAULT_DATABASE_URL, env="DATABASE_URL")
+    
+    # Read replica for analytics routes (empty = read from the primary)
+    database_read_url: str = Field(default="", env="DATABASE_READ_URL")
+    replica_max_lag_seconds: float = Field(default=30.0, env="REPLICA_MAX_LAG_SECONDS")
+    
+    # Connection pools, sized per process role (PROCESS_ROLE=api | worker)
+    process_role: str = Field(default="api", env="PROCESS_ROLE")
+    api_pool_size: int = Field(default=10, env="API_POOL_SIZE")
+    api_max_overflow: int = Field(default=20, env="API_MAX_OVERFLOW")
+    worker_pool_size: int = Field(default=2, env="WORKER_POOL_SIZE")
+    worker_max_overflow: int = Field(default=2, env="WORKER_MAX_OVERFLOW")
+    pool_timeout: float = Field(default=30.0, env="POOL_TIMEOUT")
+    pool_recycle: int = Field(default=-1, env="POOL_RECYCLE")  # Seconds; -1 = never
+    pool_pre_ping: bool = Field(default=True, env="POOL_PRE_PING")
+    
+    # PgBouncer (transaction pooling) in front of the database
+    database_pgbouncer: bool = Field(default=False, env="DATABASE_PGBOUNCER")
+    database_direct_url: str = Field(default="", env="DATABASE_DIRECT_URL")  # For the feed's LISTEN
+    
+    # SQLite connection tuning
+    sqlite_synchronous: str = Field(default="NORMAL", env="SQLITE_SYNCHRONOUS")
+    sqlite_cache_size_mb: int = Field(default=64, env="SQLITE_CACHE_SIZE_MB")
+    sqlite_mmap_size_mb: int = Field(default=256, env="SQLITE_MMAP_SIZE_MB")
+    sqlite_busy_timeout_ms: int = Field(default=5000, env="SQLITE_BUSY_TIMEOUT_MS")
     
     # Reddit API
     reddit_client_id: str = Field(..., env="REDDIT_CLIENT_ID")
@@ -23,6 +54,8 @@ class Settings(BaseSettings):
     
     # YouTube API
     youtube_api_key: str = Field(..., env="YOUTUBE_API_KEY")
+    youtube_daily_quota: int = Field(default=10000, env="YOUTUBE_DAILY_QUOTA")
+    youtube_stats_refresh_hours: int = Field(default=24, env="YOUTUBE_STATS_REFRESH_HOURS")
     
     # News API
     news_api_key: str = Field(..., env="NEWS_API_KEY")
@@ -35,6 +68,20 @@ class Settings(BaseSettings):
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
     max_mentions_per_source: int = Field(default=100, env="MAX_MENTIONS_PER_SOURCE")
     
+    # Mentions partitioning (PostgreSQL, after `python -m app.analytics.partitions migrate`)
+    partition_months_ahead: int = Field(default=3, env="PARTITION_MONTHS_AHEAD")
+    mention_retention_months: int = Field(default=0, env="MENTION_RETENTION_MONTHS")  # 0 = keep all
+    
+    # Cold archive of old mentions (Parquet + DuckDB; off when ARCHIVE_DIR is empty)
+    archive_dir: str = Field(default="", env="ARCHIVE_DIR")
+    archive_after_days: int = Field(default=90, env="ARCHIVE_AFTER_DAYS")
+    
+    # Request profiling (off unless a token or sample rate is set)
+    profiling_token: str = Field(default="", env="PROFILING_TOKEN")
+    profiling_sample_every: int = Field(default=0, env="PROFILING_SAMPLE_EVERY")
+    profiling_dir: str = Field(default="", env="PROFILING_DIR")
+    profiling_max_profiles: int = Field(default=50, env="PROFILING_MAX_PROFILES")
+    
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
 
@@ -44,15 +91,81 @@ def get_settings() -> Settings:
     return Settings()
 
 
-# Database setup
 settings = get_settings()
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
-)
+
+
+def async_database_url(database_url: str) -> URL:
+    """
+    Map a sync database URL to its asyncio driver.
+    
+    postgresql[+psycopg2]:// -> postgresql+asyncpg://
+    sqlite:// -> sqlite+aiosqlite://
+    
+    asyncpg takes `ssl` instead of libpq's `sslmode`, so that is translated.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    
+    if backend == 'postgresql':
+        url = url.set(drivername='postgresql+asyncpg')
+        if 'sslmode' in url.query:
+            query = dict(url.query)
+            query['ssl'] = query.pop('sslmode')
+            url = url.set(query=query)
+    elif backend == 'sqlite':
+        url = url.set(drivername='sqlite+aiosqlite')
+    
+    return url
+
+
+def create_engines(database_url: str, name: str):
+    """
+    Sync and async engine for a database, with this role's pool settings.
+    
+    SQLite gets its connection tuning (app.core.dialect); both pools are
+    instrumented as `name` and `name`_async (app.core.pools).
+    """
+    database_url = resolve_database_url(database_url)
+    sync_engine = create_engine(database_url, **engine_options(database_url, pool_options(settings)))
+    async_engine = create_async_engine(
+        async_database_url(database_url),
+        **engine_options(database_url, pool_options(settings, is_async=True))
+    )
+    for bind, label in ((sync_engine, name), (async_engine.sync_engine, f'{name}_async')):
+        configure_sqlite(bind, settings)
+        instrument_pool(bind, label)
+    return sync_engine, async_engine
+
+
+# Database setup: sync sessions for writes, async for the API's read paths
+engine, async_engine = create_engines(settings.database_url, 'primary')
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Replica engines for analytics reads (the primary's when no replica is configured)
+if settings.database_read_url:
+    read_engine, read_async_engine = create_engines(settings.database_read_url, 'replica')
+else:
+    read_engine, read_async_engine = engine, async_engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncReadSessionLocal = async_sessionmaker(read_async_engine, autoflush=False, expire_on_commit=False)
+
+replica_router = ReplicaRouter(settings.replica_max_lag_seconds)
+
+# The live feed's LISTEN holds a session, which transaction pooling does not give
+if not settings.database_pgbouncer:
+    listen_engine = async_engine
+elif settings.database_direct_url:
+    listen_engine = create_async_engine(async_database_url(settings.database_direct_url), poolclass=NullPool)
+else:
+    listen_engine = None
+
+
+async def use_read_replica() -> bool:
+    """Whether analytics reads should go to the replica right now (see app.core.replica)."""
+    if not settings.database_read_url:
+        return False
+    return await replica_router.use_replica(read_async_engine)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -69,3 +182,35 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async database session dependency for FastAPI.
+    
+    Queries are awaited, so a slow query doesn't block the event loop.
+    
+    Usage:
+        @app.get("/endpoint")
+        async def endpoint(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(...))
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async session dependency for read-only analytics routes.
+    
+    Reads from the replica (DATABASE_READ_URL) while it is caught up,
+    from the primary otherwise.
+    
+    Usage:
+        @app.get("/endpoint")
+        async def endpoint(db: AsyncSession = Depends(get_read_db)):
+            result = await db.execute(select(...))
+    """
+    sessions = AsyncReadSessionLocal if await use_read_replica() else AsyncSessionLocal
+    async with sessions() as db:
+        yield db
@@ -0,0 +1,136 @@
+"""
+Database dialect specifics: the SQLite profile, upserts and day buckets.
+
+PostgreSQL is the production database; SQLite runs the same schema and
+queries for local development, benchmarks and tests without a server.
+DATABASE_URL defaults to a SQLite file in the working directory.
+
+SQLite connections are tuned on connect:
+- journal_mode=WAL: readers don't block the writer or each other
+- synchronous (SQLITE_SYNCHRONOUS, default NORMAL): with WAL, only a power
+  loss can lose the last transactions, never corrupt the file
+- cache_size / mmap_size (SQLITE_CACHE_SIZE_MB, SQLITE_MMAP_SIZE_MB):
+  page cache per connection and memory-mapped reads
+- temp_store=MEMORY: sorts and temporary indexes stay off disk
+- busy_timeout (SQLITE_BUSY_TIMEOUT_MS): writers wait for the lock
+  instead of failing at once
+
+Each thread checks out a connection of its own from the pool (SQLite
+connections are not shared while in use). `sqlite://` is an in-memory
+database shared by the sync and async engines of the process: one
+connection each, kept open, so the data lives as long as the process.
+"""
+
+from typing import Any, Dict
+
+from sqlalchemy import Date, cast, event, func
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import StaticPool
+
+
+DEFAULT_DATABASE_URL = 'sqlite:///./marketecho.db'
+
+# Named so that every connection in the process opens the same database
+_SHARED_MEMORY_URL = 'sqlite:///file:marketecho?mode=memory&cache=shared&uri=true'
+
+
+def is_sqlite(url) -> bool:
+    return make_url(url).get_backend_name() == 'sqlite'
+
+
+def is_memory(url) -> bool:
+    """Whether a SQLite URL is an in-memory database."""
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and (
+        url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+    )
+
+
+def resolve_database_url(database_url: str) -> str:
+    """
+    The URL to connect to: the default when empty, and a bare in-memory
+    SQLite URL made shared.
+    """
+    if not database_url:
+        return DEFAULT_DATABASE_URL
+    url = make_url(database_url)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return _SHARED_MEMORY_URL
+    return database_url
+
+
+def engine_options(database_url, pool_options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    create_engine arguments adjusted for the database.
+    
+    Args:
+        database_url: Resolved database URL
+        pool_options: Pool arguments for this process role (app.core.pools)
+    
+    Returns:
+        Keyword arguments for create_engine / create_async_engine
+    """
+    if not is_sqlite(database_url):
+        return pool_options
+    if is_memory(database_url):
+        # A single connection: an in-memory database is gone once none is open
+        return {'poolclass': StaticPool, 'connect_args': {'check_same_thread': False}}
+    return {**pool_options, 'connect_args': {'check_same_thread': False}}
+
+
+def configure_sqlite(engine: Engine, settings):
+    """
+    Apply the SQLite pragmas to every new connection of an engine.
+    
+    Args:
+        engine: Sync engine (an async engine's .sync_engine); ignored unless SQLite
+        settings: Application settings
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    
+    pragmas = [
+        f"synchronous={settings.sqlite_synchronous}",
+        f"cache_size={-settings.sqlite_cache_size_mb * 1024}",  # Negative = KiB
+        f"mmap_size={settings.sqlite_mmap_size_mb * 1024 * 1024}",
+        "temp_store=MEMORY",
+        f"busy_timeout={settings.sqlite_busy_timeout_ms}",
+    ]
+    if not is_memory(engine.url):
+        pragmas.insert(0, "journal_mode=WAL")
+    
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+
+def insert_for(dialect_name: str):
+    """
+    The dialect's INSERT construct with ON CONFLICT support.
+    
+    Returns:
+        postgresql / sqlite `insert`, or None where upserts go through the
+        portable update-then-insert path
+    """
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
+
+
+def day_bucket(dialect_name: str, column):
+    """
+    Calendar day of a timestamp column, returned as a date on every dialect.
+    
+    PostgreSQL casts; SQLite's date() yields an ISO string, which the Date
+    result type parses.
+    """
+    if dialect_name == 'sqlite':
+        return func.date(column, type_=Date)
+    return cast(column, Date)
@@ -1,8 +1,8 @@
 """Database initialization script."""
 
-from sqlalchemy import create_engine
 from app.models.database import Base, Platform, Category
-from app.core.config import get_settings
+from app.analytics.search import create_search_index
+from app.core.config import engine, get_settings
 
 
 def init_database():
@@ -12,10 +12,10 @@ def init_database():
     Run this once when setting up a new database.
     """
     settings = get_settings()
-    engine = create_engine(settings.database_url)
     
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    create_search_index(engine)
     print("✓ Tables created successfully")
     
     # Seed platforms
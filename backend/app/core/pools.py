@@ -0,0 +1,217 @@
+"""
+Connection pool sizing and metrics.
+
+Pools are sized per process role (PROCESS_ROLE): API workers serve many
+short concurrent reads, ingestion workers and maintenance jobs a few long
+writes. Each role has its own pool size and overflow in Settings.
+
+Every engine's pool records:
+- checkout time: waiting for a free connection, opening an overflow one
+  and the pre-ping, i.e. what a request pays before its first query
+- checkout timeouts (pool exhausted for POOL_TIMEOUT seconds)
+- connections in use, idle and in overflow, and the peak in use
+- pre-ping count, time and failures
+
+`GET /health/pools` returns them. A peak in use near size + overflow, or
+slow checkouts, means the pool is too small; a peak well under the size
+means connections can be given back.
+
+PgBouncer mode (DATABASE_PGBOUNCER, transaction pooling) keeps no state on
+server connections, which PgBouncer hands to a different client each
+transaction: no pre-ping (PgBouncer checks its server connections itself)
+and no asyncpg prepared statement caches. The live feed's LISTEN needs a
+session of its own and goes to DATABASE_DIRECT_URL.
+"""
+
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+ROLES = ('api', 'worker')
+SLOW_CHECKOUT = 0.01  # Seconds; a checkout slower than this had to wait or connect
+CHECKOUT_BUCKETS_MS = (1, 10, 100, 1000)
+
+_engines: Dict[str, Engine] = {}
+
+
+class PoolStats:
+    """Counters of one engine's pool (thread-safe; kept across pool recreation)."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_seconds = 0.0
+        self.checkout_max = 0.0
+        self.slow_checkouts = 0
+        self.buckets = [0] * (len(CHECKOUT_BUCKETS_MS) + 1)
+        self.timeouts = 0
+        self.peak_in_use = 0
+        self.pings = 0
+        self.ping_seconds = 0.0
+        self.ping_max = 0.0
+        self.ping_failures = 0
+    
+    def record_checkout(self, seconds: float, in_use: int):
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_seconds += seconds
+            self.checkout_max = max(self.checkout_max, seconds)
+            self.slow_checkouts += seconds > SLOW_CHECKOUT
+            self.buckets[_bucket(seconds * 1000)] += 1
+            self.peak_in_use = max(self.peak_in_use, in_use)
+    
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+    
+    def record_ping(self, seconds: float, ok: bool):
+        with self._lock:
+            self.pings += 1
+            self.ping_seconds += seconds
+            self.ping_max = max(self.ping_max, seconds)
+            self.ping_failures += not ok
+    
+    def snapshot(self, pool) -> Dict[str, Any]:
+        """Current pool state and counters since startup."""
+        with self._lock:
+            labels = [f"<{limit}" for limit in CHECKOUT_BUCKETS_MS] + [f">={CHECKOUT_BUCKETS_MS[-1]}"]
+            return {
+                'size': pool.size(),
+                'max_overflow': pool._max_overflow,
+                'in_use': pool.checkedout(),
+                'idle': pool.checkedin(),
+                'overflow': max(pool.overflow(), 0),
+                'peak_in_use': self.peak_in_use,
+                'checkouts': self.checkouts,
+                'checkout_ms': {
+                    'avg': _ms(self.checkout_seconds / self.checkouts) if self.checkouts else None,
+                    'max': _ms(self.checkout_max),
+                    'histogram': dict(zip(labels, self.buckets)),
+                },
+                'slow_checkouts': self.slow_checkouts,
+                'timeouts': self.timeouts,
+                'pre_ping': {
+                    'enabled': pool._pre_ping,
+                    'count': self.pings,
+                    'avg_ms': _ms(self.ping_seconds / self.pings) if self.pings else None,
+                    'max_ms': _ms(self.ping_max),
+                    'failures': self.ping_failures,
+                },
+            }
+
+
+def _bucket(ms: float) -> int:
+    for i, limit in enumerate(CHECKOUT_BUCKETS_MS):
+        if ms < limit:
+            return i
+    return len(CHECKOUT_BUCKETS_MS)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+class _MeteredPool:
+    """Times Pool.connect(), i.e. a whole checkout including the pre-ping."""
+    
+    stats: Optional[PoolStats] = None  # Set by instrument_pool
+    
+    def connect(self):
+        if self.stats is None:
+            return super().connect()
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record_checkout(time.perf_counter() - started, self.checkedout())
+        return connection
+    
+    def recreate(self):
+        # Engine.dispose() and pool invalidation swap in a new pool
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class MeteredQueuePool(_MeteredPool, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(_MeteredPool, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(settings, is_async: bool = False) -> Dict[str, Any]:
+    """
+    create_engine / create_async_engine arguments for this process role.
+    
+    Args:
+        settings: Application settings
+        is_async: Options for the asyncpg / aiosqlite engine
+    
+    Returns:
+        Keyword arguments (metered pool class, sizes, pre-ping, driver options)
+    """
+    role = settings.process_role
+    if role not in ROLES:
+        raise ValueError(f"PROCESS_ROLE must be one of {', '.join(ROLES)}, not {role!r}")
+    
+    options = {
+        'poolclass': MeteredAsyncQueuePool if is_async else MeteredQueuePool,
+        'pool_size': getattr(settings, f'{role}_pool_size'),
+        'max_overflow': getattr(settings, f'{role}_max_overflow'),
+        'pool_timeout': settings.pool_timeout,
+        'pool_recycle': settings.pool_recycle,
+        'pool_pre_ping': settings.pool_pre_ping and not settings.database_pgbouncer,
+    }
+    if settings.database_pgbouncer and is_async:
+        options['connect_args'] = {
+            'statement_cache_size': 0,
+            'prepared_statement_cache_size': 0,
+            # asyncpg's numbered statement names collide between clients sharing a server connection
+            'prepared_statement_name_func': lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return options
+
+
+def instrument_pool(engine: Engine, name: str):
+    """
+    Collect metrics for an engine's pool under `name`.
+    
+    Args:
+        engine: Sync engine (an async engine's .sync_engine)
+        name: Label in pool_metrics()
+    """
+    if not isinstance(engine.pool, _MeteredPool):
+        return  # e.g. the single connection of an in-memory SQLite database
+    stats = engine.pool.stats = PoolStats(name)
+    _engines[name] = engine
+    
+    dialect = engine.dialect
+    do_ping = dialect.do_ping
+    
+    def timed_ping(dbapi_connection):
+        started = time.perf_counter()
+        ok = False
+        try:
+            ok = do_ping(dbapi_connection)
+            return ok
+        finally:
+            stats.record_ping(time.perf_counter() - started, ok)
+    
+    # Only called for the pre-ping
+    dialect.do_ping = timed_ping
+
+
+def pool_metrics() -> Dict[str, Any]:
+    """Snapshot of every instrumented pool, by name."""
+    return {name: engine.pool.stats.snapshot(engine.pool) for name, engine in _engines.items()}
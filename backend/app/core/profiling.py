@@ -0,0 +1,209 @@
+"""
+On-demand request profiling.
+
+ProfilingMiddleware runs pyinstrument (a sampling profiler) on selected
+requests and writes a speedscope profile plus a small summary to a bounded
+directory. A request is profiled when:
+- it sends `X-Profile: <PROFILING_TOKEN>`, or
+- it is the Nth request since the last sample (PROFILING_SAMPLE_EVERY=N)
+
+Each profiled response gets a Server-Timing header splitting the time into
+SQL (timed with SQLAlchemy cursor events), serialization (profiler frames
+in FastAPI/Starlette response encoding) and the remaining Python time.
+
+The middleware is only installed when one of the two triggers is
+configured, and the SQL timing hooks only exist while it is installed, so
+a disabled profiler costs nothing.
+
+View a profile: open the .speedscope.json file at https://www.speedscope.app
+"""
+
+import asyncio
+import contextvars
+import hmac
+import itertools
+import json
+import os
+import re
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # pragma: no cover - optional dependency
+    Profiler = None
+
+
+DEFAULT_PROFILE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+    'marketecho',
+    'profiles'
+)
+PROFILE_HEADER = 'x-profile'
+SAMPLE_INTERVAL = 0.001  # Seconds between profiler samples
+
+# Frames counted as response serialization: (function name, path fragment)
+SERIALIZATION_FRAMES = (
+    ('serialize_response', 'fastapi'),
+    ('jsonable_encoder', 'fastapi'),
+    ('render', 'starlette'),
+    ('render', 'app/api/responses'),
+    ('rows_to_dicts', 'app/api/responses'),
+)
+
+_request_stats: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    'profiling_request_stats', default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    if stats is not None:
+        context._profiling_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    started = getattr(context, '_profiling_started', None)
+    if stats is not None and started is not None:
+        stats['sql'] += time.perf_counter() - started
+        stats['queries'] += 1
+
+
+def instrument_engines(engines: List[Engine]):
+    """Time SQL statements executed on behalf of profiled requests."""
+    for bind in engines:
+        if not event.contains(bind, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(bind, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(bind, 'after_cursor_execute', _after_cursor_execute)
+
+
+def serialization_seconds(frame) -> float:
+    """Time spent in response serialization frames under `frame`."""
+    if frame is None:
+        return 0.0
+    path = (frame.file_path or '').replace(os.sep, '/')
+    if any(frame.function == name and part in path for name, part in SERIALIZATION_FRAMES):
+        return frame.time
+    return sum(serialization_seconds(child) for child in frame.children)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling selected requests.
+    
+    Usage:
+        app.add_middleware(ProfilingMiddleware, token="secret", sample_every=1000)
+    """
+    
+    def __init__(
+        self,
+        app,
+        token: str = "",
+        sample_every: int = 0,
+        output_dir: str = DEFAULT_PROFILE_DIR,
+        max_profiles: int = 50
+    ):
+        """
+        Args:
+            app: ASGI app
+            token: Profile requests sending this X-Profile value ('' = never)
+            sample_every: Profile one request in N (0 = never)
+            output_dir: Where profiles are written
+            max_profiles: Profiles to keep; older ones are deleted
+        """
+        if Profiler is None:
+            raise RuntimeError("Request profiling needs pyinstrument (pip install pyinstrument)")
+        self.app = app
+        self.token = token
+        self.sample_every = sample_every
+        self.output_dir = output_dir
+        self.max_profiles = max_profiles
+        self._counter = itertools.count(1)
+    
+    def _should_profile(self, scope) -> bool:
+        if self.token:
+            for name, value in scope.get('headers', ()):
+                if name == PROFILE_HEADER.encode() and hmac.compare_digest(value, self.token.encode()):
+                    return True
+        return bool(self.sample_every) and next(self._counter) % self.sample_every == 0
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        stats = {'sql': 0.0, 'queries': 0}
+        stats_token = _request_stats.set(stats)
+        profiler = Profiler(interval=SAMPLE_INTERVAL, async_mode='enabled')
+        started = time.perf_counter()
+        
+        async def send_with_timing(message):
+            if message['type'] == 'http.response.start':
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                headers = list(message.get('headers', []))
+                headers.append((b'x-profile-id', profile_id.encode()))
+                headers.append((
+                    b'server-timing',
+                    f'sql;dur={stats["sql"] * 1000:.1f};desc="{stats["queries"]} queries", '
+                    f'app;dur={elapsed_ms:.1f}'.encode()
+                ))
+                message = {**message, 'headers': headers}
+            await send(message)
+        
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            profiler.stop()
+            _request_stats.reset(stats_token)
+            total = time.perf_counter() - started
+            await asyncio.to_thread(self._save, profile_id, scope, profiler.last_session, stats, total)
+    
+    def _save(self, profile_id: str, scope, session, stats: Dict[str, float], total: float):
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            slug = re.sub(r'[^A-Za-z0-9]+', '_', scope.get('path', '')).strip('_') or 'root'
+            base = os.path.join(self.output_dir, f"{profile_id}-{scope.get('method', '')}-{slug}"[:200])
+            
+            serialization = serialization_seconds(session.root_frame()) if session else 0.0
+            summary = {
+                'method': scope.get('method'),
+                'path': scope.get('path'),
+                'query': scope.get('query_string', b'').decode('latin-1'),
+                'total_ms': round(total * 1000, 2),
+                'sql_ms': round(stats['sql'] * 1000, 2),
+                'sql_queries': stats['queries'],
+                'serialization_ms': round(serialization * 1000, 2),
+                'python_ms': round(max(total - stats['sql'] - serialization, 0.0) * 1000, 2),
+            }
+            
+            with open(base + '.summary.json', 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=2)
+            if session is not None:
+                with open(base + '.speedscope.json', 'w', encoding='utf-8') as f:
+                    f.write(SpeedscopeRenderer().render(session))
+            
+            self._prune()
+        except OSError as e:
+            print(f"Could not write profile {profile_id}: {e}")
+    
+    def _prune(self):
+        """Keep only the newest max_profiles profiles."""
+        summaries = sorted(
+            (name for name in os.listdir(self.output_dir) if name.endswith('.summary.json')),
+            reverse=True
+        )
+        for name in summaries[self.max_profiles:]:
+            base = name[:-len('.summary.json')]
+            for suffix in ('.summary.json', '.speedscope.json'):
+                try:
+                    os.remove(os.path.join(self.output_dir, base + suffix))
+                except FileNotFoundError:
+                    pass
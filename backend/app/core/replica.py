@@ -0,0 +1,163 @@
+"""
+Read-replica routing for analytics reads.
+
+With DATABASE_READ_URL set, analytics routes read from the replica
+unless:
+- it is more than REPLICA_MAX_LAG_SECONDS behind the primary, or
+- this process has just written data (an ingestion job) that the replica
+  has not replayed yet (read-your-writes)
+
+in which case they read from the primary. Replica state is checked at most
+once per CHECK_INTERVAL seconds, so routing costs no query per request; a
+check that takes longer than CHECK_TIMEOUT seconds (a hung replica) counts
+as the replica being down.
+
+On PostgreSQL standbys the position is exact: the write is identified by
+the primary's WAL LSN and is visible once the replica's replay LSN passes
+it. Replicas that report no LSN (other databases, or a plain copy used in
+tests) are assumed caught up REPLICA_MAX_LAG_SECONDS after the write.
+
+Writes are tracked per process; other workers only see them through the
+lag threshold.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+
+logger = logging.getLogger(__name__)
+
+CHECK_INTERVAL = 1.0
+CHECK_TIMEOUT = 2.0
+
+# Seconds behind the primary; 0 when everything received has been replayed
+# (replay timestamps stop moving while the primary is idle)
+_LAG_STMT = text(
+    "SELECT pg_last_wal_replay_lsn()::text, "
+    "CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+_WRITE_LSN_STMT = text("SELECT pg_current_wal_lsn()::text")
+
+
+def parse_lsn(lsn: Optional[str]) -> Optional[int]:
+    """PostgreSQL LSN ('16/B374D848') as an integer, for comparison."""
+    if not lsn:
+        return None
+    high, low = lsn.split('/')
+    return (int(high, 16) << 32) + int(low, 16)
+
+
+class ReplicaRouter:
+    """Decides whether a read may go to the replica."""
+    
+    def __init__(
+        self,
+        max_lag: float,
+        check_interval: float = CHECK_INTERVAL,
+        check_timeout: float = CHECK_TIMEOUT
+    ):
+        """
+        Args:
+            max_lag: Seconds of replication lag tolerated (REPLICA_MAX_LAG_SECONDS)
+            check_interval: Seconds between replica state checks
+            check_timeout: Seconds a state check may take before the replica counts as down
+        """
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self._checked_at = float('-inf')
+        self._healthy = False
+        self._lag: Optional[float] = None
+        self._replay_lsn: Optional[int] = None
+        # Last write of this process: (primary LSN, monotonic deadline)
+        self._pending: Optional[Tuple[Optional[int], float]] = None
+    
+    def note_write(self, lsn: Optional[str] = None):
+        """
+        Keep reads on the primary until the replica has this write.
+        
+        Args:
+            lsn: Primary WAL LSN after the write (None = wait out max_lag)
+        """
+        self._pending = (parse_lsn(lsn), time.monotonic() + self.max_lag)
+    
+    def _caught_up(self, now: float) -> bool:
+        if self._pending is None:
+            return True
+        lsn, deadline = self._pending
+        if lsn is not None and self._replay_lsn is not None:
+            done = self._replay_lsn >= lsn
+        else:
+            done = now >= deadline
+        if done:
+            self._pending = None
+        return done
+    
+    async def _check(self, read_engine: AsyncEngine):
+        async with read_engine.connect() as conn:
+            if read_engine.dialect.name == 'postgresql':
+                lsn, lag = (await conn.execute(_LAG_STMT)).one()
+                self._replay_lsn, self._lag = parse_lsn(lsn), float(lag or 0)
+            else:
+                await conn.execute(text("SELECT 1"))
+                self._replay_lsn, self._lag = None, 0.0
+    
+    async def _refresh(self, read_engine: AsyncEngine, now: float):
+        self._checked_at = now
+        try:
+            await asyncio.wait_for(self._check(read_engine), timeout=self.check_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Read replica check took over %gs, reading from the primary", self.check_timeout
+            )
+            self._healthy = False
+            return
+        except Exception as e:
+            logger.warning("Read replica unavailable, reading from the primary: %s", e)
+            self._healthy = False
+            return
+        self._healthy = self._lag <= self.max_lag
+    
+    async def use_replica(self, read_engine: AsyncEngine) -> bool:
+        """
+        Whether the next read should go to the replica.
+        
+        Args:
+            read_engine: Async engine of the replica
+        
+        Returns:
+            False when the replica is down, lagging, or missing this process's last write
+        """
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            await self._refresh(read_engine, now)
+        return self._healthy and self._caught_up(now)
+    
+    def status(self) -> dict:
+        """Last observed replica state (for health checks)."""
+        return {
+            'healthy': self._healthy,
+            'lag_seconds': self._lag,
+            'waiting_for_write': self._pending is not None,
+        }
+
+
+def record_write(db: Session, router: ReplicaRouter):
+    """
+    Note a committed write (e.g. the end of an ingestion job) on the router.
+    
+    Args:
+        db: Session on the primary that made the write
+        router: Router of this process
+    """
+    lsn = None
+    if db.get_bind().dialect.name == 'postgresql':
+        lsn = db.execute(_WRITE_LSN_STMT).scalar()
+    router.note_write(lsn)
@@ -2,10 +2,28 @@
 FastAPI application entry point.
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import ingestion, analytics
-from app.core.config import get_settings
+from app.api import ingestion, analytics, feed
+from app.analytics.feed import start_listener
+from app.core.broadcast import get_broadcaster
+from app.core.config import get_settings, engine, async_engine, read_engine, read_async_engine, replica_router
+from app.core.pools import pool_metrics
+from app.core.profiling import ProfilingMiddleware, instrument_engines, DEFAULT_PROFILE_DIR
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the mention feed listener for this worker."""
+    broadcaster = get_broadcaster()
+    broadcaster.bind(asyncio.get_running_loop())
+    listener = start_listener(broadcaster)
+    yield
+    if listener is not None:
+        listener.cancel()
 
 
 # Create FastAPI app
@@ -14,7 +32,8 @@ app = FastAPI(
     description="Brand mention tracking and analytics backend",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend integration
@@ -26,9 +45,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in request profiling; not installed at all when disabled
+settings = get_settings()
+if settings.profiling_token or settings.profiling_sample_every:
+    engines = [engine, async_engine.sync_engine]
+    if settings.database_read_url:
+        engines += [read_engine, read_async_engine.sync_engine]
+    instrument_engines(engines)
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=settings.profiling_token,
+        sample_every=settings.profiling_sample_every,
+        output_dir=settings.profiling_dir or DEFAULT_PROFILE_DIR,
+        max_profiles=settings.profiling_max_profiles
+    )
+
 # Include routers
 app.include_router(ingestion.router)
 app.include_router(analytics.router)
+app.include_router(feed.router)
 
 
 @app.get("/")
@@ -44,7 +79,16 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring."""
-    return {"status": "healthy"}
+    health = {"status": "healthy"}
+    if settings.database_read_url:
+        health["read_replica"] = replica_router.status()
+    return health
+
+
+@app.get("/health/pools")
+async def pool_health():
+    """Connection pool usage and checkout timings of this worker (see app.core.pools)."""
+    return {"role": settings.process_role, "pools": pool_metrics()}
 
 
 if __name__ == "__main__":
@@ -6,11 +6,14 @@ Models:
 - Category: Brand categories (e.g., Fashion, Beauty)
 - Platform: Data sources (Reddit, YouTube, News, Google)
 - Mention: Individual brand mentions from various platforms
+- MentionBody: Mention text and URL, kept out of the narrow mentions rows
 - AggregatedMetrics: Pre-computed analytics for performance
+- MentionDailyCount / MentionCounter: Counters maintained at ingestion
+- DataVersion: Change counters behind the analytics ETags
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Text, Index, UniqueConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, Date, DateTime, Float, ForeignKey, Text, Index, UniqueConstraint, event, inspect
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -71,10 +74,10 @@ class Mention(Base):
     id = Column(Integer, primary_key=True, index=True)
     brand_id = Column(Integer, ForeignKey("brands.id"), nullable=False, index=True)
     platform_id = Column(Integer, ForeignKey("platforms.id"), nullable=False, index=True)
+    # Copy of brand.category_id so category aggregates skip the brands join
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
     
-    # Content
-    text = Column(Text, nullable=False)
-    url = Column(Text, nullable=True)
+    # Content (text and url live in MentionBody)
     source_id = Column(String(200), nullable=True)  # Platform-specific ID
     
     # Metadata
@@ -89,20 +92,57 @@ class Mention(Base):
     content_hash = Column(String(64), nullable=True, index=True)  # SHA-256
     
     # Timestamps
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    collected_at = Column(DateTime, default=datetime.utcnow, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     brand = relationship("Brand", back_populates="mentions")
     platform = relationship("Platform", back_populates="mentions")
+    body = relationship(
+        "MentionBody",
+        primaryjoin="Mention.id == foreign(MentionBody.mention_id)",
+        uselist=False,
+        cascade="all, delete-orphan"
+    )
 
     # Indexes for common queries
     __table_args__ = (
         Index('ix_mentions_brand_platform_date', 'brand_id', 'platform_id', 'timestamp'),
-        UniqueConstraint('platform_id', 'source_id', name='uq_platform_source'),
+        # Keyset pagination over a brand's mentions, newest first
+        Index('ix_mentions_brand_timestamp_id', 'brand_id', 'timestamp', 'id'),
+        # Category totals as one range scan
+        Index('ix_mentions_category_timestamp', 'category_id', 'timestamp'),
+        # One item (video, article, post) can mention several brands
+        UniqueConstraint('brand_id', 'platform_id', 'source_id', name='uq_brand_platform_source'),
     )
 
 
+class MentionBody(Base):
+    """
+    Text and URL of a mention.
+    Kept apart so analytics scans read only the narrow mentions rows;
+    listing, export and search join it back in.
+    """
+    __tablename__ = "mention_bodies"
+
+    # mentions.id (no foreign key: a partitioned mentions table has no unique id)
+    mention_id = Column(Integer, primary_key=True, autoincrement=False)
+    text = Column(Text, nullable=False)
+    url = Column(Text, nullable=True)
+
+
+@event.listens_for(Brand, 'after_update')
+def _move_brand_mentions(mapper, connection, target):
+    """Carry a brand's category change over to its mentions (same transaction)."""
+    if inspect(target).attrs.category_id.history.has_changes():
+        mentions = Mention.__table__
+        connection.execute(
+            mentions.update()
+            .where(mentions.c.brand_id == target.id)
+            .values(category_id=target.category_id)
+        )
+
+
 class AggregatedMetrics(Base):
     """
     Pre-computed analytics for performance.
@@ -144,3 +184,42 @@ class AggregatedMetrics(Base):
     __table_args__ = (
         Index('ix_metrics_brand_period', 'brand_id', 'period_start', 'period_end'),
     )
+
+
+class MentionDailyCount(Base):
+    """
+    Mentions per day, brand and platform (day of Mention.timestamp).
+    Incremented in the same transaction that inserts the mentions.
+    """
+    __tablename__ = "mention_daily_counts"
+
+    day = Column(Date, primary_key=True)
+    brand_id = Column(Integer, ForeignKey("brands.id"), primary_key=True)
+    platform_id = Column(Integer, ForeignKey("platforms.id"), primary_key=True)
+    mention_count = Column(Integer, nullable=False, default=0)
+
+    # Indexes for per-brand and per-platform window sums
+    __table_args__ = (
+        Index('ix_daily_counts_day_brand', 'day', 'brand_id'),
+        Index('ix_daily_counts_day_platform', 'day', 'platform_id'),
+    )
+
+
+class MentionCounter(Base):
+    """Named global counters (e.g. total mentions), maintained at ingestion."""
+    __tablename__ = "mention_counters"
+
+    name = Column(String(50), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+
+
+class DataVersion(Base):
+    """
+    Monotonic change counter per data scope ('brand:<id>', 'category:<id>',
+    'catalog', 'global'). Bumped in the transaction that changes the data;
+    analytics responses derive their ETags from it.
+    """
+    __tablename__ = "data_versions"
+
+    scope = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
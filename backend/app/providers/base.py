@@ -13,6 +13,10 @@ class BaseProvider(ABC):
     This ensures we can swap providers easily and maintain clean separation.
     """
     
+    # Providers that accept a `since` watermark in fetch_mentions() and stop
+    # fetching once they reach content older than it
+    supports_watermark = False
+    
     def __init__(self, api_key: str = None, **kwargs):
         """
         Initialize provider with API credentials.
@@ -1,27 +1,87 @@
 """News/Blog provider using NewsAPI."""
 
+import re
 from newsapi import NewsApiClient
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Hashable
 from .base import BaseProvider
 
 
+# NewsAPI rejects `q` values longer than 500 characters
+MAX_QUERY_LENGTH = 500
+
+# Max articles per page
+PAGE_SIZE = 100
+
+
+def _quote(keyword: str) -> str:
+    """Quote a keyword as an exact phrase for the NewsAPI query syntax."""
+    return '"' + keyword.replace('"', '') + '"'
+
+
+def keyword_pattern(keyword: str) -> re.Pattern:
+    """
+    Case-insensitive whole-word pattern for a brand keyword.
+    
+    Uses lookarounds instead of \\b so keywords that start or end with a
+    non-word character ("C++", "Dr.") still match.
+    """
+    return re.compile(r'(?<!\w)' + re.escape(keyword.strip()) + r'(?!\w)', re.IGNORECASE)
+
+
+def pack_queries(keywords: Dict[Hashable, str], max_length: int = MAX_QUERY_LENGTH) -> List[List[Hashable]]:
+    """
+    Greedily pack keywords into OR queries that fit the query-length limit.
+    
+    Args:
+        keywords: Mapping of caller key to the keyword searched for it
+        max_length: Maximum query length in characters
+    
+    Returns:
+        Groups of caller keys; each group becomes one query
+    """
+    groups: List[List[Hashable]] = []
+    current: List[Hashable] = []
+    length = 0
+    
+    for key, keyword in keywords.items():
+        term_length = len(_quote(keyword))
+        added = term_length if not current else term_length + len(' OR ')
+        if current and length + added > max_length:
+            groups.append(current)
+            current, length = [], 0
+            added = term_length
+        current.append(key)
+        length += added
+    
+    if current:
+        groups.append(current)
+    return groups
+
+
 class NewsProvider(BaseProvider):
     """
     Fetch brand mentions from news articles and blogs.
     
     Uses NewsAPI to aggregate content from thousands of sources.
+    
+    fetch_mentions_batch packs many brands' keywords into one boolean OR
+    query (up to the 500-character limit), pages through the results and
+    attributes each article to every brand whose keywords it contains, so
+    request count drops by roughly the packing factor.
     """
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_pages: int = 5):
         """
         Initialize NewsAPI client.
         
         Args:
             api_key: NewsAPI key (https://newsapi.org)
+            max_pages: Upper bound on result pages per packed query
         """
         super().__init__(api_key=api_key)
         self.client = NewsApiClient(api_key=api_key)
+        self.max_pages = max_pages
     
     def fetch_mentions(
         self,
@@ -35,48 +95,115 @@ class NewsProvider(BaseProvider):
         
         Searches titles and descriptions from global news sources.
         """
-        mentions = []
+        results = self.fetch_mentions_batch({keyword: [keyword]}, start_date, end_date, limit)
+        return results.get(keyword, [])
+    
+    def fetch_mentions_batch(
+        self,
+        keywords: Dict[Hashable, List[str]],
+        start_date: datetime,
+        end_date: datetime,
+        limit: int = 100
+    ) -> Dict[Hashable, List[Dict[str, Any]]]:
+        """
+        Search news for many brands with packed OR queries.
         
-        try:
-            # NewsAPI requires date strings in YYYY-MM-DD format
-            from_date = start_date.strftime('%Y-%m-%d')
-            to_date = end_date.strftime('%Y-%m-%d')
-            
-            # Fetch articles
-            response = self.client.get_everything(
-                q=keyword,
-                from_param=from_date,
-                to=to_date,
-                language='en',
-                sort_by='relevancy',
-                page_size=min(limit, 100)  # API limit
-            )
+        Args:
+            keywords: Mapping of caller key (e.g. brand ID) to its keywords;
+                the first (primary) keyword goes into the query, all of them
+                are used for attribution
+            start_date: Start of date range
+            end_date: End of date range
+            limit: Maximum articles per caller key
+        
+        Returns:
+            Mapping of caller key to normalized mentions
+        """
+        results: Dict[Hashable, List[Dict[str, Any]]] = {key: [] for key in keywords}
+        patterns = {
+            key: [keyword_pattern(k) for k in kws if k.strip()]
+            for key, kws in keywords.items()
+        }
+        
+        # NewsAPI requires date strings in YYYY-MM-DD format
+        from_date = start_date.strftime('%Y-%m-%d')
+        to_date = end_date.strftime('%Y-%m-%d')
+        
+        primary = {key: kws[0].strip() for key, kws in keywords.items() if kws}
+        seen_urls = set()
+        requests_made = 0
+        
+        for group in pack_queries(primary):
+            query = ' OR '.join(_quote(primary[key]) for key in group)
             
-            for article in response.get('articles', []):
-                # Skip articles without publication dates
-                if not article.get('publishedAt'):
-                    continue
+            for page in range(1, self.max_pages + 1):
+                try:
+                    # Fetch articles
+                    requests_made += 1
+                    response = self.client.get_everything(
+                        q=query,
+                        from_param=from_date,
+                        to=to_date,
+                        language='en',
+                        sort_by='relevancy',
+                        page_size=PAGE_SIZE,  # API limit
+                        page=page
+                    )
+                except Exception as e:
+                    # Includes the plan's maximumResultsReached limit
+                    print(f"NewsAPI error: {e}")
+                    break
                 
-                mention = {
-                    'text': f"{article.get('title', '')}\n{article.get('description', '')}",
-                    'url': article.get('url'),
-                    'source_id': article.get('url', '').split('/')[-1][:200],  # Use URL slug
-                    'author': article.get('author'),
-                    'timestamp': datetime.fromisoformat(article['publishedAt'].replace('Z', '+00:00')),
-                    'raw_engagement': 0,  # NewsAPI doesn't provide engagement metrics
-                    'platform_name': 'News',
-                    '_metadata': {
-                        'source': article.get('source', {}).get('name'),
-                        'content_snippet': article.get('content', '')[:200]
-                    }
-                }
+                articles = response.get('articles', [])
+                for article in articles:
+                    # Skip articles without publication dates
+                    if not article.get('publishedAt') or article.get('url') in seen_urls:
+                        continue
+                    
+                    haystack = ' '.join(
+                        article.get(field) or '' for field in ('title', 'description', 'content')
+                    )
+                    matched = [
+                        key for key, key_patterns in patterns.items()
+                        if len(results[key]) < limit and any(p.search(haystack) for p in key_patterns)
+                    ]
+                    if not matched and len(group) == 1 and len(results[group[0]]) < limit:
+                        # NewsAPI also matches the full article body, which
+                        # we don't get; with a single brand the match is certain
+                        matched = group
+                    if not matched:
+                        # Not seen: a later single-brand query may still attribute it
+                        continue
+                    seen_urls.add(article.get('url'))
+                    
+                    mention = self._to_mention(article)
+                    for key in matched:
+                        results[key].append(mention)
                 
-                mentions.append(mention)
-                
-        except Exception as e:
-            print(f"NewsAPI error: {e}")
+                total = response.get('totalResults', 0)
+                if not articles or page * PAGE_SIZE >= total:
+                    break
+                if all(len(results[key]) >= limit for key in group):
+                    break
         
-        return mentions
+        print(f"NewsAPI: {requests_made} requests for {len(primary)} brands")
+        return results
+    
+    @staticmethod
+    def _to_mention(article: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'text': f"{article.get('title', '')}\n{article.get('description', '')}",
+            'url': article.get('url'),
+            'source_id': article.get('url', '').split('/')[-1][:200],  # Use URL slug
+            'author': article.get('author'),
+            'timestamp': datetime.fromisoformat(article['publishedAt'].replace('Z', '+00:00')),
+            'raw_engagement': 0,  # NewsAPI doesn't provide engagement metrics
+            'platform_name': 'News',
+            '_metadata': {
+                'source': (article.get('source') or {}).get('name'),
+                'content_snippet': (article.get('content') or '')[:200]
+            }
+        }
     
     def normalize_engagement(self, raw_data: Dict[str, Any]) -> float:
         """
@@ -5,11 +5,11 @@ Scrapes various news sites. More acceptable than social media scraping.
 Always check robots.txt and respect site policies.
 """
 
-from bs4 import BeautifulSoup
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .base import BaseProvider
 from .scraper_utils import ScraperUtils, check_robots_txt
+from .html_parsing import parse_page, resolve_backend
 import re
 
 
@@ -21,10 +21,16 @@ class NewsScraperProvider(BaseProvider):
     but still check each site's robots.txt and ToS.
     """
     
-    def __init__(self):
-        """Initialize news scraper."""
+    def __init__(self, parser: Optional[str] = None):
+        """
+        Initialize news scraper.
+        
+        Args:
+            parser: HTML parser backend (None = fastest installed)
+        """
         super().__init__()
         self.utils = ScraperUtils(delay_range=(2, 4))
+        self.parser = resolve_backend(parser)
         
         # Common news sites to scrape (check robots.txt first!)
         self.news_sources = [
@@ -54,23 +60,15 @@ class NewsScraperProvider(BaseProvider):
             try:
                 url = source_template.format(keyword=keyword)
                 html = self.utils.fetch_with_retry(url)
-                soup = BeautifulSoup(html, 'html.parser')
                 
                 # Parse Google News results
-                articles = soup.find_all('div', class_='g', limit=10)
+                articles = parse_page('news', html, limit=10, backend=self.parser)
                 
                 for article in articles:
                     try:
-                        title_elem = article.find('h3')
-                        link_elem = article.find('a')
-                        snippet_elem = article.find('div', class_='VwiC3b')
-                        
-                        if not title_elem or not link_elem:
-                            continue
-                        
-                        title = title_elem.get_text(strip=True)
-                        url = link_elem.get('href', '')
-                        snippet = snippet_elem.get_text(strip=True) if snippet_elem else ''
+                        title = article['title']
+                        url = article['href']
+                        snippet = article['snippet']
                         
                         mention = {
                             'text': f"{title}\n{snippet}",
@@ -86,11 +84,11 @@ class NewsScraperProvider(BaseProvider):
                         }
                         
                         mentions.append(mention)
-                        
+                    
                     except Exception as e:
                         print(f"Error parsing news article: {e}")
                         continue
-                        
+            
             except Exception as e:
                 print(f"Error scraping news source: {e}")
                 continue
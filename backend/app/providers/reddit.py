@@ -2,8 +2,9 @@
 
 import praw
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .base import BaseProvider
+from .reddit_common import time_filter_for, fetch_cutoff
 
 
 class RedditProvider(BaseProvider):
@@ -12,9 +13,16 @@ class RedditProvider(BaseProvider):
     
     Uses official Reddit API via PRAW library.
     Searches posts and top-level comments for keyword mentions.
+    
+    The default 'new' sort walks the listing newest first and stops at the
+    first post older than the date range (or the stored watermark), so no
+    page is fetched only to be thrown away. 'relevance' keeps the old
+    behaviour of filtering a relevance-ranked listing.
     """
     
-    def __init__(self, client_id: str, client_secret: str, user_agent: str):
+    supports_watermark = True
+    
+    def __init__(self, client_id: str, client_secret: str, user_agent: str, sort: str = 'new'):
         """
         Initialize Reddit API client.
         
@@ -22,8 +30,10 @@ class RedditProvider(BaseProvider):
             client_id: Reddit app client ID
             client_secret: Reddit app secret
             user_agent: User agent string
+            sort: Search order, 'new' (time-ordered, early-terminating) or 'relevance'
         """
         super().__init__()
+        self.sort = sort
         self.reddit = praw.Reddit(
             client_id=client_id,
             client_secret=client_secret,
@@ -35,24 +45,43 @@ class RedditProvider(BaseProvider):
         keyword: str,
         start_date: datetime,
         end_date: datetime,
-        limit: int = 100
+        limit: int = 100,
+        since: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
         """
         Search Reddit for keyword mentions.
         
-        Searches across all subreddits, sorted by relevance.
-        Filters results by date range.
+        Searches across all subreddits and filters results by date range.
+        
+        Args:
+            since: Newest timestamp already stored for this brand; with
+                sort='new' the search stops once it reaches it
         """
         mentions = []
+        cutoff = fetch_cutoff(start_date, since)
         
         try:
+            if self.sort == 'new':
+                # PRAW pages lazily, so breaking out stops further requests
+                listing = self.reddit.subreddit("all").search(
+                    keyword,
+                    sort="new",
+                    time_filter=time_filter_for(cutoff),
+                    limit=None
+                )
+            else:
+                listing = self.reddit.subreddit("all").search(
+                    keyword,
+                    limit=limit,
+                    sort=self.sort
+                )
+            
             # Search submissions (posts)
-            for submission in self.reddit.subreddit("all").search(
-                keyword,
-                limit=limit,
-                sort="relevance"
-            ):
-                created_time = datetime.fromtimestamp(submission.created_utc)
+            for submission in listing:
+                created_time = datetime.utcfromtimestamp(submission.created_utc)
+                
+                if self.sort == 'new' and created_time < cutoff:
+                    break
                 
                 # Filter by date range
                 if not (start_date <= created_time <= end_date):
@@ -74,7 +103,9 @@ class RedditProvider(BaseProvider):
                 }
                 
                 mentions.append(mention)
-                
+                if len(mentions) >= limit:
+                    break
+        
         except Exception as e:
             print(f"Reddit API error: {e}")
             # Log error but don't crash
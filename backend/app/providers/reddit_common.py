@@ -0,0 +1,37 @@
+"""Helpers shared by the Reddit API and scraper providers."""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+# Reddit search time windows, smallest first
+TIME_FILTERS = [
+    ('hour', timedelta(hours=1)),
+    ('day', timedelta(days=1)),
+    ('week', timedelta(weeks=1)),
+    ('month', timedelta(days=31)),
+    ('year', timedelta(days=366)),
+]
+
+
+def time_filter_for(cutoff: datetime, now: Optional[datetime] = None) -> str:
+    """
+    Smallest Reddit time_filter that still covers everything after cutoff.
+    
+    Args:
+        cutoff: Oldest post we want (naive UTC)
+        now: Current time (naive UTC), defaults to utcnow
+    
+    Returns:
+        One of hour, day, week, month, year, all
+    """
+    age = (now or datetime.utcnow()) - cutoff
+    for name, window in TIME_FILTERS:
+        if age <= window:
+            return name
+    return 'all'
+
+
+def fetch_cutoff(start_date: datetime, since: Optional[datetime]) -> datetime:
+    """Oldest timestamp worth fetching: start_date or the stored watermark, whichever is later."""
+    return max(start_date, since) if since else start_date
@@ -6,11 +6,13 @@ Use the official PRAW API instead (reddit.py).
 This is for educational purposes only.
 """
 
-from bs4 import BeautifulSoup
-from datetime import datetime
-from typing import List, Dict, Any
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlencode
 from .base import BaseProvider
 from .scraper_utils import ScraperUtils
+from .html_parsing import parse_page, reddit_next_page, resolve_backend
+from .reddit_common import time_filter_for, fetch_cutoff
 import re
 
 
@@ -19,100 +21,133 @@ class RedditScraperProvider(BaseProvider):
     Scrape Reddit without using the API.
     
     ⚠️ DISCLAIMER: This violates Reddit ToS. Use at your own risk.
+    
+    With sort='new' (default) the search listing is read newest first and
+    paging stops at the first post older than the date range or watermark.
     """
     
-    def __init__(self):
-        """Initialize Reddit scraper."""
+    supports_watermark = True
+    
+    def __init__(self, parser: Optional[str] = None, sort: str = 'new', max_pages: int = 10):
+        """
+        Initialize Reddit scraper.
+        
+        Args:
+            parser: HTML parser backend (None = fastest installed)
+            sort: Search order, 'new' (time-ordered, early-terminating) or 'relevance'
+            max_pages: Upper bound on listing pages per search
+        """
         super().__init__()
+        self.sort = sort
+        self.max_pages = max_pages
         self.utils = ScraperUtils(delay_range=(3, 6))  # Longer delays for Reddit
         self.base_url = "https://old.reddit.com"  # Easier to scrape
+        self.parser = resolve_backend(parser)
     
     def fetch_mentions(
         self,
         keyword: str,
         start_date: datetime,
         end_date: datetime,
-        limit: int = 100
+        limit: int = 100,
+        since: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
         """
         Scrape Reddit search results for keyword.
         
         Note: Date filtering is approximate since we're scraping.
+        
+        Args:
+            since: Newest timestamp already stored for this brand; with
+                sort='new' paging stops once it is reached
         """
         mentions = []
+        cutoff = fetch_cutoff(start_date, since)
         
         try:
             # Build search URL
-            search_url = f"{self.base_url}/search?q={keyword}&sort=relevance"
+            params = {'q': keyword, 'sort': self.sort}
+            if self.sort == 'new':
+                params['t'] = time_filter_for(cutoff)
+            search_url = f"{self.base_url}/search?{urlencode(params)}"
             
-            # Fetch search results page
-            html = self.utils.fetch_with_retry(search_url)
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Find post containers
-            posts = soup.find_all('div', class_='thing', limit=limit)
-            
-            for post in posts:
-                try:
-                    # Extract post data
-                    title_elem = post.find('a', class_='title')
-                    if not title_elem:
+            pages = 0
+            done = False
+            while search_url and not done and pages < self.max_pages:
+                # Fetch search results page
+                html = self.utils.fetch_with_retry(search_url)
+                pages += 1
+                posts = parse_page('reddit', html, limit=limit, backend=self.parser)
+                
+                for post in posts:
+                    mention = self._to_mention(post)
+                    if mention is None:
                         continue
                     
-                    title = title_elem.get_text(strip=True)
-                    url = title_elem.get('href', '')
-                    if not url.startswith('http'):
-                        url = f"https://old.reddit.com{url}"
-                    
-                    # Extract metadata
-                    subreddit = post.get('data-subreddit', 'unknown')
-                    author = post.get('data-author', 'unknown')
-                    score = post.get('data-score', '0')
-                    
-                    # Get timestamp (approximate)
-                    time_elem = post.find('time')
-                    if time_elem and time_elem.get('datetime'):
-                        timestamp = datetime.fromisoformat(time_elem['datetime'].replace('Z', '+00:00'))
-                    else:
-                        timestamp = datetime.utcnow()
+                    if self.sort == 'new' and mention['timestamp'] < cutoff:
+                        done = True
+                        break
                     
                     # Filter by date range
-                    if not (start_date <= timestamp <= end_date):
+                    if not (start_date <= mention['timestamp'] <= end_date):
                         continue
                     
-                    # Get comment count
-                    comments_elem = post.find('a', class_='comments')
-                    comments_text = comments_elem.get_text() if comments_elem else '0'
-                    num_comments = int(re.search(r'\d+', comments_text).group()) if re.search(r'\d+', comments_text) else 0
-                    
-                    mention = {
-                        'text': title,
-                        'url': url,
-                        'source_id': post.get('data-fullname', url),
-                        'author': author,
-                        'timestamp': timestamp,
-                        'raw_engagement': int(score) + num_comments,
-                        'platform_name': 'Reddit',
-                        '_metadata': {
-                            'subreddit': subreddit,
-                            'upvotes': int(score),
-                            'comments': num_comments
-                        }
-                    }
-                    
                     mentions.append(mention)
-                    
-                except Exception as e:
-                    print(f"Error parsing Reddit post: {e}")
-                    continue
-                    
+                    if len(mentions) >= limit:
+                        done = True
+                        break
+                
+                # Relevance order has no useful stopping point; keep one page
+                search_url = reddit_next_page(html, backend=self.parser) if self.sort == 'new' else None
+        
         except Exception as e:
             print(f"Reddit scraping error: {e}")
-        finally:
-            self.utils.close()
         
         return mentions
     
+    def _to_mention(self, post: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Build a mention from parsed listing fields, or None if unparseable."""
+        try:
+            title = post['title']
+            url = post['href']
+            if not url.startswith('http'):
+                url = f"https://old.reddit.com{url}"
+            
+            # Extract metadata
+            subreddit = post['subreddit'] or 'unknown'
+            author = post['author'] or 'unknown'
+            score = post['score'] or '0'
+            
+            # Get timestamp (approximate), as naive UTC like the date range
+            if post['datetime']:
+                timestamp = datetime.fromisoformat(post['datetime'].replace('Z', '+00:00'))
+                if timestamp.tzinfo is not None:
+                    timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+            else:
+                timestamp = datetime.utcnow()
+            
+            # Get comment count
+            comments_text = post['comments_text'] or '0'
+            num_comments = int(re.search(r'\d+', comments_text).group()) if re.search(r'\d+', comments_text) else 0
+            
+            return {
+                'text': title,
+                'url': url,
+                'source_id': post['fullname'] or url,
+                'author': author,
+                'timestamp': timestamp,
+                'raw_engagement': int(score) + num_comments,
+                'platform_name': 'Reddit',
+                '_metadata': {
+                    'subreddit': subreddit,
+                    'upvotes': int(score),
+                    'comments': num_comments
+                }
+            }
+        except Exception as e:
+            print(f"Error parsing Reddit post: {e}")
+            return None
+    
     def normalize_engagement(self, raw_data: Dict[str, Any]) -> float:
         """Normalize Reddit engagement (same as API version)."""
         upvotes = raw_data.get('_metadata', {}).get('upvotes', 0)
@@ -0,0 +1,229 @@
+"""
+Process-wide robots.txt policy cache.
+
+Each domain's robots.txt is downloaded at most once per TTL, parsed once,
+and persisted to disk so restarts don't refetch it. Lookups are in-memory
+and thread-safe, so compliance checks cost nothing per request after the
+first fetch for a domain.
+
+Fetch outcomes follow RFC 9309:
+- 2xx: parse and obey the rules
+- 4xx: no usable robots.txt, everything allowed
+- 5xx / network error: treat as disallowed, retry after a short TTL
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Any
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+    'marketecho',
+    'robots.json'
+)
+
+DEFAULT_TTL = 24 * 3600  # RFC 9309: don't cache longer than 24 hours
+ERROR_TTL = 15 * 60  # Retry unreachable robots.txt after 15 minutes
+USER_AGENT = '*'
+
+
+class RobotsPolicy:
+    """Parsed robots.txt for one domain."""
+    
+    def __init__(self, domain: str, status: str, body: str, fetched_at: float, expires_at: float):
+        """
+        Args:
+            domain: Website domain
+            status: 'ok', 'allow_all' or 'disallow_all'
+            body: Raw robots.txt content (only used when status is 'ok')
+            fetched_at: Unix time of the download
+            expires_at: Unix time after which the policy must be refetched
+        """
+        self.domain = domain
+        self.status = status
+        self.body = body
+        self.fetched_at = fetched_at
+        self.expires_at = expires_at
+        
+        self._parser = RobotFileParser()
+        self._parser.parse(body.splitlines() if status == 'ok' else [])
+    
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+    
+    def can_fetch(self, path: str = "/", user_agent: str = USER_AGENT) -> bool:
+        """Check whether a path may be fetched."""
+        if self.status == 'allow_all':
+            return True
+        if self.status == 'disallow_all':
+            return False
+        return self._parser.can_fetch(user_agent, f"https://{self.domain}{path}")
+    
+    def crawl_delay(self, user_agent: str = USER_AGENT) -> Optional[float]:
+        """Crawl-delay in seconds for the user agent, if declared."""
+        if self.status != 'ok':
+            return None
+        delay = self._parser.crawl_delay(user_agent)
+        return float(delay) if delay is not None else None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'status': self.status,
+            'body': self.body,
+            'fetched_at': self.fetched_at,
+            'expires_at': self.expires_at,
+        }
+    
+    @classmethod
+    def from_dict(cls, domain: str, data: Dict[str, Any]) -> "RobotsPolicy":
+        return cls(domain, data['status'], data['body'], data['fetched_at'], data['expires_at'])
+
+
+def _max_age(cache_control: Optional[str]) -> Optional[int]:
+    if not cache_control:
+        return None
+    match = re.search(r'max-age=(\d+)', cache_control)
+    return int(match.group(1)) if match else None
+
+
+class RobotsPolicyCache:
+    """
+    Domain-keyed robots.txt cache shared by all scrapers in the process.
+    
+    Usage:
+        cache = get_robots_cache()
+        if cache.can_fetch("techcrunch.com", "/search"):
+            ...
+        delay = cache.crawl_delay("techcrunch.com")
+    """
+    
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, default_ttl: int = DEFAULT_TTL):
+        """
+        Args:
+            path: JSON file to persist policies in (None = memory only)
+            default_ttl: Seconds to keep a policy when the server sends no max-age
+        """
+        self.path = path
+        self.default_ttl = default_ttl
+        self._policies: Dict[str, RobotsPolicy] = {}
+        self._lock = threading.Lock()
+        # One lock per domain so concurrent misses for a domain fetch once
+        self._domain_locks: Dict[str, threading.Lock] = {}
+        self._load()
+    
+    def get(self, domain: str) -> RobotsPolicy:
+        """
+        Get the policy for a domain, fetching robots.txt if missing or expired.
+        
+        Args:
+            domain: Website domain
+        
+        Returns:
+            Cached or freshly fetched policy
+        """
+        domain = domain.lower()
+        policy = self._policies.get(domain)
+        if policy is not None and not policy.expired:
+            return policy
+        
+        with self._lock:
+            domain_lock = self._domain_locks.setdefault(domain, threading.Lock())
+        
+        with domain_lock:
+            # Another thread may have refreshed it while we waited
+            policy = self._policies.get(domain)
+            if policy is not None and not policy.expired:
+                return policy
+            
+            policy = self._fetch(domain)
+            with self._lock:
+                self._policies[domain] = policy
+                self._save()
+            return policy
+    
+    def can_fetch(self, domain: str, path: str = "/") -> bool:
+        """Check whether a path on a domain may be fetched."""
+        return self.get(domain).can_fetch(path)
+    
+    def crawl_delay(self, domain: str) -> Optional[float]:
+        """Declared Crawl-delay for a domain, if any."""
+        return self.get(domain).crawl_delay()
+    
+    def invalidate(self, domain: Optional[str] = None):
+        """Drop one domain's policy, or all of them."""
+        with self._lock:
+            if domain is None:
+                self._policies.clear()
+            else:
+                self._policies.pop(domain.lower(), None)
+            self._save()
+    
+    def _fetch(self, domain: str) -> RobotsPolicy:
+        now = time.time()
+        try:
+            response = httpx.get(f"https://{domain}/robots.txt", timeout=10, follow_redirects=True)
+        except httpx.HTTPError:
+            return RobotsPolicy(domain, 'disallow_all', '', now, now + ERROR_TTL)
+        
+        if response.status_code >= 500:
+            return RobotsPolicy(domain, 'disallow_all', '', now, now + ERROR_TTL)
+        
+        ttl = min(_max_age(response.headers.get('cache-control')) or self.default_ttl, DEFAULT_TTL)
+        if response.status_code >= 400:
+            return RobotsPolicy(domain, 'allow_all', '', now, now + ttl)
+        return RobotsPolicy(domain, 'ok', response.text, now, now + ttl)
+    
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            self._policies = {
+                domain: RobotsPolicy.from_dict(domain, entry)
+                for domain, entry in data.items()
+            }
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring unreadable robots cache {self.path}: {e}")
+    
+    def _save(self):
+        """Write the cache atomically. Caller must hold self._lock."""
+        if not self.path:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            data = {
+                domain: policy.to_dict()
+                for domain, policy in self._policies.items()
+                if not policy.expired
+            }
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not persist robots cache: {e}")
+
+
+_cache: Optional[RobotsPolicyCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_robots_cache() -> RobotsPolicyCache:
+    """Get the process-wide robots policy cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = RobotsPolicyCache(path=os.environ.get('ROBOTS_CACHE_PATH', DEFAULT_CACHE_PATH))
+    return _cache
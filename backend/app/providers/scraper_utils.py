@@ -4,10 +4,46 @@ Utilities for web scraping with anti-detection and rate limiting.
 
 import time
 import random
+import threading
 from typing import Optional, Dict
+from urllib.parse import urlparse
 from fake_useragent import UserAgent
 from tenacity import retry, stop_after_attempt, wait_exponential
 import httpx
+from .robots import get_robots_cache
+
+
+class DomainRateLimiter:
+    """
+    Process-wide minimum spacing between requests to the same domain.
+    
+    Slots are reserved under a lock and slept outside it, so concurrent
+    scrapers hitting one domain queue up instead of bursting, while
+    requests to different domains never wait on each other.
+    """
+    
+    def __init__(self):
+        self._next_allowed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, domain: str, interval: float):
+        """
+        Block until a request to the domain is allowed.
+        
+        Args:
+            domain: Target domain
+            interval: Minimum seconds between requests to this domain
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(domain, now))
+            self._next_allowed[domain] = slot + interval
+        
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_rate_limiter = DomainRateLimiter()
 
 
 class ScraperUtils:
@@ -18,11 +54,13 @@ class ScraperUtils:
         Initialize scraper utilities.
         
         Args:
-            delay_range: Min and max seconds between requests
+            delay_range: Min and max seconds between requests to a domain.
+                A longer robots.txt Crawl-delay takes precedence.
         """
         self.ua = UserAgent()
         self.delay_range = delay_range
         self.session = httpx.Client(timeout=30)
+        self.robots = get_robots_cache()
     
     def get_headers(self) -> Dict[str, str]:
         """
@@ -50,6 +88,19 @@ class ScraperUtils:
         delay = random.uniform(*self.delay_range)
         time.sleep(delay)
     
+    def wait_for_domain(self, domain: str):
+        """
+        Wait for the domain's rate limit slot.
+        
+        The spacing is a random delay from delay_range, raised to the
+        domain's robots.txt Crawl-delay when that is longer.
+        """
+        interval = random.uniform(*self.delay_range)
+        crawl_delay = self.robots.crawl_delay(domain)
+        if crawl_delay is not None:
+            interval = max(interval, crawl_delay)
+        _rate_limiter.acquire(domain, interval)
+    
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     def fetch_with_retry(self, url: str, headers: Optional[Dict] = None) -> str:
         """
@@ -65,10 +116,11 @@ class ScraperUtils:
         if headers is None:
             headers = self.get_headers()
         
+        self.wait_for_domain(urlparse(url).netloc)
+        
         response = self.session.get(url, headers=headers, follow_redirects=True)
         response.raise_for_status()
         
-        self.random_delay()
         return response.text
     
     def close(self):
@@ -80,6 +132,9 @@ def check_robots_txt(domain: str, path: str = "/") -> bool:
     """
     Check if scraping is allowed by robots.txt.
     
+    Uses the process-wide robots policy cache, so robots.txt is only
+    downloaded once per domain per TTL.
+    
     Args:
         domain: Website domain
         path: Path to check
@@ -87,14 +142,4 @@ def check_robots_txt(domain: str, path: str = "/") -> bool:
     Returns:
         True if allowed, False otherwise
     """
-    try:
-        from urllib.robotparser import RobotFileParser
-        
-        rp = RobotFileParser()
-        rp.set_url(f"https://{domain}/robots.txt")
-        rp.read()
-        
-        return rp.can_fetch("*", f"https://{domain}{path}")
-    except Exception:
-        # If we can't read robots.txt, assume disallowed for safety
-        return False
+    return get_robots_cache().can_fetch(domain, path)
@@ -1,28 +1,137 @@
 """YouTube data provider using YouTube Data API v3."""
 
+import math
+import threading
 from googleapiclient.discovery import build
-from datetime import datetime
-from typing import List, Dict, Any
+from datetime import datetime, date
+from typing import List, Dict, Any, Optional, Set, Hashable
+from zoneinfo import ZoneInfo
 from .base import BaseProvider
 
 
+# Quota units per call (https://developers.google.com/youtube/v3/determine_quota_cost)
+QUOTA_COSTS = {
+    'search.list': 100,
+    'videos.list': 1,
+}
+
+# Max results per search page and max IDs per videos.list call
+PAGE_SIZE = 50
+
+# The daily quota resets at midnight Pacific Time
+QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+
+
+class QuotaExhausted(Exception):
+    """Raised when a call would exceed the remaining daily quota."""
+
+
+class QuotaTracker:
+    """
+    Track YouTube Data API quota units spent today.
+    
+    Thread-safe; resets automatically when the Pacific Time day rolls over.
+    """
+    
+    def __init__(self, daily_quota: int = 10000):
+        """
+        Args:
+            daily_quota: Quota units available per day
+        """
+        self.daily_quota = daily_quota
+        self.used = 0
+        self.calls: Dict[str, int] = {}
+        self._day = self._today()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _today() -> date:
+        return datetime.now(QUOTA_TIMEZONE).date()
+    
+    def _roll_over(self):
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self.used = 0
+            self.calls = {}
+    
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            self._roll_over()
+            return self.daily_quota - self.used
+    
+    def spend(self, method: str, calls: int = 1):
+        """
+        Reserve quota for API calls.
+        
+        Args:
+            method: API method name (key of QUOTA_COSTS)
+            calls: Number of calls
+        
+        Raises:
+            QuotaExhausted: If the remaining quota can't cover the calls
+        """
+        cost = QUOTA_COSTS[method] * calls
+        with self._lock:
+            self._roll_over()
+            if self.used + cost > self.daily_quota:
+                raise QuotaExhausted(
+                    f"{method} needs {cost} units, {self.daily_quota - self.used} left today"
+                )
+            self.used += cost
+            self.calls[method] = self.calls.get(method, 0) + calls
+
+
+# One tracker per API key for the whole process, so units spent by earlier
+# ingestion runs (each builds its own provider) still count today
+_trackers: Dict[str, QuotaTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_quota_tracker(api_key: str, daily_quota: int = 10000) -> QuotaTracker:
+    """
+    Process-wide quota tracker for an API key.
+    
+    Args:
+        api_key: YouTube Data API v3 key
+        daily_quota: Quota units available per day (updates an existing tracker)
+    
+    Returns:
+        The key's QuotaTracker
+    """
+    with _trackers_lock:
+        tracker = _trackers.get(api_key)
+        if tracker is None:
+            tracker = _trackers[api_key] = QuotaTracker(daily_quota)
+        tracker.daily_quota = daily_quota
+        return tracker
+
+
 class YouTubeProvider(BaseProvider):
     """
     Fetch brand mentions from YouTube.
     
     Uses official YouTube Data API v3.
     Searches video titles and descriptions for keywords.
+    
+    Quota: search.list costs 100 units per page, videos.list costs 1 unit
+    per 50 IDs, so searches dominate. fetch_mentions_batch plans the
+    searches for many brands together to cover as many as the daily quota
+    allows and shares the statistics lookups between them.
     """
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, daily_quota: int = 10000):
         """
         Initialize YouTube API client.
         
         Args:
             api_key: YouTube Data API v3 key
+            daily_quota: Quota units available per day
         """
         super().__init__(api_key=api_key)
         self.youtube = build('youtube', 'v3', developerKey=api_key)
+        self.quota = get_quota_tracker(api_key, daily_quota)
     
     def fetch_mentions(
         self,
@@ -36,61 +145,140 @@ class YouTubeProvider(BaseProvider):
         
         Filters by date range and relevance.
         """
-        mentions = []
+        results = self.fetch_mentions_batch({keyword: [keyword]}, start_date, end_date, limit)
+        return results.get(keyword, [])
+    
+    def fetch_mentions_batch(
+        self,
+        keywords: Dict[Hashable, List[str]],
+        start_date: datetime,
+        end_date: datetime,
+        limit: int = 100,
+        skip_video_ids: Optional[Dict[Hashable, Set[str]]] = None
+    ) -> Dict[Hashable, List[Dict[str, Any]]]:
+        """
+        Search YouTube for several keywords with one shared quota plan.
+        
+        Searches run breadth-first: every keyword gets its first page
+        before any keyword gets a second one, so a tight quota is spread
+        across as many brands as possible. Each search page is only started
+        if enough quota remains to also fetch statistics for what it finds.
+        Statistics are then looked up 50 IDs per call across all keywords.
+        
+        Args:
+            keywords: Mapping of caller key (e.g. brand ID) to its keywords;
+                the first (primary) keyword is searched
+            start_date: Start of date range
+            end_date: End of date range
+            limit: Maximum results per keyword
+            skip_video_ids: Per caller key, videos stored recently enough
+                that their statistics don't need refreshing; they are left out
+        
+        Returns:
+            Mapping of caller key to normalized mentions
+        """
+        skip_video_ids = skip_video_ids or {}
+        found: Dict[Hashable, List[str]] = {key: [] for key in keywords}
+        page_tokens: Dict[Hashable, Optional[str]] = {key: None for key in keywords}
+        pending = list(keywords)
+        unique_ids: Set[str] = set()
+        
+        # Format dates for YouTube API (RFC 3339)
+        published_after = start_date.isoformat() + 'Z'
+        published_before = end_date.isoformat() + 'Z'
         
         try:
-            # Format dates for YouTube API (RFC 3339)
-            published_after = start_date.isoformat() + 'Z'
-            published_before = end_date.isoformat() + 'Z'
-            
-            # Search request
-            search_response = self.youtube.search().list(
-                q=keyword,
-                part='id,snippet',
-                type='video',
-                maxResults=min(limit, 50),  # API limit
-                publishedAfter=published_after,
-                publishedBefore=published_before,
-                order='relevance'
-            ).execute()
-            
-            # Get video IDs for detailed stats
-            video_ids = [item['id']['videoId'] for item in search_response.get('items', [])]
-            
-            if not video_ids:
-                return mentions
-            
-            # Fetch video statistics
-            videos_response = self.youtube.videos().list(
-                part='snippet,statistics',
-                id=','.join(video_ids)
-            ).execute()
-            
-            for video in videos_response.get('items', []):
-                snippet = video['snippet']
-                stats = video['statistics']
-                
-                mention = {
-                    'text': f"{snippet['title']}\n{snippet.get('description', '')[:500]}",
-                    'url': f"https://www.youtube.com/watch?v={video['id']}",
-                    'source_id': video['id'],
-                    'author': snippet.get('channelTitle'),
-                    'timestamp': datetime.fromisoformat(snippet['publishedAt'].replace('Z', '+00:00')),
-                    'raw_engagement': int(stats.get('viewCount', 0)) + int(stats.get('likeCount', 0)),
-                    'platform_name': 'YouTube',
-                    '_metadata': {
-                        'views': int(stats.get('viewCount', 0)),
-                        'likes': int(stats.get('likeCount', 0)),
-                        'comments': int(stats.get('commentCount', 0))
-                    }
-                }
-                
-                mentions.append(mention)
-                
+            while pending:
+                next_round = []
+                for key in pending:
+                    # Keep enough quota for the statistics calls we will need
+                    stats_reserve = math.ceil((len(unique_ids) + PAGE_SIZE) / PAGE_SIZE) * QUOTA_COSTS['videos.list']
+                    if self.quota.remaining < QUOTA_COSTS['search.list'] + stats_reserve:
+                        raise QuotaExhausted("Not enough quota for another search page")
+                    
+                    self.quota.spend('search.list')
+                    search_response = self.youtube.search().list(
+                        q=keywords[key][0],
+                        part='id',
+                        type='video',
+                        maxResults=min(limit - len(found[key]), PAGE_SIZE),  # API limit
+                        publishedAfter=published_after,
+                        publishedBefore=published_before,
+                        order='relevance',
+                        pageToken=page_tokens[key]
+                    ).execute()
+                    
+                    for item in search_response.get('items', []):
+                        video_id = item['id']['videoId']
+                        if video_id in skip_video_ids.get(key, ()) or video_id in found[key]:
+                            continue
+                        found[key].append(video_id)
+                        unique_ids.add(video_id)
+                    
+                    page_tokens[key] = search_response.get('nextPageToken')
+                    if page_tokens[key] and len(found[key]) < limit:
+                        next_round.append(key)
+                pending = next_round
+        except QuotaExhausted as e:
+            print(f"YouTube quota exhausted, stopping searches early: {e}")
         except Exception as e:
             print(f"YouTube API error: {e}")
         
-        return mentions
+        videos = self._fetch_videos(sorted(unique_ids))
+        
+        return {
+            key: [videos[video_id] for video_id in video_ids if video_id in videos]
+            for key, video_ids in found.items()
+        }
+    
+    def _fetch_videos(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch snippet and statistics for videos, 50 IDs per call.
+        
+        Returns:
+            Mapping of video ID to normalized mention
+        """
+        videos = {}
+        
+        for i in range(0, len(video_ids), PAGE_SIZE):
+            try:
+                self.quota.spend('videos.list')
+                videos_response = self.youtube.videos().list(
+                    part='snippet,statistics',
+                    id=','.join(video_ids[i:i + PAGE_SIZE]),
+                    maxResults=PAGE_SIZE
+                ).execute()
+            except QuotaExhausted as e:
+                print(f"YouTube quota exhausted, skipping remaining statistics: {e}")
+                break
+            except Exception as e:
+                print(f"YouTube API error: {e}")
+                continue
+            
+            for video in videos_response.get('items', []):
+                videos[video['id']] = self._to_mention(video)
+        
+        return videos
+    
+    @staticmethod
+    def _to_mention(video: Dict[str, Any]) -> Dict[str, Any]:
+        snippet = video['snippet']
+        stats = video['statistics']
+        
+        return {
+            'text': f"{snippet['title']}\n{snippet.get('description', '')[:500]}",
+            'url': f"https://www.youtube.com/watch?v={video['id']}",
+            'source_id': video['id'],
+            'author': snippet.get('channelTitle'),
+            'timestamp': datetime.fromisoformat(snippet['publishedAt'].replace('Z', '+00:00')),
+            'raw_engagement': int(stats.get('viewCount', 0)) + int(stats.get('likeCount', 0)),
+            'platform_name': 'YouTube',
+            '_metadata': {
+                'views': int(stats.get('viewCount', 0)),
+                'likes': int(stats.get('likeCount', 0)),
+                'comments': int(stats.get('commentCount', 0))
+            }
+        }
     
     def normalize_engagement(self, raw_data: Dict[str, Any]) -> float:
         """
@@ -99,8 +287,6 @@ class YouTubeProvider(BaseProvider):
         Formula: Takes views and likes into account.
         Views are normalized logarithmically (since they can be huge).
         """
-        import math
-        
         metadata = raw_data.get('_metadata', {})
         views = metadata.get('views', 0)
         likes = metadata.get('likes', 0)
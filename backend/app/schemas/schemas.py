@@ -1,8 +1,8 @@
 """Pydantic schemas for API request/response validation."""
 
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional, Union
+from pydantic import BaseModel, Field, conint
 
 
 # Base Schemas
@@ -25,6 +25,14 @@ class BrandResponse(BrandBase):
         from_attributes = True
 
 
+class BrandSearchResult(BaseModel):
+    id: int
+    name: str
+    category_id: int
+    match: Literal['exact', 'prefix', 'word_prefix', 'keyword', 'fuzzy']
+    score: float  # 0-1, higher is closer within a match kind
+
+
 # Mention Schemas
 class MentionBase(BaseModel):
     text: str
@@ -45,6 +53,11 @@ class MentionResponse(MentionBase):
         from_attributes = True
 
 
+class MentionSearchResult(MentionResponse):
+    rank: float  # Higher is more relevant
+    snippet: str  # HTML-escaped, matches wrapped in <mark>
+
+
 # Analytics Schemas
 class ShareOfVoiceResponse(BaseModel):
     brand_id: int
@@ -77,6 +90,32 @@ class DashboardOverview(BaseModel):
     recent_mentions: List[MentionResponse]
 
 
+# Comparison Schemas
+ComparisonMetric = Literal[
+    'mentions', 'engagement', 'platforms', 'category_mentions', 'share_of_voice', 'market_index'
+]
+
+
+class ComparisonRequest(BaseModel):
+    brand_ids: List[int] = Field(..., min_length=1, max_length=100)
+    windows: List[conint(ge=1, le=1825)] = Field(default=[7, 30, 90], min_length=1, max_length=10)  # Days
+    metrics: List[ComparisonMetric] = Field(default=['mentions', 'share_of_voice', 'market_index'], min_length=1)
+
+
+class BrandComparison(BaseModel):
+    brand_id: int
+    brand_name: str
+    category_id: int
+    values: Dict[str, List[Union[int, float]]]  # Metric -> one value per window
+
+
+class ComparisonResponse(BaseModel):
+    windows: List[int]  # Ascending, deduplicated
+    metrics: List[str]
+    period_end: datetime
+    brands: List[BrandComparison]
+
+
 # Ingestion Schemas
 class IngestionRequest(BaseModel):
     brand_ids: Optional[List[int]] = None  # If None, ingest all brands
@@ -92,3 +131,12 @@ class IngestionResponse(BaseModel):
     platforms_used: List[str]
     started_at: datetime
     completed_at: Optional[datetime] = None
+
+
+class BrandImportResponse(BaseModel):
+    inserted: int
+    updated: int
+    unchanged: int
+    skipped: int  # Invalid records
+    categories_created: int
+    errors: List[str]  # First few invalid records
@@ -0,0 +1,113 @@
+"""
+Benchmark: bulk brand catalog import.
+
+Generates a synthetic catalog shaped like generate-10k.js output (names
+from prefixes and suffixes, a handful of categories, keyword lists) and
+imports it three times into a scratch database:
+1. empty catalog: every brand inserted
+2. the same file again: every brand unchanged
+3. a revision with --change-fraction of brands edited (new keywords, and
+   a tenth of those moved to another category) plus new brands
+
+By default the scratch database is a temporary SQLite file (batched
+executemany); pass an empty PostgreSQL database to measure COPY.
+
+Usage:
+    python -m benchmarks.bench_brand_import --brands 100000
+    python -m benchmarks.bench_brand_import --database-url postgresql+psycopg2://…/scratch
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+CATEGORIES = ['fashion', 'sportswear', 'beauty', 'food', 'tech', 'home', 'accessories', 'jewelry', 'wellness', 'pets']
+PREFIXES = ['Urban', 'Mystic', 'Royal', 'Blue', 'Golden', 'Velvet', 'Eco', 'Luna', 'Nova', 'Swift',
+            'Bold', 'Zen', 'Vita', 'Retro', 'Neon', 'Prime', 'Ocean', 'Bloom', 'Spark', 'Glow']
+SUFFIXES = ['ify', 'hub', 'lab', 'co', 'works', 'box', 'kart', 'store', 'wear', 'fit',
+            'style', 'skin', 'care', 'craft', 'studio', 'chef', 'bite', 'home', 'decor', 'garden']
+
+
+def generate_catalog(count: int, seed: int):
+    rng = random.Random(seed)
+    brands = []
+    for i in range(count):
+        name = f"{rng.choice(PREFIXES)}{rng.choice(SUFFIXES)} {i}"
+        brands.append({
+            'name': name,
+            'category': rng.choice(CATEGORIES),
+            'keywords': [name, name.split()[0].lower()],
+            'totalMentions': rng.randint(1000, 100000),  # Ignored by the import
+        })
+    return brands
+
+
+def revise_catalog(brands, fraction: float, seed: int):
+    rng = random.Random(seed + 1)
+    revised = [dict(brand) for brand in brands]
+    for brand in rng.sample(revised, int(len(revised) * fraction)):
+        brand['keywords'] = brand['keywords'] + ['new']
+        if rng.random() < 0.1:
+            brand['category'] = rng.choice([c for c in CATEGORIES if c != brand['category']])
+    extra = generate_catalog(int(len(brands) * fraction), seed + 2)
+    for brand in extra:
+        brand['name'] = 'New ' + brand['name']
+    return revised + extra
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help="Empty scratch database (default: temporary SQLite file)")
+    parser.add_argument('--brands', type=int, default=100000)
+    parser.add_argument('--change-fraction', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    
+    scratch = None
+    if not args.database_url:
+        scratch = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+        args.database_url = f"sqlite:///{scratch.name}"
+    # The app reads its database from the environment at import time
+    os.environ['DATABASE_URL'] = args.database_url
+    
+    from sqlalchemy import inspect
+    
+    from app.analytics.brand_import import import_brands
+    from app.core.config import SessionLocal, engine
+    from app.models.database import Base
+    
+    try:
+        if inspect(engine).has_table('brands'):
+            print("Point --database-url at an empty scratch database")
+            sys.exit(2)
+        Base.metadata.create_all(engine)
+        
+        catalog = generate_catalog(args.brands, args.seed)
+        runs = [
+            ('initial load', catalog),
+            ('same file again', catalog),
+            (f'{args.change_fraction:.0%} changed + new', revise_catalog(catalog, args.change_fraction, args.seed)),
+        ]
+        
+        print(f"{engine.dialect.name}, {args.brands} brands\n")
+        print(f"{'run':28} {'records':>8} {'inserted':>9} {'updated':>8} {'unchanged':>10} {'seconds':>8} {'brands/s':>9}")
+        for label, records in runs:
+            with SessionLocal() as db:
+                started = time.perf_counter()
+                result = import_brands(db, records)
+                db.commit()
+                elapsed = time.perf_counter() - started
+            print(
+                f"{label:28} {len(records):8} {result.inserted:9} {result.updated:8} {result.unchanged:10} "
+                f"{elapsed:8.2f} {len(records) / elapsed:9.0f}"
+            )
+    finally:
+        if scratch is not None:
+            os.unlink(scratch.name)
+
+
+if __name__ == "__main__":
+    main()
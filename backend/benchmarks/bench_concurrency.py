@@ -0,0 +1,55 @@
+"""
+Load test: API throughput as concurrency grows.
+
+With blocking database calls on the event loop, throughput stays flat no
+matter how many requests are in flight; with the async data path it should
+scale until the database or pool saturates.
+
+Usage (against a running server):
+    uvicorn app.main:app --workers 1
+    python -m benchmarks.bench_concurrency --url http://localhost:8000 \\
+        --path "/metrics/market-index?days_back=90"
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+
+async def run_level(client: httpx.AsyncClient, path: str, concurrency: int, requests: int) -> float:
+    """Fire `requests` GETs with at most `concurrency` in flight; return req/s."""
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def one():
+        async with semaphore:
+            response = await client.get(path)
+            response.raise_for_status()
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--path', default='/category/1/sov?brand_id=1&days_back=90')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--levels', default='1,4,16,64')
+    args = parser.parse_args()
+    
+    limits = httpx.Limits(max_connections=256, max_keepalive_connections=256)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=limits) as client:
+        await client.get(args.path)  # warm up
+        baseline = None
+        print(f"{'concurrency':>11}  {'req/s':>8}  {'vs 1':>6}")
+        for level in (int(x) for x in args.levels.split(',')):
+            rate = await run_level(client, args.path, level, args.requests)
+            baseline = baseline or rate
+            print(f"{level:>11}  {rate:8.1f}  {rate / baseline:5.1f}x")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""
+Benchmark the scraper HTML parser backends.
+
+Generates synthetic old.reddit search and Google News pages, checks that each
+fast backend returns exactly what the BeautifulSoup reference returns, and
+reports parse time per page.
+
+Usage:
+    python -m benchmarks.bench_parsing [--posts 100] [--pages 50]
+"""
+
+import argparse
+import random
+import time
+
+from app.providers.html_parsing import available_backends, parse_page, parse_pages
+
+
+def make_reddit_page(posts: int) -> str:
+    """Build an old.reddit-style listing with page chrome around the results."""
+    chrome = ''.join(
+        f'<div class="side"><ul>{"<li><a href=/r/x>link</a></li>" * 20}</ul></div>'
+        for _ in range(10)
+    )
+    things = []
+    for i in range(posts):
+        things.append(
+            f'<div class="thing link" data-fullname="t3_{i:06x}" data-subreddit="sub{i % 7}" '
+            f'data-author="user{i}" data-score="{random.randint(0, 5000)}">'
+            f'<p class="title"><a class="title may-blank" href="/r/sub{i % 7}/comments/{i:06x}/">'
+            f'Post <b>{i}</b> about the brand</a></p>'
+            f'<p class="tagline">submitted <time datetime="2024-01-{1 + i % 28:02d}T12:00:00+00:00">'
+            f'{i} hours ago</time></p>'
+            f'<ul class="flat-list buttons"><li><a class="comments" href="#">{i % 300} comments</a></li>'
+            f'<li><a href="#">share</a></li><li><a href="#">save</a></li></ul></div>'
+        )
+    return f'<html><head><title>search</title></head><body>{chrome}<div id="siteTable">{"".join(things)}</div>{chrome}</body></html>'
+
+
+def make_news_page(results: int) -> str:
+    """Build a Google News-style result page."""
+    items = ''.join(
+        f'<div class="g"><div><a href="https://www.example.com/2024/01/story-{i}">'
+        f'<h3>Headline <span>{i}</span></h3></a></div>'
+        f'<div class="VwiC3b">Snippet text for story {i} with <em>keyword</em>.</div></div>'
+        for i in range(results)
+    )
+    chrome = '<div class="nav">' + '<span>x</span>' * 500 + '</div>'
+    return f'<html><body>{chrome}<div id="search">{items}</div>{chrome}</body></html>'
+
+
+def time_backend(kind: str, html: str, backend: str, limit: int, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse_page(kind, html, limit=limit, backend=backend)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=100)
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    pages = {
+        'reddit': make_reddit_page(args.posts),
+        'news': make_news_page(10),
+    }
+
+    for kind, html in pages.items():
+        reference = parse_page(kind, html, limit=args.posts, backend='reference')
+        baseline = time_backend(kind, html, 'reference', args.posts, args.repeat)
+        print(f"\n{kind} page ({len(html) / 1024:.0f} KiB, {len(reference)} results)")
+        for backend in available_backends():
+            result = parse_page(kind, html, limit=args.posts, backend=backend)
+            assert result == reference, f"{backend} output differs from reference for {kind}"
+            elapsed = time_backend(kind, html, backend, args.posts, args.repeat)
+            print(f"  {backend:<11} {elapsed * 1000:8.2f} ms/page  {baseline / elapsed:6.1f}x")
+
+    html = pages['reddit']
+    for workers in (1, None):
+        start = time.perf_counter()
+        parse_pages('reddit', [html] * args.pages, limit=args.posts, workers=workers)
+        elapsed = time.perf_counter() - start
+        label = 'serial' if workers == 1 else 'process pool'
+        print(f"\n{args.pages} pages, {label}: {elapsed * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: serializing a page of mentions.
+
+Compares the previous path (ORM instances -> per-item MentionResponse
+validation -> jsonable_encoder -> json.dumps, which is what FastAPI does
+for a response_model route) with the fast path (row tuples -> dicts ->
+orjson) used by GET /brands/{id}/mentions.
+
+Runs against an in-memory SQLite database filled with synthetic rows, so
+it needs no server or configured database.
+
+Usage:
+    python -m benchmarks.bench_serialization --rows 1000 --repeat 20
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.analytics.bodies import join_bodies
+from app.api.responses import MENTION_COLUMNS, dumps, rows_to_dicts
+from app.models.database import Base, Brand, Category, Mention, MentionBody, Platform
+from app.schemas.schemas import MentionResponse
+
+
+def build_session(rows: int):
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    
+    session.add(Category(id=1, name='Bench'))
+    session.add(Platform(id=1, name='Reddit'))
+    session.add(Brand(id=1, name='Brand', category_id=1))
+    now = datetime.utcnow()
+    rng = random.Random(0)
+    session.add_all(
+        Mention(
+            brand_id=1,
+            category_id=1,
+            platform_id=1,
+            body=MentionBody(
+                text='lorem ipsum dolor sit amet ' * rng.randint(2, 20),
+                url=f'https://example.com/post/{i}',
+            ),
+            source_id=f'post_{i}',
+            author=f'user{rng.randint(1, 500)}',
+            timestamp=now - timedelta(minutes=i),
+            engagement_score=rng.random(),
+            raw_engagement=rng.randint(0, 5000),
+        )
+        for i in range(rows)
+    )
+    session.commit()
+    return session
+
+
+def orm_path(session, rows: int) -> bytes:
+    session.expunge_all()
+    mentions = session.execute(
+        join_bodies(select(Mention, MentionBody)).order_by(Mention.timestamp.desc()).limit(rows)
+    ).all()
+    validated = [
+        MentionResponse.model_validate({**vars(m), 'text': body.text, 'url': body.url})
+        for m, body in mentions
+    ]
+    return json.dumps(jsonable_encoder(validated)).encode('utf-8')
+
+
+def row_path(session, rows: int) -> bytes:
+    result = session.execute(
+        join_bodies(select(*MENTION_COLUMNS)).order_by(Mention.timestamp.desc()).limit(rows)
+    ).all()
+    return dumps(rows_to_dicts(result))
+
+
+def best_of(fn, repeat: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    session = build_session(args.rows)
+    
+    # Both paths must produce the same documents
+    assert json.loads(orm_path(session, args.rows)) == json.loads(row_path(session, args.rows))
+    
+    orm = best_of(lambda: orm_path(session, args.rows), args.repeat)
+    fast = best_of(lambda: row_path(session, args.rows), args.repeat)
+    
+    print(f"{args.rows} mentions, best of {args.repeat}")
+    print(f"  ORM + validation + json: {orm * 1000:8.2f} ms")
+    print(f"  rows + orjson:           {fast * 1000:8.2f} ms  ({orm / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark: analytics scans over narrow vs wide mentions rows (PostgreSQL).
+
+Loads the synthetic dataset of check_query_plans (bodies padded to
+--text-length characters), then builds a copy of mentions with text and
+url inline, as it was before they moved to mention_bodies, in a separate
+`wide` schema with the same indexes. Each analytics statement runs on
+both (EXPLAIN ANALYZE BUFFERS, best of --repeat) and the report shows
+table sizes and the shared buffers each one touched: fewer pages per row
+means fewer pages to cache and to read.
+
+Needs an empty scratch PostgreSQL database.
+
+Usage:
+    python -m benchmarks.bench_table_width --database-url postgresql+psycopg2://…/scratch
+    python -m benchmarks.bench_table_width --database-url … --text-length 1000
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+
+def explain(conn, sql: str, repeat: int):
+    """(shared buffers touched, execution ms) of the best of `repeat` runs."""
+    from sqlalchemy import text
+    
+    best = None
+    for _ in range(repeat):
+        plan = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")).scalar()[0]
+        buffers = plan['Plan'].get('Shared Hit Blocks', 0) + plan['Plan'].get('Shared Read Blocks', 0)
+        run = (buffers, plan['Execution Time'])
+        best = run if best is None or run[1] < best[1] else best
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', required=True, help="Empty scratch PostgreSQL database")
+    parser.add_argument('--brands', type=int, default=500)
+    parser.add_argument('--mentions', type=int, default=200000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--text-length', type=int, default=300, help="Mention text length (title + description)")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    # The app reads its database from the environment at import time
+    os.environ['DATABASE_URL'] = args.database_url
+    
+    from sqlalchemy import func, inspect, select, text
+    from sqlalchemy.schema import CreateIndex
+    
+    from app.analytics.engine import (
+        _brand_activity_stmt, _category_comparison_stmt, _category_mentions_stmt, _window_starts
+    )
+    from app.core.config import engine
+    from app.models.database import Brand, Mention, MentionBody
+    from benchmarks.check_query_plans import load_dataset
+    
+    if engine.dialect.name != 'postgresql':
+        print("This benchmark needs PostgreSQL")
+        sys.exit(2)
+    if inspect(engine).has_table('mentions'):
+        print("Point --database-url at an empty scratch database")
+        sys.exit(2)
+    
+    print(f"Loading {args.mentions} mentions for {args.brands} brands…")
+    load_dataset(engine, args.brands, args.mentions, args.days, args.seed)
+    
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level='AUTOCOMMIT')
+        conn.execute(text(
+            "UPDATE mention_bodies SET text = rpad(text, :length, ' lorem ipsum dolor sit amet')"
+        ), {'length': args.text_length})
+        
+        conn.execute(text("CREATE SCHEMA wide"))
+        conn.execute(text(
+            "CREATE TABLE wide.mentions AS SELECT m.*, b.text, b.url "
+            "FROM public.mentions m JOIN public.mention_bodies b ON b.mention_id = m.id"
+        ))
+        conn.execute(text("SET search_path TO wide"))
+        for index in Mention.__table__.indexes:
+            conn.execute(CreateIndex(index))
+        conn.execute(text("SET search_path TO public"))
+        conn.execute(text("VACUUM ANALYZE"))
+        
+        sizes = {
+            name: conn.execute(text(f"SELECT pg_total_relation_size('{name}')")).scalar()
+            for name in ('public.mentions', 'wide.mentions', 'public.mention_bodies')
+        }
+        heaps = {
+            name: conn.execute(text(f"SELECT pg_relation_size('{name}')")).scalar()
+            for name in ('public.mentions', 'wide.mentions')
+        }
+        
+        end = datetime.utcnow()
+        brand_id, category_id = conn.execute(select(Brand.id, Brand.category_id).limit(1)).one()
+        category_ids = conn.execute(select(Brand.category_id).distinct()).scalars().all()
+        statements = {
+            'category mentions, 30d': _category_mentions_stmt(category_id, end - timedelta(days=30), end),
+            'category mentions, 365d': _category_mentions_stmt(category_id, end - timedelta(days=365), end),
+            'brand activity, 365d': _brand_activity_stmt(brand_id, end - timedelta(days=365), end),
+            'compare all categories, 7/30/365d': _category_comparison_stmt(
+                category_ids, _window_starts([7, 30, 365], end), end
+            ),
+            'platform totals (full scan)': select(
+                Mention.platform_id, func.count(Mention.id), func.sum(Mention.engagement_score)
+            ).group_by(Mention.platform_id),
+        }
+        
+        results = []
+        for label, stmt in statements.items():
+            sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={'literal_binds': True}))
+            runs = []
+            for schema in ('public', 'wide'):
+                conn.execute(text(f"SET search_path TO {schema}, public"))
+                runs.append(explain(conn, sql, args.repeat))
+            results.append((label, *runs))
+        conn.execute(text("SET search_path TO public"))
+    
+    mb = 1024 * 1024
+    print(f"\n{args.mentions} mentions, text ~{args.text_length} chars")
+    print(f"  mentions heap:  narrow {heaps['public.mentions'] / mb:7.1f} MB   wide {heaps['wide.mentions'] / mb:7.1f} MB")
+    print(f"  with indexes:   narrow {sizes['public.mentions'] / mb:7.1f} MB   wide {sizes['wide.mentions'] / mb:7.1f} MB")
+    print(f"  {MentionBody.__tablename__}: {sizes['public.mention_bodies'] / mb:.1f} MB (read by listing/search only)\n")
+    print(f"{'query':36} {'narrow buffers':>15} {'wide buffers':>13} {'saved':>6} {'narrow ms':>10} {'wide ms':>8}")
+    for label, (narrow, narrow_ms), (wide, wide_ms) in results:
+        saved = 1 - narrow / wide if wide else 0
+        print(f"{label:36} {narrow:15} {wide:13} {saved:6.0%} {narrow_ms:10.1f} {wide_ms:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
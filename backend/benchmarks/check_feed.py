@@ -0,0 +1,153 @@
+"""
+Check live-feed delivery end to end.
+
+Subscribes to the feed broadcaster (with the pg_notify listener on
+PostgreSQL, as the API workers run it), ingests mentions the way
+ingestion does (queue_mentions before commit) and checks that:
+- committed mentions are delivered
+- rolled-back mentions are not
+- a mention whose URL is longer than pg_notify's 8000 byte payload limit
+  still commits and is delivered (on PostgreSQL without its URL)
+
+Exits 1 on any failure.
+
+Usage:
+    python -m benchmarks.check_feed                                   # temporary SQLite database
+    python -m benchmarks.check_feed --database-url postgresql://…/scratch
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+EVENT_TIMEOUT = 3.0
+LONG_URL = 'https://example.com/' + 'a' * 9000
+
+
+def ingest(run: str, count: int, url: str = 'https://example.com/post', rollback: bool = False):
+    """Store `count` mentions as ingestion does; returns their ids."""
+    from sqlalchemy import select
+    
+    from app.analytics.feed import queue_mentions
+    from app.core.config import SessionLocal
+    from app.models.database import Brand, Mention, MentionBody, Platform
+    
+    with SessionLocal() as db:
+        brand = db.execute(select(Brand).limit(1)).scalar_one()
+        platform_id = db.execute(select(Platform.id).limit(1)).scalar_one()
+        mentions = [
+            Mention(
+                brand_id=brand.id,
+                platform_id=platform_id,
+                category_id=brand.category_id,
+                body=MentionBody(text=f'feed check {run} {i}', url=url),
+                source_id=f'feed-check-{run}-{i}',
+                timestamp=datetime.utcnow()
+            )
+            for i in range(count)
+        ]
+        db.add_all(mentions)
+        queue_mentions(db, mentions)
+        ids = [m.id for m in mentions]
+        if rollback:
+            db.rollback()
+        else:
+            db.commit()
+        return ids
+
+
+async def received(subscription) -> list:
+    """Events delivered until none arrives for EVENT_TIMEOUT seconds."""
+    events = []
+    while True:
+        try:
+            events.append(await asyncio.wait_for(subscription.queue.get(), EVENT_TIMEOUT))
+        except asyncio.TimeoutError:
+            return events
+
+
+async def run_checks(dialect_name: str) -> int:
+    from app.analytics.feed import start_listener
+    from app.core.broadcast import get_broadcaster
+    
+    broadcaster = get_broadcaster()
+    broadcaster.bind(asyncio.get_running_loop())
+    listener = start_listener(broadcaster)
+    subscription = broadcaster.subscribe()
+    # Let the listener connect and LISTEN before anything is sent
+    await asyncio.sleep(1.0)
+    failures = 0
+    
+    def check(name: str, ok: bool, detail: str):
+        nonlocal failures
+        failures += not ok
+        print(f"  {'ok  ' if ok else 'FAIL'} {name}: {detail}")
+    
+    try:
+        ids = await asyncio.to_thread(ingest, 'commit', 3)
+        events = await received(subscription)
+        check("committed mentions are delivered", [e['id'] for e in events] == ids,
+              f"{len(events)} of {len(ids)} events")
+        
+        await asyncio.to_thread(ingest, 'rollback', 2, rollback=True)
+        events = await received(subscription)
+        check("rolled-back mentions are not delivered", not events, f"{len(events)} events")
+        
+        try:
+            ids = await asyncio.to_thread(ingest, 'long-url', 1, LONG_URL)
+        except Exception as e:
+            check(f"{len(LONG_URL)} byte URL commits", False, f"{type(e).__name__}: {e}")
+        else:
+            events = await received(subscription)
+            want_url = None if dialect_name == 'postgresql' else LONG_URL
+            check(f"{len(LONG_URL)} byte URL commits and is delivered",
+                  [e['id'] for e in events] == ids and events[0]['url'] == want_url,
+                  f"{len(events)} events, url {'dropped' if events and events[0]['url'] is None else 'kept'}")
+    finally:
+        broadcaster.unsubscribe(subscription)
+        if listener is not None:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help="Scratch database (default: temporary SQLite file)")
+    args = parser.parse_args()
+    
+    scratch = None
+    if not args.database_url:
+        scratch = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+        args.database_url = f"sqlite:///{scratch.name}"
+    # The app reads its database from the environment at import time
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ['DATABASE_READ_URL'] = ''
+    
+    from sqlalchemy import inspect, select
+    
+    from app.core.config import SessionLocal, engine
+    from app.models.database import Brand
+    from benchmarks.check_query_plans import load_dataset
+    
+    try:
+        with SessionLocal() as db:
+            has_brands = inspect(engine).has_table('brands') and db.execute(select(Brand.id).limit(1)).first()
+        if not has_brands:
+            load_dataset(engine, 2, 0, 1, 1)
+        print(f"Checking the mention feed on {engine.dialect.name}")
+        failures = asyncio.run(run_checks(engine.dialect.name))
+    finally:
+        engine.dispose()
+        if scratch is not None:
+            os.unlink(scratch.name)
+    
+    print(f"\n{failures} of 3 checks failed" if failures else "\nAll 3 checks passed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,454 @@
+"""
+Query-plan regression check for the mentions queries.
+
+Loads a synthetic dataset (skewed brand sizes, a year of history), drives
+every analytics route plus the engine methods no route calls, and EXPLAINs
+each distinct statement that reads mentions, with the parameters it was
+run with. A statement fails when:
+- it scans a mentions table (or partition) of more than --min-rows rows
+  without an index, or
+- the planner expects it to read more than --max-row-fraction of mentions
+  (PostgreSQL; SQLite plans carry no estimates)
+
+For failing scans, and index scans that still filter rows afterwards, it
+suggests an index built from the scan's conditions (or names the existing
+index the planner passed over). Exits 1 on any failure, so it can gate CI
+or a schema change.
+
+PostgreSQL plans are what matter in production; the default scratch
+SQLite database gives a coarser check of the same queries.
+
+Usage:
+    python -m benchmarks.check_query_plans                     # temporary SQLite database
+    python -m benchmarks.check_query_plans --database-url postgresql://…/scratch
+    python -m benchmarks.check_query_plans --database-url … --reuse   # existing data, e.g. a staging copy
+    python -m benchmarks.check_query_plans --save-plans plans.json
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+MENTIONS_RELATION = re.compile(r'^mentions(_p\d{4}_\d{2}|_default)?$')
+SQLITE_SCAN = re.compile(r'^(SCAN|SEARCH) (mentions(?:_p\d{4}_\d{2}|_default)?)\b(.*)$')
+PREDICATE = re.compile(r'"?(\w+)"?\s*(=|<>|>=|<=|>|<)')
+BLOCKING_NODES = {'Sort', 'Incremental Sort', 'Aggregate', 'Hash', 'Materialize', 'WindowAgg', 'Unique'}
+
+WORDS = (
+    'launch review price drop sale new running shoes jacket quality shipping '
+    'return sizing comfort style collab limited edition restock discount'
+).split()
+
+
+class Scan(NamedTuple):
+    relation: str
+    kind: str
+    index: Optional[str]
+    rows: Optional[float]  # Planner estimate, capped by an enclosing LIMIT
+    conditions: str
+    filtered: bool  # Rows are filtered after the index lookup
+
+
+class CheckedQuery(NamedTuple):
+    label: str
+    sql: str
+    plan: Any
+    scans: List[Scan]
+    failures: List[str]
+    proposals: List[str]
+
+
+class PlanRecorder:
+    """EXPLAINs each distinct mentions statement as the app runs it."""
+    
+    def __init__(self, dialect_name: str):
+        self.dialect_name = dialect_name
+        self.label = ''
+        self.plans: Dict[Tuple[str, str], Any] = {}
+    
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        key = (self.label, statement)
+        if executemany or key in self.plans or not re.search(r'\bmentions\b', statement):
+            return
+        if not statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+            return
+        # A plain cursor of the same connection, so server-side cursors are left alone
+        explain = conn.connection.cursor()
+        try:
+            if self.dialect_name == 'postgresql':
+                explain.execute('EXPLAIN (FORMAT JSON) ' + statement, parameters)
+                plan = explain.fetchall()[0][0]
+                plan = json.loads(plan) if isinstance(plan, str) else plan
+            else:
+                explain.execute('EXPLAIN QUERY PLAN ' + statement, parameters)
+                plan = [row[-1] for row in explain.fetchall()]
+        finally:
+            explain.close()
+        self.plans[key] = plan
+
+
+def load_dataset(engine, brands: int, mentions: int, days: int, seed: int):
+    """Create the schema and fill it with synthetic brands and mentions."""
+    from sqlalchemy import insert, text
+    from sqlalchemy.orm import Session
+    
+    from app.analytics.counters import rebuild_counters
+    from app.analytics.search import create_search_index
+    from app.models.database import Base, Brand, Category, Mention, MentionBody, Platform
+    
+    rng = random.Random(seed)
+    Base.metadata.create_all(engine)
+    create_search_index(engine)
+    
+    with Session(engine) as session:
+        categories = [Category(name=f"Category {i}") for i in range(max(brands // 25, 1))]
+        platforms = [Platform(name=name, is_active=1) for name in ('Reddit', 'YouTube', 'News', 'Google')]
+        session.add_all(categories + platforms)
+        session.flush()
+        catalog = [
+            Brand(name=f"Brand {i}", category_id=categories[i % len(categories)].id, keywords=f"brand{i},b{i}")
+            for i in range(brands)
+        ]
+        session.add_all(catalog)
+        session.flush()
+        
+        # Zipf-like brand sizes: a few brands dominate, as in real data
+        weights = [1 / (rank + 1) for rank in range(brands)]
+        now = datetime.utcnow()
+        batch, bodies = [], []
+        for i in range(mentions):
+            brand = rng.choices(catalog, weights)[0]
+            timestamp = now - timedelta(seconds=rng.randint(0, days * 86400))
+            batch.append({
+                'id': i + 1,
+                'brand_id': brand.id,
+                'category_id': brand.category_id,
+                'platform_id': rng.choice(platforms).id,
+                'source_id': str(i),
+                'author': f"user{rng.randint(1, 5000)}",
+                'timestamp': timestamp,
+                'engagement_score': rng.random(),
+                'raw_engagement': rng.randint(0, 10000),
+                'collected_at': timestamp,
+                'created_at': timestamp,
+            })
+            bodies.append({
+                'mention_id': i + 1,
+                'text': f"{brand.name} " + ' '.join(rng.sample(WORDS, 6)),
+                'url': f"https://example.com/{i}",
+            })
+            if len(batch) == 10000:
+                session.execute(insert(Mention), batch)
+                session.execute(insert(MentionBody), bodies)
+                batch, bodies = [], []
+        if batch:
+            session.execute(insert(Mention), batch)
+            session.execute(insert(MentionBody), bodies)
+        session.commit()
+        rebuild_counters(session)
+    
+    if engine.dialect.name == 'postgresql':
+        with engine.connect() as conn:
+            conn.execution_options(isolation_level='AUTOCOMMIT').execute(text('ANALYZE'))
+
+
+def _walk(node: Dict[str, Any], limit_rows: Optional[float] = None) -> Iterator[Tuple[Dict[str, Any], Optional[float]]]:
+    """Plan nodes with the row count of a LIMIT that can stop them early."""
+    if node['Node Type'] == 'Limit':
+        limit_rows = node.get('Plan Rows')
+    elif node['Node Type'] in BLOCKING_NODES:
+        limit_rows = None
+    yield node, limit_rows
+    for child in node.get('Plans', []):
+        yield from _walk(child, limit_rows)
+
+
+def postgres_scans(plan: Any) -> List[Scan]:
+    scans = []
+    for node, limit_rows in _walk(plan[0]['Plan']):
+        relation = node.get('Relation Name', '')
+        if not MENTIONS_RELATION.match(relation):
+            continue
+        index = node.get('Index Name')
+        if index is None:
+            # Bitmap heap scans name their indexes on the child nodes
+            index = ','.join(
+                child['Index Name'] for child, _ in _walk(node) if child.get('Index Name')
+            ) or None
+        rows = node.get('Plan Rows')
+        if limit_rows is not None and rows is not None:
+            rows = min(rows, limit_rows)
+        conditions = ' AND '.join(
+            node[key] for key in ('Index Cond', 'Recheck Cond', 'Filter') if node.get(key)
+        )
+        scans.append(Scan(relation, node['Node Type'], index, rows, conditions, 'Filter' in node))
+    return scans
+
+
+def sqlite_scans(plan: List[str], sql: str) -> List[Scan]:
+    # An index walked in order under a LIMIT stops early (no temp sort)
+    limited = re.search(r'\bLIMIT\b', sql, re.I) and not any('TEMP B-TREE' in d for d in plan)
+    scans = []
+    for detail in plan:
+        match = SQLITE_SCAN.match(detail)
+        if match:
+            kind, relation, rest = match.groups()
+            index = re.search(r'INDEX (\w+)', rest)
+            index = index.group(1) if index else ('rowid' if 'PRIMARY KEY' in rest else None)
+            if kind == 'SEARCH':
+                kind = 'Index Scan'
+            elif index and limited:
+                kind = 'Index Scan (ordered, limited)'
+            else:
+                kind = 'Seq Scan'
+            scans.append(Scan(relation, kind, index, None, rest.strip(), False))
+    return scans
+
+
+def summarize(scans: List[Scan]) -> List[str]:
+    """One line per scan kind and index, with partitions folded together."""
+    groups: Dict[Tuple[str, Optional[str]], List[Scan]] = {}
+    for scan in scans:
+        index = ','.join(
+            re.sub(r'^mentions_(p\d{4}_\d{2}|default)_', '', name) for name in scan.index.split(',')
+        ) if scan.index else None
+        groups.setdefault((scan.kind, index), []).append(scan)
+    
+    lines = []
+    for (kind, index), group in groups.items():
+        relations = {scan.relation for scan in group}
+        target = group[0].relation if len(relations) == 1 else f"{len(relations)} mentions partitions"
+        rows = [scan.rows for scan in group if scan.rows is not None]
+        lines.append(
+            f"{kind} {target}" + (f" using {index}" if index else '')
+            + (f" ~{int(sum(rows))} rows" if rows else '')
+        )
+    return lines
+
+
+def propose_index(conditions: str) -> Optional[Tuple[str, ...]]:
+    """Equality columns first, then one range column, from a scan's conditions."""
+    from app.models.database import Mention
+    
+    names = {column.name for column in Mention.__table__.columns}
+    equality, ranges = [], []
+    for column, operator in PREDICATE.findall(conditions):
+        if column not in names:
+            continue
+        target = equality if operator == '=' else ranges
+        if column not in target:
+            target.append(column)
+    columns = tuple(equality + [c for c in ranges if c not in equality][:1])
+    return columns or None
+
+
+def existing_index(columns: Tuple[str, ...]) -> Optional[str]:
+    """Name of a mentions index whose leading columns are `columns`."""
+    from app.models.database import Mention
+    
+    for index in Mention.__table__.indexes:
+        if tuple(c.name for c in index.columns)[:len(columns)] == columns:
+            return index.name
+    for column in Mention.__table__.columns:
+        if column.index and columns == (column.name,):
+            return f"ix_mentions_{column.name}"
+    return None
+
+
+def check(
+    label: str,
+    sql: str,
+    plan: Any,
+    dialect_name: str,
+    table_rows: int,
+    relation_rows: Dict[str, float],
+    min_rows: int,
+    max_fraction: float
+) -> CheckedQuery:
+    scans = postgres_scans(plan) if dialect_name == 'postgresql' else sqlite_scans(plan, sql)
+    failures, proposals = [], []
+    
+    for scan in scans:
+        full_scan = scan.kind == 'Seq Scan'
+        size = relation_rows.get(scan.relation, table_rows)
+        if full_scan and size > min_rows:
+            failures.append(f"full scan of {scan.relation} (~{int(size)} rows)")
+        
+        residual = scan.kind != 'Seq Scan' and scan.filtered
+        if (full_scan and size > min_rows) or residual:
+            columns = propose_index(scan.conditions)
+            if columns:
+                name = existing_index(columns)
+                if name and not residual:
+                    proposals.append(f"{scan.relation}: {name} covers ({', '.join(columns)}) but was not used")
+                elif not name:
+                    proposals.append(
+                        f"{scan.relation}: Index('ix_mentions_{'_'.join(columns)}', {', '.join(repr(c) for c in columns)})"
+                    )
+    
+    estimated = sum(scan.rows for scan in scans if scan.rows is not None)
+    if table_rows and estimated > max_fraction * table_rows:
+        failures.append(
+            f"expects to read ~{int(estimated)} of {table_rows} mentions (> {max_fraction:.0%})"
+        )
+    return CheckedQuery(label, sql, plan, scans, failures, proposals)
+
+
+def run_scenarios(client, recorder: PlanRecorder, brand_id: int, category_id: int, brand_name: str):
+    """Issue every analytics request the app serves (and engine-only methods)."""
+    from app.analytics.engine import AsyncAnalyticsEngine
+    from app.core.config import AsyncSessionLocal
+    
+    def get(label: str, path: str, **kwargs):
+        recorder.label = label
+        response = client.request(kwargs.pop('method', 'GET'), path, **kwargs)
+        if response.status_code != 200:
+            print(f"  ! {label}: HTTP {response.status_code} {response.text[:200]}")
+        return response
+    
+    first = get('GET /brands/{id}/mentions', f'/brands/{brand_id}/mentions?days_back=30&limit=100')
+    cursor = first.headers.get('x-next-cursor')
+    if cursor:
+        get('GET /brands/{id}/mentions (next page)', f'/brands/{brand_id}/mentions?days_back=30&limit=100&cursor={cursor}')
+    get('GET /brands/{id}/mentions?platform=', f'/brands/{brand_id}/mentions?days_back=30&limit=100&platform=Reddit')
+    get('GET /brands/{id}/mentions/export', f'/brands/{brand_id}/mentions/export?days_back=90')
+    get('GET /mentions/search?brand_id=', f'/mentions/search?q=shoes&brand_id={brand_id}')
+    get('GET /mentions/search', '/mentions/search?q=limited+edition&days_back=30')
+    for days in (7, 30, 365):
+        get(f'GET /category/{{id}}/sov ({days}d)', f'/category/{category_id}/sov?brand_id={brand_id}&days_back={days}')
+    get('GET /metrics/market-index', f'/metrics/market-index?brand_ids={brand_id}&days_back=90')
+    get(
+        'POST /compare', '/compare', method='POST',
+        json={'brand_ids': [brand_id], 'windows': [7, 30, 90, 365],
+              'metrics': ['mentions', 'engagement', 'platforms', 'share_of_voice', 'market_index']}
+    )
+    get('GET /dashboard/overview', '/dashboard/overview')
+    get('GET /brands/search', f'/brands/search?q={brand_name[:4]}')
+    
+    async def platform_distribution():
+        async with AsyncSessionLocal() as db:
+            end_date = datetime.utcnow()
+            await AsyncAnalyticsEngine.aggregate_platform_distribution(
+                brand_id, end_date - timedelta(days=30), end_date, db
+            )
+    
+    recorder.label = 'AsyncAnalyticsEngine.aggregate_platform_distribution'
+    client.portal.call(platform_distribution)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help="Scratch database (default: a temporary SQLite file)")
+    parser.add_argument('--reuse', action='store_true', help="Check plans against the data already there")
+    parser.add_argument('--brands', type=int, default=500)
+    parser.add_argument('--mentions', type=int, default=200000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--brand-rank', type=int, default=10, help="Brand to query, by mention volume (1 = busiest)")
+    parser.add_argument('--min-rows', type=int, default=1000, help="Full scans of smaller tables are fine")
+    parser.add_argument('--max-row-fraction', type=float, default=0.1)
+    parser.add_argument('--save-plans', help="Write every captured plan to this JSON file")
+    args = parser.parse_args()
+    
+    scratch = None
+    if not args.database_url:
+        scratch = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+        args.database_url = f"sqlite:///{scratch.name}"
+    # The app reads its database from the environment at import time
+    os.environ['DATABASE_URL'] = args.database_url
+    # Analytics routes must read the dataset just loaded, not a replica
+    os.environ['DATABASE_READ_URL'] = ''
+    
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event, func, inspect, select, text
+    
+    from app.analytics.counters import approximate_row_count
+    from app.core.config import SessionLocal, async_engine, engine
+    from app.main import app
+    from app.models.database import Brand, Mention, MentionDailyCount
+    
+    try:
+        has_data = inspect(engine).has_table('mentions') and SessionLocal().execute(
+            select(Mention.id).limit(1)
+        ).first() is not None
+        if has_data and not args.reuse:
+            print("Database already has mentions; pass --reuse to check plans against them, "
+                  "or point --database-url at an empty scratch database")
+            sys.exit(2)
+        if not has_data:
+            print(f"Loading {args.mentions} mentions for {args.brands} brands…")
+            load_dataset(engine, args.brands, args.mentions, args.days, args.seed)
+        
+        dialect_name = engine.dialect.name
+        with SessionLocal() as db:
+            table_rows = approximate_row_count(db, 'mentions') or db.execute(select(func.count(Mention.id))).scalar()
+            relation_rows = {}
+            if dialect_name == 'postgresql':
+                relation_rows = dict(db.execute(text(
+                    "SELECT relname, GREATEST(reltuples, 0) FROM pg_class WHERE relname ~ '^mentions(_p[0-9_]+|_default)?$'"
+                )).all())
+            # A large brand (by default the 10th busiest; the very top ones can
+            # legitimately need a sizeable share of the table)
+            brand = db.execute(
+                select(Brand).join(MentionDailyCount, MentionDailyCount.brand_id == Brand.id)
+                .group_by(Brand.id).order_by(func.sum(MentionDailyCount.mention_count).desc())
+                .offset(args.brand_rank - 1).limit(1)
+            ).scalar() or db.execute(select(Brand).limit(1)).scalar()
+            brand_id, category_id, brand_name = brand.id, brand.category_id, brand.name
+        
+        recorder = PlanRecorder(dialect_name)
+        binds = [engine, async_engine.sync_engine]
+        for bind in binds:
+            event.listen(bind, 'before_cursor_execute', recorder.before_cursor_execute)
+        try:
+            with TestClient(app) as client:
+                run_scenarios(client, recorder, brand_id, category_id, brand_name)
+        finally:
+            for bind in binds:
+                event.remove(bind, 'before_cursor_execute', recorder.before_cursor_execute)
+        
+        results = [
+            check(label, sql, plan, dialect_name, table_rows, relation_rows, args.min_rows, args.max_row_fraction)
+            for (label, sql), plan in recorder.plans.items()
+        ]
+    finally:
+        if scratch is not None:
+            os.unlink(scratch.name)
+    
+    print(f"\n{len(results)} distinct mentions queries on {dialect_name} ({table_rows} mentions)\n")
+    for result in results:
+        status = 'FAIL' if result.failures else 'ok  '
+        print(f"{status} {result.label}")
+        for line in summarize(result.scans) or ['no mentions scan']:
+            print(f"       {line}")
+        for failure in result.failures:
+            print(f"       ✗ {failure}")
+    
+    proposals = sorted({p for result in results for p in result.proposals})
+    if proposals:
+        print("\nIndex suggestions:")
+        for proposal in proposals:
+            print(f"  {proposal}")
+    
+    if args.save_plans:
+        with open(args.save_plans, 'w', encoding='utf-8') as f:
+            json.dump(
+                [{'label': r.label, 'sql': r.sql, 'plan': r.plan, 'failures': r.failures} for r in results],
+                f, indent=2, default=str
+            )
+        print(f"\nPlans written to {args.save_plans}")
+    
+    failed = sum(1 for result in results if result.failures)
+    print(f"\n{failed} of {len(results)} queries failed")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
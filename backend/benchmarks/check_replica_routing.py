@@ -0,0 +1,124 @@
+"""
+Check read-replica routing against a local two-database setup.
+
+Creates a SQLite primary, copies it to a second file used as the replica
+(DATABASE_READ_URL), then writes a brand to the primary only, so each read
+shows which database served it. Through get_read_db, as the analytics
+routes use it, it checks that:
+- reads go to the replica
+- after record_write (the end of an ingestion job) reads stay on the
+  primary, and return to the replica once REPLICA_MAX_LAG_SECONDS have
+  passed (a replica without WAL positions is assumed caught up by then)
+- while the replica is unreachable reads fall back to the primary, and
+  return to the replica when it is back
+
+Measured replication lag (replay LSN and timestamp) needs a PostgreSQL
+standby; on SQLite the write deadline above is the lag check.
+
+Exits 1 on any failure.
+
+Usage:
+    python -m benchmarks.check_replica_routing
+"""
+
+import asyncio
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+MAX_LAG_SECONDS = 1.0
+
+
+async def read_brand_count():
+    """(served by the replica, brand count) for one read through get_read_db."""
+    from sqlalchemy import func, select
+    
+    from app.core.config import get_read_db, read_async_engine
+    from app.models.database import Brand
+    
+    async for db in get_read_db():
+        count = (await db.execute(select(func.count(Brand.id)))).scalar()
+        return db.bind is read_async_engine, count
+
+
+async def run_checks(replica_path: str, replica_brands: int) -> int:
+    from app.core.config import SessionLocal, read_async_engine, replica_router
+    from app.core.replica import record_write
+    
+    failures = 0
+    
+    async def check(name: str, want_replica: bool):
+        nonlocal failures
+        on_replica, count = await read_brand_count()
+        # The replica copy lacks the brand written to the primary afterwards
+        ok = on_replica == want_replica and (count == replica_brands) == want_replica
+        failures += not ok
+        where = 'replica' if on_replica else 'primary'
+        print(f"  {'ok  ' if ok else 'FAIL'} {name}: read from the {where} ({count} brands)")
+    
+    await check("reads go to the replica", True)
+    
+    with SessionLocal() as db:
+        record_write(db, replica_router)
+    await check("after record_write reads stay on the primary", False)
+    time.sleep(MAX_LAG_SECONDS + 0.1)
+    await check(f"{MAX_LAG_SECONDS:g}s later reads return to the replica", True)
+    
+    # Replica gone: close its connections and put a directory where the file was
+    await read_async_engine.dispose()
+    shutil.move(replica_path, replica_path + '.away')
+    os.mkdir(replica_path)
+    await check("replica unreachable: reads fall back to the primary", False)
+    
+    os.rmdir(replica_path)
+    shutil.move(replica_path + '.away', replica_path)
+    await check("replica back: reads return to the replica", True)
+    
+    return failures
+
+
+def main():
+    scratch = tempfile.mkdtemp(prefix='replica-check-')
+    primary_path = os.path.join(scratch, 'primary.db')
+    replica_path = os.path.join(scratch, 'replica.db')
+    
+    # The app reads its databases from the environment at import time
+    os.environ['DATABASE_URL'] = f"sqlite:///{primary_path}"
+    os.environ['DATABASE_READ_URL'] = f"sqlite:///{replica_path}"
+    os.environ['REPLICA_MAX_LAG_SECONDS'] = str(MAX_LAG_SECONDS)
+    
+    from sqlalchemy import func, select
+    
+    from app.core.config import SessionLocal, engine, replica_router
+    from app.models.database import Brand
+    from benchmarks.check_query_plans import load_dataset
+    
+    try:
+        load_dataset(engine, 5, 100, 7, 1)
+        with sqlite3.connect(primary_path) as source, sqlite3.connect(replica_path) as target:
+            source.backup(target)
+        
+        with SessionLocal() as db:
+            replica_brands = db.execute(select(func.count(Brand.id))).scalar()
+            db.add(Brand(name='written after the copy', keywords='copy', category_id=db.execute(
+                select(Brand.category_id).limit(1)
+            ).scalar()))
+            db.commit()
+        
+        # Check the replica on every read instead of once per CHECK_INTERVAL
+        replica_router.check_interval = 0
+        print(f"Primary {primary_path}, replica {replica_path}")
+        failures = asyncio.run(run_checks(replica_path, replica_brands))
+    finally:
+        engine.dispose()
+        shutil.rmtree(scratch, ignore_errors=True)
+    
+    print(f"\n{failures} of 5 checks failed" if failures else "\nAll 5 checks passed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()